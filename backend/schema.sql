@@ -15,6 +15,8 @@ CREATE TABLE IF NOT EXISTS projects (
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
     created_by VARCHAR(255) NOT NULL,
     is_active BOOLEAN DEFAULT TRUE,
+    content_version BIGINT NOT NULL DEFAULT 0,
+    tombstone_horizon BIGINT NOT NULL DEFAULT 0,
     
     -- Constraints
     CONSTRAINT projects_name_not_empty CHECK (LENGTH(TRIM(name)) > 0),
@@ -38,6 +40,55 @@ CREATE TABLE IF NOT EXISTS translation_keys (
     CONSTRAINT translation_keys_unique_key_per_project UNIQUE (project_id, key)
 );
 
+-- Keys deleted from translation_keys, so delta syncs can report deletions.
+-- version is the project content_version the deletion produced.
+CREATE TABLE IF NOT EXISTS translation_key_tombstones (
+    project_id UUID NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    key VARCHAR(500) NOT NULL,
+    version BIGINT NOT NULL,
+    deleted_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Per-project, per-language count of keys with a non-blank translation.
+-- Maintained by the maintain_project_stats trigger; repair with rebuild_project_stats().
+CREATE TABLE IF NOT EXISTS project_language_stats (
+    project_id UUID NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    language VARCHAR(10) NOT NULL,
+    translated_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (project_id, language)
+);
+
+-- Per-project categories with the number of keys in each, maintained the same way
+CREATE TABLE IF NOT EXISTS project_categories (
+    project_id UUID NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    category VARCHAR(100) NOT NULL,
+    key_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (project_id, category)
+);
+
+-- Optional normalized translation storage: one row per key and locale instead of the
+-- translations JSONB column, so single-locale reads and writes only touch that locale.
+-- The API writes here when TRANSLATION_STORAGE=table; reads always see both layouts.
+-- Move existing values across with migrate_translations_to_table().
+CREATE TABLE IF NOT EXISTS translations (
+    key_id UUID NOT NULL REFERENCES translation_keys(id) ON DELETE CASCADE,
+    -- Copied from the key for per-project reads. Deliberately not a foreign key: with
+    -- one, PostgREST would also see this table as a projects <-> translation_keys join
+    project_id UUID NOT NULL,
+    locale VARCHAR(10) NOT NULL,
+    value TEXT NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    updated_by VARCHAR(255) NOT NULL,
+    PRIMARY KEY (key_id, locale)
+);
+
+-- Columns added after the initial release
+ALTER TABLE projects ADD COLUMN IF NOT EXISTS content_version BIGINT NOT NULL DEFAULT 0;
+-- Highest tombstone version pruned; delta syncs from an older version get everything
+ALTER TABLE projects ADD COLUMN IF NOT EXISTS tombstone_horizon BIGINT NOT NULL DEFAULT 0;
+-- Project content_version at the key's last write (0 for keys written before versioning)
+ALTER TABLE translation_keys ADD COLUMN IF NOT EXISTS version BIGINT NOT NULL DEFAULT 0;
+
 -- Indexes for better performance
 CREATE INDEX IF NOT EXISTS idx_projects_active ON projects(is_active);
 CREATE INDEX IF NOT EXISTS idx_projects_created_by ON projects(created_by);
@@ -45,6 +96,24 @@ CREATE INDEX IF NOT EXISTS idx_translation_keys_project_id ON translation_keys(p
 CREATE INDEX IF NOT EXISTS idx_translation_keys_category ON translation_keys(category);
 CREATE INDEX IF NOT EXISTS idx_translation_keys_key ON translation_keys(key);
 CREATE INDEX IF NOT EXISTS idx_translation_keys_translations ON translation_keys USING GIN (translations);
+-- Keyset pagination order for search_translation_keys
+CREATE INDEX IF NOT EXISTS idx_translation_keys_project_key_id ON translation_keys(project_id, key, id);
+-- Delta sync lookups (get_localization_changes)
+CREATE INDEX IF NOT EXISTS idx_translation_keys_project_version ON translation_keys(project_id, version);
+CREATE INDEX IF NOT EXISTS idx_translation_key_tombstones_project_version ON translation_key_tombstones(project_id, version);
+-- Tombstone pruning (prune_translation_key_tombstones)
+CREATE INDEX IF NOT EXISTS idx_translation_key_tombstones_deleted_at ON translation_key_tombstones(deleted_at);
+-- Byte-order key index for paging exports (get_localization_page)
+CREATE INDEX IF NOT EXISTS idx_translation_keys_project_key_c ON translation_keys(project_id, (key COLLATE "C"));
+-- Category-scoped bundle reads (get_localization_namespace)
+CREATE INDEX IF NOT EXISTS idx_translation_keys_project_category ON translation_keys(project_id, category);
+-- Per-locale bundle reads from the normalized table
+CREATE INDEX IF NOT EXISTS idx_translations_project_locale ON translations(project_id, locale);
+-- Trigram indexes from earlier releases: search_translation_keys matches values in
+-- the JSONB column too, so its substring search could never use them
+DROP INDEX IF EXISTS idx_translation_keys_key_trgm;
+DROP INDEX IF EXISTS idx_translation_keys_description_trgm;
+DROP INDEX IF EXISTS idx_translations_value_trgm;
 
 -- Function to update the updated_at timestamp
 CREATE OR REPLACE FUNCTION update_updated_at_column()
@@ -56,29 +125,853 @@ END;
 $$ language 'plpgsql';
 
 -- Triggers to automatically update updated_at
+-- (content version bumps and tombstone pruning alone do not count as a project update)
+DROP TRIGGER IF EXISTS update_projects_updated_at ON projects;
 CREATE TRIGGER update_projects_updated_at 
     BEFORE UPDATE ON projects 
     FOR EACH ROW 
+    WHEN (OLD.content_version = NEW.content_version AND OLD.tombstone_horizon = NEW.tombstone_horizon)
     EXECUTE FUNCTION update_updated_at_column();
 
+DROP TRIGGER IF EXISTS update_translation_keys_updated_at ON translation_keys;
 CREATE TRIGGER update_translation_keys_updated_at 
     BEFORE UPDATE ON translation_keys 
     FOR EACH ROW 
     EXECUTE FUNCTION update_updated_at_column();
 
+-- Functions bumping a project's content version once per statement that changes its
+-- translation keys. The version backs the ETags on the localization endpoints and delta
+-- syncs: written keys are stamped with it and deleted keys leave a tombstone carrying it.
+-- Stamping a row locks its project, which orders writes, so versions commit in
+-- increasing order per project. Every row a statement writes gets the same version.
+CREATE OR REPLACE FUNCTION stamp_translation_key_version()
+RETURNS TRIGGER AS $$
+BEGIN
+    SELECT content_version + 1 INTO NEW.version
+    FROM projects
+    WHERE id = NEW.project_id
+    FOR NO KEY UPDATE;
+
+    NEW.version = COALESCE(NEW.version, 0);
+    RETURN NEW;
+END;
+$$ language 'plpgsql';
+
+CREATE OR REPLACE FUNCTION bump_project_content_version()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        -- No project row means the whole project is being deleted; nothing to sync
+        WITH bumped AS (
+            UPDATE projects p
+            SET content_version = p.content_version + 1
+            WHERE p.id IN (SELECT project_id FROM changed_keys)
+            RETURNING p.id, p.content_version
+        )
+        INSERT INTO translation_key_tombstones (project_id, key, version)
+        SELECT c.project_id, c.key, bumped.content_version
+        FROM changed_keys c
+        JOIN bumped ON bumped.id = c.project_id;
+    ELSE
+        -- The project moves up to the version its rows were stamped with. An
+        -- INSERT ... ON CONFLICT DO UPDATE fires both the insert and update triggers
+        -- for rows stamped with the same version, and only the first one bumps.
+        UPDATE projects p
+        SET content_version = c.version
+        FROM (SELECT project_id, MAX(version) AS version FROM changed_keys GROUP BY project_id) c
+        WHERE p.id = c.project_id AND p.content_version < c.version;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+DROP TRIGGER IF EXISTS bump_project_content_version ON translation_keys;
+DROP TRIGGER IF EXISTS stamp_translation_key_version ON translation_keys;
+CREATE TRIGGER stamp_translation_key_version
+    BEFORE INSERT OR UPDATE ON translation_keys
+    FOR EACH ROW
+    EXECUTE FUNCTION stamp_translation_key_version();
+
+-- Transition tables need one trigger per event
+DROP TRIGGER IF EXISTS bump_project_content_version_insert ON translation_keys;
+CREATE TRIGGER bump_project_content_version_insert
+    AFTER INSERT ON translation_keys
+    REFERENCING NEW TABLE AS changed_keys
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_project_content_version();
+
+DROP TRIGGER IF EXISTS bump_project_content_version_update ON translation_keys;
+CREATE TRIGGER bump_project_content_version_update
+    AFTER UPDATE ON translation_keys
+    REFERENCING NEW TABLE AS changed_keys
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_project_content_version();
+
+DROP TRIGGER IF EXISTS bump_project_content_version_delete ON translation_keys;
+CREATE TRIGGER bump_project_content_version_delete
+    AFTER DELETE ON translation_keys
+    REFERENCING OLD TABLE AS changed_keys
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_project_content_version();
+
+-- Function announcing project changes to every API worker, which drop the project's
+-- cached metadata and bundles (see CACHE_INVALIDATION). Every key write bumps the
+-- project's content_version, so watching projects covers key and translation writes too.
+-- Notifications go out on commit, once per project per transaction.
+CREATE OR REPLACE FUNCTION notify_project_changed()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_notify('project_changes', c.id::TEXT)
+    FROM (SELECT DISTINCT id FROM changed_projects) c;
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+DROP TRIGGER IF EXISTS notify_project_changed ON projects;
+DROP TRIGGER IF EXISTS notify_project_changed_update ON projects;
+CREATE TRIGGER notify_project_changed_update
+    AFTER UPDATE ON projects
+    REFERENCING NEW TABLE AS changed_projects
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION notify_project_changed();
+
+DROP TRIGGER IF EXISTS notify_project_changed_delete ON projects;
+CREATE TRIGGER notify_project_changed_delete
+    AFTER DELETE ON projects
+    REFERENCING OLD TABLE AS changed_projects
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION notify_project_changed();
+
+-- Function applying the stats deltas of a statement's translation_keys writes: -1 for
+-- each old row and +1 for each new one, summed per project and language or category,
+-- so each counter is written once and rows whose counts did not change not at all.
+-- The projects are locked before their counters, so a rebuild of one waits for the
+-- write (or the write for the rebuild). No project row means the whole project is
+-- being deleted; nothing to count.
+CREATE OR REPLACE FUNCTION apply_project_stats_changes(p_old translation_keys[], p_new translation_keys[])
+RETURNS VOID AS $$
+    WITH changes AS (
+        SELECT o.project_id, o.category, o.translations, -1 AS delta FROM unnest(p_old) o
+        UNION ALL
+        SELECT n.project_id, n.category, n.translations, 1 FROM unnest(p_new) n
+    ),
+    locked AS (
+        SELECT id FROM projects WHERE id IN (SELECT project_id FROM changes) FOR NO KEY UPDATE
+    ),
+    language_deltas AS (
+        INSERT INTO project_language_stats (project_id, language, translated_count)
+        SELECT c.project_id, t.key, SUM(c.delta)
+        FROM changes c, jsonb_each(c.translations) t
+        WHERE btrim(t.value->>'value', E' \t\n\r') <> ''
+          AND c.project_id IN (SELECT id FROM locked)
+        GROUP BY c.project_id, t.key
+        HAVING SUM(c.delta) <> 0
+        ON CONFLICT (project_id, language) DO UPDATE
+        SET translated_count = project_language_stats.translated_count + EXCLUDED.translated_count
+    )
+    INSERT INTO project_categories (project_id, category, key_count)
+    SELECT c.project_id, c.category, SUM(c.delta)
+    FROM changes c
+    WHERE c.project_id IN (SELECT id FROM locked)
+    GROUP BY c.project_id, c.category
+    HAVING SUM(c.delta) <> 0
+    ON CONFLICT (project_id, category) DO UPDATE
+    SET key_count = project_categories.key_count + EXCLUDED.key_count;
+
+    -- A separate statement, so the counts updated above are visible
+    DELETE FROM project_categories pc
+    USING unnest(p_old) o
+    WHERE pc.project_id = o.project_id AND pc.category = o.category AND pc.key_count <= 0;
+$$ LANGUAGE sql;
+
+-- Function keeping project_language_stats and project_categories in step with
+-- translation_keys, once per statement
+CREATE OR REPLACE FUNCTION maintain_project_stats()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM apply_project_stats_changes('{}', ARRAY(SELECT n::translation_keys FROM new_keys n));
+    ELSIF TG_OP = 'UPDATE' THEN
+        PERFORM apply_project_stats_changes(
+            ARRAY(SELECT o::translation_keys FROM old_keys o),
+            ARRAY(SELECT n::translation_keys FROM new_keys n)
+        );
+    ELSE
+        PERFORM apply_project_stats_changes(ARRAY(SELECT o::translation_keys FROM old_keys o), '{}');
+    END IF;
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+DROP TRIGGER IF EXISTS maintain_project_stats ON translation_keys;
+DROP TRIGGER IF EXISTS maintain_project_stats_insert ON translation_keys;
+CREATE TRIGGER maintain_project_stats_insert
+    AFTER INSERT ON translation_keys
+    REFERENCING NEW TABLE AS new_keys
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION maintain_project_stats();
+
+DROP TRIGGER IF EXISTS maintain_project_stats_update ON translation_keys;
+CREATE TRIGGER maintain_project_stats_update
+    AFTER UPDATE ON translation_keys
+    REFERENCING OLD TABLE AS old_keys NEW TABLE AS new_keys
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION maintain_project_stats();
+
+DROP TRIGGER IF EXISTS maintain_project_stats_delete ON translation_keys;
+CREATE TRIGGER maintain_project_stats_delete
+    AFTER DELETE ON translation_keys
+    REFERENCING OLD TABLE AS old_keys
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION maintain_project_stats();
+
+-- Function keeping project_language_stats in step with the normalized translations
+-- table, and touching the parent keys so their versions and their projects'
+-- content_version are bumped just like for a write to the JSONB column. Each statement
+-- applies its summed deltas, locking the projects first as above, and touches every
+-- key it wrote to once.
+CREATE OR REPLACE FUNCTION apply_translation_row_changes(p_old translations[], p_new translations[])
+RETURNS VOID AS $$
+    WITH changes AS (
+        SELECT o.key_id, o.project_id, o.locale, o.value, -1 AS delta FROM unnest(p_old) o
+        UNION ALL
+        SELECT n.key_id, n.project_id, n.locale, n.value, 1 FROM unnest(p_new) n
+    ),
+    locked AS (
+        SELECT id FROM projects WHERE id IN (SELECT project_id FROM changes) FOR NO KEY UPDATE
+    ),
+    language_deltas AS (
+        INSERT INTO project_language_stats (project_id, language, translated_count)
+        SELECT c.project_id, c.locale, SUM(c.delta)
+        FROM changes c
+        WHERE btrim(c.value, E' \t\n\r') <> ''
+          AND c.project_id IN (SELECT id FROM locked)
+        GROUP BY c.project_id, c.locale
+        HAVING SUM(c.delta) <> 0
+        ON CONFLICT (project_id, language) DO UPDATE
+        SET translated_count = project_language_stats.translated_count + EXCLUDED.translated_count
+    )
+    -- A no-op for keys that have been deleted themselves
+    UPDATE translation_keys SET updated_at = NOW() WHERE id IN (SELECT key_id FROM changes);
+$$ LANGUAGE sql;
+
+CREATE OR REPLACE FUNCTION maintain_translation_rows()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM apply_translation_row_changes('{}', ARRAY(SELECT n::translations FROM new_rows n));
+    ELSIF TG_OP = 'UPDATE' THEN
+        PERFORM apply_translation_row_changes(
+            ARRAY(SELECT o::translations FROM old_rows o),
+            ARRAY(SELECT n::translations FROM new_rows n)
+        );
+    ELSE
+        PERFORM apply_translation_row_changes(ARRAY(SELECT o::translations FROM old_rows o), '{}');
+    END IF;
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+DROP TRIGGER IF EXISTS maintain_translation_rows ON translations;
+DROP TRIGGER IF EXISTS maintain_translation_rows_insert ON translations;
+CREATE TRIGGER maintain_translation_rows_insert
+    AFTER INSERT ON translations
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION maintain_translation_rows();
+
+DROP TRIGGER IF EXISTS maintain_translation_rows_update ON translations;
+CREATE TRIGGER maintain_translation_rows_update
+    AFTER UPDATE ON translations
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION maintain_translation_rows();
+
+DROP TRIGGER IF EXISTS maintain_translation_rows_delete ON translations;
+CREATE TRIGGER maintain_translation_rows_delete
+    AFTER DELETE ON translations
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION maintain_translation_rows();
+
+-- Function recomputing project_language_stats and project_categories from
+-- translation_keys and translations, for one project or (with no argument) every project.
+-- Used to repair drift; writes to the rebuilt project's keys wait until it finishes.
+-- Every write locks its project's row before changing the counters, so one project is
+-- rebuilt under that row's lock and only a full rebuild locks the tables.
+CREATE OR REPLACE FUNCTION rebuild_project_stats(p_project_id UUID DEFAULT NULL)
+RETURNS VOID AS $$
+BEGIN
+    IF p_project_id IS NULL THEN
+        LOCK TABLE translation_keys, translations IN SHARE MODE;
+    ELSE
+        PERFORM 1 FROM projects WHERE id = p_project_id FOR UPDATE;
+    END IF;
+
+    DELETE FROM project_language_stats WHERE p_project_id IS NULL OR project_id = p_project_id;
+    DELETE FROM project_categories WHERE p_project_id IS NULL OR project_id = p_project_id;
+
+    INSERT INTO project_language_stats (project_id, language, translated_count)
+    SELECT v.project_id, v.language, COUNT(*)
+    FROM (
+        SELECT tk.project_id, t.key AS language, t.value->>'value' AS value
+        FROM translation_keys tk, jsonb_each(tk.translations) t
+        WHERE p_project_id IS NULL OR tk.project_id = p_project_id
+        UNION ALL
+        -- A locale held in both layouts (written before the write paths kept them apart) counts once
+        SELECT tr.project_id, tr.locale, tr.value
+        FROM translations tr
+        JOIN translation_keys tk ON tk.id = tr.key_id
+        WHERE (p_project_id IS NULL OR tr.project_id = p_project_id)
+          AND NOT tk.translations ? tr.locale
+    ) v
+    WHERE btrim(v.value, E' \t\n\r') <> ''
+    GROUP BY v.project_id, v.language;
+
+    INSERT INTO project_categories (project_id, category, key_count)
+    SELECT tk.project_id, tk.category, COUNT(*)
+    FROM translation_keys tk
+    WHERE p_project_id IS NULL OR tk.project_id = p_project_id
+    GROUP BY tk.project_id, tk.category;
+END;
+$$ language 'plpgsql';
+
+-- Backfill the statistics for keys that existed before the trigger
+SELECT rebuild_project_stats();
+
+-- Functions moving translation values between the JSONB column and the normalized
+-- translations table, for one project or (with no argument) every project. Each value
+-- ends up in exactly one layout, and the stats triggers keep the counts unchanged.
+-- Run migrate_translations_to_table() after switching to TRANSLATION_STORAGE=table,
+-- and migrate_translations_to_jsonb() to switch back.
+CREATE OR REPLACE FUNCTION migrate_translations_to_table(p_project_id UUID DEFAULT NULL)
+RETURNS VOID AS $$
+BEGIN
+    LOCK TABLE translation_keys, translations IN SHARE ROW EXCLUSIVE MODE;
+
+    -- A value already in the table was written after the switch, so it is kept
+    INSERT INTO translations (key_id, project_id, locale, value, updated_at, updated_by)
+    SELECT
+        tk.id, tk.project_id, t.key, t.value->>'value',
+        COALESCE((t.value->>'updated_at')::timestamptz, NOW()), COALESCE(t.value->>'updated_by', '')
+    FROM translation_keys tk, jsonb_each(tk.translations) t
+    WHERE (p_project_id IS NULL OR tk.project_id = p_project_id)
+      AND t.value->>'value' IS NOT NULL
+    ON CONFLICT (key_id, locale) DO NOTHING;
+
+    UPDATE translation_keys
+    SET translations = '{}'
+    WHERE (p_project_id IS NULL OR project_id = p_project_id)
+      AND translations <> '{}';
+END;
+$$ language 'plpgsql';
+
+CREATE OR REPLACE FUNCTION migrate_translations_to_jsonb(p_project_id UUID DEFAULT NULL)
+RETURNS VOID AS $$
+BEGIN
+    LOCK TABLE translation_keys, translations IN SHARE ROW EXCLUSIVE MODE;
+
+    -- A value already in the JSONB column was written after the switch, so it is kept
+    UPDATE translation_keys tk
+    SET translations = t.translations || tk.translations
+    FROM (
+        SELECT key_id, jsonb_object_agg(locale, jsonb_build_object(
+            'value', value, 'updated_at', updated_at, 'updated_by', updated_by
+        )) AS translations
+        FROM translations
+        WHERE p_project_id IS NULL OR project_id = p_project_id
+        GROUP BY key_id
+    ) t
+    WHERE tk.id = t.key_id;
+
+    DELETE FROM translations WHERE p_project_id IS NULL OR project_id = p_project_id;
+END;
+$$ language 'plpgsql';
+
+-- Function overlaying a key's rows from the normalized translations table onto its
+-- translations column, so reads return the same shape whichever layout holds the
+-- values. Every write removes the locales it writes from the other layout, so a
+-- locale is held in at most one of them.
+CREATE OR REPLACE FUNCTION with_translation_rows(tk translation_keys)
+RETURNS translation_keys AS $$
+    SELECT jsonb_populate_record(tk, jsonb_build_object('translations', COALESCE((
+        SELECT jsonb_object_agg(tr.locale, jsonb_build_object(
+            'value', tr.value, 'updated_at', tr.updated_at, 'updated_by', tr.updated_by
+        ))
+        FROM translations tr
+        WHERE tr.key_id = tk.id
+    ), '{}'::jsonb) || tk.translations));
+$$ LANGUAGE sql STABLE;
+
+-- Function returning one locale's value for a key from either layout
+CREATE OR REPLACE FUNCTION translation_value(p_key_id UUID, p_translations JSONB, p_locale TEXT)
+RETURNS TEXT AS $$
+    SELECT COALESCE(
+        p_translations->p_locale->>'value',
+        (SELECT value FROM translations WHERE key_id = p_key_id AND locale = p_locale)
+    );
+$$ LANGUAGE sql STABLE;
+
+-- Function backing paginated GET /translation-keys. Returns one page of keys ordered
+-- by (key, id), starting after the (p_after_key, p_after_id) cursor position.
+-- NULL filters are ignored; p_search_pattern is an ILIKE pattern matched against the
+-- key, the description and every translation value. Without a search the page is read
+-- straight from the (project_id, key, id) index; with one, keys are checked in that
+-- order until the page is full, so a rare term reads through much of the project.
+CREATE OR REPLACE FUNCTION search_translation_keys(
+    p_project_id UUID DEFAULT NULL,
+    p_search_pattern TEXT DEFAULT NULL,
+    p_categories TEXT[] DEFAULT NULL,
+    p_languages TEXT[] DEFAULT NULL,
+    p_updated_by TEXT DEFAULT NULL,
+    p_after_key TEXT DEFAULT NULL,
+    p_after_id UUID DEFAULT NULL,
+    p_limit INTEGER DEFAULT 100
+)
+RETURNS SETOF translation_keys AS $$
+    SELECT merged.*
+    FROM translation_keys tk
+    CROSS JOIN LATERAL with_translation_rows(tk) merged
+    WHERE (p_project_id IS NULL OR tk.project_id = p_project_id)
+      AND (p_after_key IS NULL OR (tk.key, tk.id) > (p_after_key, p_after_id))
+      AND (p_categories IS NULL OR tk.category = ANY(p_categories))
+      AND (p_languages IS NULL OR tk.translations ?| p_languages OR EXISTS (
+          SELECT 1 FROM translations tr
+          WHERE tr.key_id = tk.id AND tr.locale = ANY(p_languages)
+      ))
+      AND (p_updated_by IS NULL
+          OR EXISTS (
+              SELECT 1 FROM jsonb_each(tk.translations) t
+              WHERE t.value->>'updated_by' = p_updated_by
+          )
+          OR EXISTS (
+              SELECT 1 FROM translations tr
+              WHERE tr.key_id = tk.id AND tr.updated_by = p_updated_by
+          ))
+      AND (p_search_pattern IS NULL
+          OR tk.key ILIKE p_search_pattern
+          OR tk.description ILIKE p_search_pattern
+          OR EXISTS (
+              SELECT 1 FROM jsonb_each(tk.translations) t
+              WHERE t.value->>'value' ILIKE p_search_pattern
+          )
+          OR EXISTS (
+              SELECT 1 FROM translations tr
+              WHERE tr.key_id = tk.id AND tr.value ILIKE p_search_pattern
+          ))
+    ORDER BY tk.key, tk.id
+    LIMIT p_limit;
+$$ LANGUAGE sql STABLE;
+
+-- Function backing PUT /translation-keys/{key_id}. Merges the given locales into the
+-- stored translations in a single statement and returns the updated row, so concurrent
+-- edits to different locales of the same key never overwrite each other. Rows the
+-- locales still have in the normalized translations table are removed first, and the
+-- key's other locales still held there are folded into the returned row.
+CREATE OR REPLACE FUNCTION merge_translations(p_key_id UUID, p_translations JSONB)
+RETURNS SETOF translation_keys AS $$
+    DELETE FROM translations
+    WHERE key_id = p_key_id
+      AND locale IN (SELECT jsonb_object_keys(p_translations));
+
+    UPDATE translation_keys
+    SET translations = translations || p_translations
+    WHERE id = p_key_id;
+
+    -- A separate statement, so the returned row includes the values just written
+    SELECT merged.*
+    FROM translation_keys tk
+    CROSS JOIN LATERAL with_translation_rows(tk) merged
+    WHERE tk.id = p_key_id;
+$$ LANGUAGE sql VOLATILE;
+
+-- Function backing PUT /translation-keys/batch. p_updates maps key IDs to the locales to
+-- merge into each key; all keys are patched in one statement and only the IDs, keys and
+-- new versions of the updated keys are returned.
+DROP FUNCTION IF EXISTS merge_translations_batch(JSONB);
+CREATE OR REPLACE FUNCTION merge_translations_batch(p_updates JSONB)
+RETURNS TABLE (id UUID, project_id UUID, key VARCHAR, version BIGINT) AS $$
+    DELETE FROM translations tr
+    USING jsonb_each(p_updates) u
+    WHERE tr.key_id = u.key::uuid
+      AND tr.locale IN (SELECT jsonb_object_keys(u.value));
+
+    UPDATE translation_keys tk
+    SET translations = tk.translations || u.value
+    FROM jsonb_each(p_updates) u
+    WHERE tk.id = u.key::uuid
+    RETURNING tk.id, tk.project_id, tk.key, tk.version;
+$$ LANGUAGE sql VOLATILE;
+
+-- Counterparts of merge_translations and merge_translations_batch for
+-- TRANSLATION_STORAGE=table: each given locale is upserted as its own row of the
+-- normalized translations table, leaving the key's other locales untouched. The
+-- locales are first removed from the JSONB column, where they are still held until
+-- migrate_translations_to_table() has run, so the new rows are what reads see.
+CREATE OR REPLACE FUNCTION merge_translation_rows(p_key_id UUID, p_translations JSONB)
+RETURNS SETOF translation_keys AS $$
+BEGIN
+    UPDATE translation_keys tk
+    SET translations = tk.translations - ARRAY(SELECT jsonb_object_keys(p_translations))
+    WHERE tk.id = p_key_id
+      AND tk.translations ?| ARRAY(SELECT jsonb_object_keys(p_translations));
+
+    INSERT INTO translations (key_id, project_id, locale, value, updated_at, updated_by)
+    SELECT tk.id, tk.project_id, t.key, t.value->>'value', (t.value->>'updated_at')::timestamptz, t.value->>'updated_by'
+    FROM translation_keys tk, jsonb_each(p_translations) t
+    WHERE tk.id = p_key_id
+    ON CONFLICT (key_id, locale) DO UPDATE
+    SET value = EXCLUDED.value, updated_at = EXCLUDED.updated_at, updated_by = EXCLUDED.updated_by;
+
+    -- A separate statement, so the returned row includes the values just written
+    RETURN QUERY
+    SELECT merged.*
+    FROM translation_keys tk
+    CROSS JOIN LATERAL with_translation_rows(tk) merged
+    WHERE tk.id = p_key_id;
+END;
+$$ language 'plpgsql';
+
+DROP FUNCTION IF EXISTS merge_translation_rows_batch(JSONB);
+CREATE OR REPLACE FUNCTION merge_translation_rows_batch(p_updates JSONB)
+RETURNS TABLE (id UUID, project_id UUID, key VARCHAR, version BIGINT) AS $$
+BEGIN
+    UPDATE translation_keys tk
+    SET translations = tk.translations - ARRAY(SELECT jsonb_object_keys(u.value))
+    FROM jsonb_each(p_updates) u
+    WHERE tk.id = u.key::uuid
+      AND tk.translations ?| ARRAY(SELECT jsonb_object_keys(u.value));
+
+    INSERT INTO translations (key_id, project_id, locale, value, updated_at, updated_by)
+    SELECT tk.id, tk.project_id, t.key, t.value->>'value', (t.value->>'updated_at')::timestamptz, t.value->>'updated_by'
+    FROM jsonb_each(p_updates) u
+    JOIN translation_keys tk ON tk.id = u.key::uuid
+    CROSS JOIN LATERAL jsonb_each(u.value) t
+    ON CONFLICT (key_id, locale) DO UPDATE
+    SET value = EXCLUDED.value, updated_at = EXCLUDED.updated_at, updated_by = EXCLUDED.updated_by;
+
+    -- A separate statement, so the versions include the touches made by the trigger
+    RETURN QUERY
+    SELECT tk.id, tk.project_id, tk.key, tk.version
+    FROM translation_keys tk
+    WHERE tk.id IN (SELECT u.key::uuid FROM jsonb_each(p_updates) u);
+END;
+$$ language 'plpgsql';
+
+-- Functions backing key creation and bulk import. Each writes the keys and, with
+-- TRANSLATION_STORAGE=table, their rows of the normalized translations table in one
+-- transaction. p_translations holds the table values ({locale: translation} for the
+-- new key, or {key: {locale: translation}} for an import) and is NULL when the values
+-- are in the rows' translations column. An upsert replaces every value of an existing
+-- key, so its table rows for locales the import leaves out are removed.
+CREATE OR REPLACE FUNCTION insert_translation_key(p_row JSONB, p_translations JSONB DEFAULT NULL)
+RETURNS SETOF translation_keys AS $$
+DECLARE
+    new_id UUID;
+BEGIN
+    INSERT INTO translation_keys (project_id, key, category, description, translations)
+    SELECT r.project_id, r.key, r.category, r.description, COALESCE(r.translations, '{}')
+    FROM jsonb_populate_record(NULL::translation_keys, p_row) r
+    RETURNING id INTO new_id;
+
+    INSERT INTO translations (key_id, project_id, locale, value, updated_at, updated_by)
+    SELECT tk.id, tk.project_id, t.key, t.value->>'value', (t.value->>'updated_at')::timestamptz, t.value->>'updated_by'
+    FROM translation_keys tk, jsonb_each(COALESCE(p_translations, '{}')) t
+    WHERE tk.id = new_id;
+
+    -- A separate statement, so the version includes the touches made by the trigger
+    RETURN QUERY SELECT * FROM translation_keys WHERE id = new_id;
+END;
+$$ language 'plpgsql';
+
+CREATE OR REPLACE FUNCTION upsert_translation_keys(p_rows JSONB, p_upsert BOOLEAN, p_translations JSONB DEFAULT NULL)
+RETURNS SETOF translation_keys AS $$
+DECLARE
+    written_ids UUID[];
+BEGIN
+    IF p_upsert THEN
+        WITH written AS (
+            INSERT INTO translation_keys (project_id, key, category, description, translations)
+            SELECT r.project_id, r.key, r.category, r.description, COALESCE(r.translations, '{}')
+            FROM jsonb_populate_recordset(NULL::translation_keys, p_rows) r
+            ON CONFLICT (project_id, key) DO UPDATE
+            SET category = EXCLUDED.category, description = EXCLUDED.description, translations = EXCLUDED.translations
+            RETURNING id
+        )
+        SELECT array_agg(written.id) INTO written_ids FROM written;
+
+        DELETE FROM translations tr
+        USING translation_keys tk
+        WHERE tk.id = ANY(written_ids)
+          AND tr.key_id = tk.id
+          AND NOT COALESCE(p_translations->tk.key, '{}') ? tr.locale;
+    ELSE
+        -- Existing keys are skipped and left out of the returned rows
+        WITH written AS (
+            INSERT INTO translation_keys (project_id, key, category, description, translations)
+            SELECT r.project_id, r.key, r.category, r.description, COALESCE(r.translations, '{}')
+            FROM jsonb_populate_recordset(NULL::translation_keys, p_rows) r
+            ON CONFLICT (project_id, key) DO NOTHING
+            RETURNING id
+        )
+        SELECT array_agg(written.id) INTO written_ids FROM written;
+    END IF;
+
+    INSERT INTO translations (key_id, project_id, locale, value, updated_at, updated_by)
+    SELECT tk.id, tk.project_id, t.key, t.value->>'value', (t.value->>'updated_at')::timestamptz, t.value->>'updated_by'
+    FROM translation_keys tk, jsonb_each(COALESCE(p_translations->tk.key, '{}')) t
+    WHERE tk.id = ANY(written_ids)
+    ON CONFLICT (key_id, locale) DO UPDATE
+    SET value = EXCLUDED.value, updated_at = EXCLUDED.updated_at, updated_by = EXCLUDED.updated_by;
+
+    -- A separate statement, so the versions include the touches made by the trigger
+    RETURN QUERY SELECT * FROM translation_keys WHERE id = ANY(written_ids);
+END;
+$$ language 'plpgsql';
+
+-- Function backing DELETE /translation-keys/{key_id}. Returns the deleted key with the
+-- content version its deletion produced, as recorded in its tombstone.
+CREATE OR REPLACE FUNCTION delete_translation_key(p_key_id UUID)
+RETURNS TABLE (id UUID, project_id UUID, key VARCHAR, version BIGINT) AS $$
+DECLARE
+    deleted_project_id UUID;
+    deleted_key VARCHAR;
+BEGIN
+    DELETE FROM translation_keys tk
+    WHERE tk.id = p_key_id
+    RETURNING tk.project_id, tk.key INTO deleted_project_id, deleted_key;
+    IF NOT FOUND THEN
+        RETURN;
+    END IF;
+
+    -- A separate statement, so the tombstone written by the trigger is visible
+    RETURN QUERY
+    SELECT p_key_id, deleted_project_id, deleted_key, MAX(ts.version)
+    FROM translation_key_tombstones ts
+    WHERE ts.project_id = deleted_project_id AND ts.key = deleted_key;
+END;
+$$ language 'plpgsql';
+
+-- Function backing the /localizations endpoints. Returns a ready-made
+-- {locale: {key: value}} object holding only the requested locales, so neither the
+-- other locales nor the per-translation metadata are sent to the API.
+CREATE OR REPLACE FUNCTION get_localization_bundles(p_project_id UUID, p_locales TEXT[])
+RETURNS JSONB AS $$
+    SELECT COALESCE(jsonb_object_agg(l.locale, COALESCE(b.bundle, '{}'::jsonb)), '{}'::jsonb)
+    FROM unnest(p_locales) AS l(locale)
+    LEFT JOIN LATERAL (
+        SELECT jsonb_object_agg(v.key, v.value) AS bundle
+        FROM (
+            SELECT tk.key, tk.translations->l.locale->>'value' AS value
+            FROM translation_keys tk
+            WHERE tk.project_id = p_project_id
+              AND tk.translations ? l.locale
+              AND tk.translations->l.locale->>'value' IS NOT NULL
+            UNION ALL
+            -- Values in the normalized table, read through the (project_id, locale) index
+            SELECT tk.key, tr.value
+            FROM translations tr
+            JOIN translation_keys tk ON tk.id = tr.key_id
+            WHERE tr.project_id = p_project_id
+              AND tr.locale = l.locale
+              AND tk.translations->l.locale->>'value' IS NULL
+        ) v
+    ) b ON TRUE;
+$$ LANGUAGE sql STABLE;
+
+-- Function backing namespace-scoped bundles: one locale's values for the keys in
+-- p_category, or whose key starts with p_key_prefix when it is given, so a client can load only what a
+-- screen needs. Each branch reads through its own index: (project_id, category), or a
+-- byte-order range scan of (project_id, key COLLATE "C"). chr(1114111) is the last code
+-- point (a noncharacter), so the range holds every key with the prefix.
+CREATE OR REPLACE FUNCTION get_localization_namespace(
+    p_project_id UUID,
+    p_locale TEXT,
+    p_category TEXT DEFAULT NULL,
+    p_key_prefix TEXT DEFAULT NULL
+)
+RETURNS JSONB AS $$
+DECLARE
+    bundle JSONB;
+BEGIN
+    IF p_key_prefix IS NULL THEN
+        SELECT jsonb_object_agg(v.key, v.value) INTO bundle
+        FROM (
+            SELECT tk.key, COALESCE(tk.translations->p_locale->>'value', tr.value) AS value
+            FROM translation_keys tk
+            LEFT JOIN translations tr ON tr.key_id = tk.id AND tr.locale = p_locale
+            WHERE tk.project_id = p_project_id
+              AND tk.category = p_category
+        ) v
+        WHERE v.value IS NOT NULL;
+    ELSE
+        SELECT jsonb_object_agg(v.key, v.value) INTO bundle
+        FROM (
+            SELECT tk.key, COALESCE(tk.translations->p_locale->>'value', tr.value) AS value
+            FROM translation_keys tk
+            LEFT JOIN translations tr ON tr.key_id = tk.id AND tr.locale = p_locale
+            WHERE tk.project_id = p_project_id
+              AND (tk.key COLLATE "C") >= (p_key_prefix COLLATE "C")
+              AND (tk.key COLLATE "C") < ((p_key_prefix || chr(1114111)) COLLATE "C")
+        ) v
+        WHERE v.value IS NOT NULL;
+    END IF;
+    RETURN COALESCE(bundle, '{}'::jsonb);
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+-- Function backing the streaming export. Returns one page of a project's keys in
+-- byte order, starting after p_after_key, each with only the requested locales'
+-- values as a {locale: value} object.
+CREATE OR REPLACE FUNCTION get_localization_page(
+    p_project_id UUID,
+    p_locales TEXT[],
+    p_after_key TEXT DEFAULT NULL,
+    p_limit INTEGER DEFAULT 1000
+)
+RETURNS TABLE (key VARCHAR, localizations JSONB) AS $$
+    SELECT
+        tk.key,
+        (
+            SELECT COALESCE(jsonb_object_agg(tr.locale, tr.value), '{}'::jsonb)
+            FROM translations tr
+            WHERE tr.key_id = tk.id AND tr.locale = ANY(p_locales)
+        ) || (
+            SELECT COALESCE(jsonb_object_agg(t.key, t.value->>'value'), '{}'::jsonb)
+            FROM jsonb_each(tk.translations) t
+            WHERE t.key = ANY(p_locales) AND t.value->>'value' IS NOT NULL
+        )
+    FROM translation_keys tk
+    WHERE tk.project_id = p_project_id
+      AND (p_after_key IS NULL OR tk.key COLLATE "C" > p_after_key COLLATE "C")
+    ORDER BY tk.key COLLATE "C"
+    LIMIT p_limit;
+$$ LANGUAGE sql STABLE;
+
+-- Function backing GET /localizations/{project_id}/{locale}/changes. Returns the
+-- keys of one locale written and deleted since content version p_since, plus the
+-- project's current version as the next token. A since of 0, one ahead of the
+-- project (e.g. from another database), or one older than the tombstones still kept
+-- (see prune_translation_key_tombstones) returns every key with full = true.
+CREATE OR REPLACE FUNCTION get_localization_changes(p_project_id UUID, p_locale TEXT, p_since BIGINT)
+RETURNS JSONB AS $$
+    WITH project AS (
+        SELECT
+            content_version,
+            CASE WHEN p_since > content_version OR p_since < tombstone_horizon THEN 0 ELSE p_since END AS since
+        FROM projects
+        WHERE id = p_project_id
+    )
+    SELECT jsonb_build_object(
+        'version', project.content_version,
+        'full', project.since = 0,
+        'upserted', COALESCE((
+            SELECT jsonb_object_agg(v.key, v.value)
+            FROM (
+                SELECT tk.key, translation_value(tk.id, tk.translations, p_locale) AS value
+                FROM translation_keys tk
+                WHERE tk.project_id = p_project_id
+                  AND (project.since = 0 OR tk.version > project.since)
+            ) v
+            WHERE v.value IS NOT NULL
+        ), '{}'::jsonb),
+        'deleted', COALESCE((
+            SELECT jsonb_agg(DISTINCT ts.key)
+            FROM translation_key_tombstones ts
+            WHERE ts.project_id = p_project_id
+              AND project.since > 0
+              AND ts.version > project.since
+              AND NOT EXISTS (
+                  SELECT 1 FROM translation_keys tk
+                  WHERE tk.project_id = p_project_id
+                    AND tk.key = ts.key
+                    AND translation_value(tk.id, tk.translations, p_locale) IS NOT NULL
+              )
+        ), '[]'::jsonb)
+    )
+    FROM project;
+$$ LANGUAGE sql STABLE;
+
+-- Function deleting tombstones older than p_retention_days and returning how many
+-- were deleted. Each project's tombstone_horizon moves up to the highest version
+-- pruned, so delta syncs from before it, which could miss those deletions, get the
+-- whole bundle instead.
+CREATE OR REPLACE FUNCTION prune_translation_key_tombstones(p_retention_days INTEGER)
+RETURNS INTEGER AS $$
+    WITH pruned AS (
+        DELETE FROM translation_key_tombstones
+        WHERE deleted_at < NOW() - make_interval(days => p_retention_days)
+        RETURNING project_id, version
+    ),
+    horizons AS (
+        UPDATE projects p
+        SET tombstone_horizon = h.version
+        FROM (SELECT project_id, MAX(version) AS version FROM pruned GROUP BY project_id) h
+        WHERE p.id = h.project_id AND p.tombstone_horizon < h.version
+    )
+    SELECT COUNT(*)::INTEGER FROM pruned;
+$$ LANGUAGE sql;
+
+-- Functions backing the project language endpoints. Each changes supported_languages
+-- in a single statement and returns the updated row, or nothing if there was nothing
+-- to change, so no read is needed first and concurrent changes are not overwritten.
+-- The default language is never removed.
+CREATE OR REPLACE FUNCTION add_project_language(p_project_id UUID, p_language TEXT)
+RETURNS SETOF projects AS $$
+    UPDATE projects
+    SET supported_languages = array_append(supported_languages, p_language::text)
+    WHERE id = p_project_id
+      AND NOT (p_language = ANY(supported_languages))
+    RETURNING *;
+$$ LANGUAGE sql VOLATILE;
+
+CREATE OR REPLACE FUNCTION remove_project_language(p_project_id UUID, p_language TEXT)
+RETURNS SETOF projects AS $$
+    UPDATE projects
+    SET supported_languages = array_remove(supported_languages, p_language::text)
+    WHERE id = p_project_id
+      AND p_language = ANY(supported_languages)
+      AND default_language <> p_language
+    RETURNING *;
+$$ LANGUAGE sql VOLATILE;
+
 -- Row Level Security (RLS) policies
 -- Enable RLS on tables
 ALTER TABLE projects ENABLE ROW LEVEL SECURITY;
 ALTER TABLE translation_keys ENABLE ROW LEVEL SECURITY;
+ALTER TABLE project_language_stats ENABLE ROW LEVEL SECURITY;
+ALTER TABLE project_categories ENABLE ROW LEVEL SECURITY;
+ALTER TABLE translation_key_tombstones ENABLE ROW LEVEL SECURITY;
+ALTER TABLE translations ENABLE ROW LEVEL SECURITY;
 
 -- Basic RLS policies (adjust based on your authentication needs)
--- For now, allow all operations for authenticated users
+-- For now, allow all operations for authenticated users. Dropped first, like the
+-- triggers above, so the whole file can be applied again to upgrade a database.
+DROP POLICY IF EXISTS "Allow all operations for authenticated users" ON projects;
 CREATE POLICY "Allow all operations for authenticated users" ON projects
     FOR ALL USING (auth.role() = 'authenticated');
 
+DROP POLICY IF EXISTS "Allow all operations for authenticated users" ON translation_keys;
 CREATE POLICY "Allow all operations for authenticated users" ON translation_keys
     FOR ALL USING (auth.role() = 'authenticated');
 
+DROP POLICY IF EXISTS "Allow all operations for authenticated users" ON project_language_stats;
+CREATE POLICY "Allow all operations for authenticated users" ON project_language_stats
+    FOR ALL USING (auth.role() = 'authenticated');
+
+DROP POLICY IF EXISTS "Allow all operations for authenticated users" ON project_categories;
+CREATE POLICY "Allow all operations for authenticated users" ON project_categories
+    FOR ALL USING (auth.role() = 'authenticated');
+
+DROP POLICY IF EXISTS "Allow all operations for authenticated users" ON translation_key_tombstones;
+CREATE POLICY "Allow all operations for authenticated users" ON translation_key_tombstones
+    FOR ALL USING (auth.role() = 'authenticated');
+
+DROP POLICY IF EXISTS "Allow all operations for authenticated users" ON translations;
+CREATE POLICY "Allow all operations for authenticated users" ON translations
+    FOR ALL USING (auth.role() = 'authenticated');
+
 
 
 -- Sample data for testing (optional)
@@ -0,0 +1,126 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class BundleCache:
+    """In-process LRU cache with TTL expiry for per-project entries such as
+    localization bundles and project rows.
+
+    Keys are tuples whose first element is the project ID, so every entry
+    belonging to a project can be dropped at once when that project changes.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 300):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple[Hashable, ...], Tuple[float, Any]]" = OrderedDict()
+        # Invalidation counters: a project's generation moves on when it is invalidated
+        # and every project's does when the whole cache is cleared
+        self._counter = 0
+        self._cleared_at = 0
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[Hashable, ...]) -> Optional[Any]:
+        """Get a cached value, or None if it is missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Tuple[Hashable, ...], value: Any, generation: Optional[int] = None) -> None:
+        """Store a value, skipping it if the project was invalidated since `generation` was read"""
+        with self._lock:
+            if generation is not None and generation != self._generation(key[0]):
+                return
+
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _generation(self, project_id: str) -> int:
+        return max(self._generations.get(project_id, 0), self._cleared_at)
+
+    def generation(self, project_id: str) -> int:
+        """Get the invalidation counter for a project, to pass back into set()"""
+        with self._lock:
+            return self._generation(project_id)
+
+    def invalidate_project(self, project_id: str) -> None:
+        """Drop every cached entry for a project"""
+        with self._lock:
+            self._counter += 1
+            self._generations[project_id] = self._counter
+            for key in [key for key in self._entries if key[0] == project_id]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """Drop every cached entry"""
+        with self._lock:
+            self._counter += 1
+            self._cleared_at = self._counter
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SingleFlight:
+    """Coalesces concurrent identical loads into one.
+
+    The first caller for a key runs the load; callers arriving while it is in
+    flight wait for the same result (or exception) instead of starting their own.
+    Nothing is kept once the load finishes, so results still go in a BundleCache.
+    Keys follow the BundleCache convention of a leading project ID.
+    """
+
+    def __init__(self):
+        self._loads: Dict[Tuple[Hashable, ...], asyncio.Future] = {}
+        self._counts: Dict[str, Dict[str, int]] = {}
+
+    async def run(self, kind: str, key: Tuple[Hashable, ...], load: Callable[[], Awaitable[T]]) -> T:
+        """Run `load`, or join the one already in flight for (kind, key)"""
+        flight_key = (kind,) + key
+        counts = self._counts.setdefault(kind, {"loads": 0, "coalesced": 0})
+        future = self._loads.get(flight_key)
+        if future is not None:
+            counts["coalesced"] += 1
+        else:
+            counts["loads"] += 1
+            future = asyncio.ensure_future(load())
+            self._loads[flight_key] = future
+            future.add_done_callback(lambda done: self._finish(flight_key, done))
+        # Shielded so a caller that goes away doesn't cancel the load for everyone else
+        return await asyncio.shield(future)
+
+    def _finish(self, flight_key: Tuple[Hashable, ...], future: asyncio.Future) -> None:
+        if self._loads.get(flight_key) is future:
+            del self._loads[flight_key]
+        if not future.cancelled():
+            future.exception()  # Mark as retrieved even if every caller went away
+
+    def forget_project(self, project_id: str) -> None:
+        """Make later callers start fresh loads for a project instead of joining ones begun before a write"""
+        for flight_key in [flight_key for flight_key in self._loads if flight_key[1] == project_id]:
+            del self._loads[flight_key]
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Loads run and calls coalesced into them so far, per kind"""
+        return {kind: dict(counts) for kind, counts in self._counts.items()}
+
+    def __len__(self) -> int:
+        return len(self._loads)
@@ -0,0 +1,90 @@
+"""Content-Encoding negotiation and precompression for localization responses.
+
+Bundles are compressed once per content version and cached with their encodings,
+so a request only has to pick the representation its Accept-Encoding allows.
+Streamed exports are compressed chunk by chunk as they are produced.
+"""
+import gzip
+import zlib
+from typing import AsyncIterator, Dict, Optional
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; without it only gzip is offered
+    brotli = None
+
+# Gzip and brotli settings for bodies compressed once and cached: slower than the
+# defaults, but paid once per bundle version rather than once per request
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 9
+
+# Lower settings for streamed exports, which are compressed on every request
+STREAM_GZIP_LEVEL = 6
+STREAM_BROTLI_QUALITY = 5
+
+# Encodings offered, most preferred first
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def compress(body: bytes) -> Dict[str, bytes]:
+    """Encode a body in every offered encoding, keyed by Content-Encoding ("identity" for the original)"""
+    encoded = {"identity": body, "gzip": gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)}
+    if brotli is not None:
+        encoded["br"] = brotli.compress(body, quality=BROTLI_QUALITY)
+    return encoded
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> str:
+    """Pick the preferred offered encoding acceptable under an Accept-Encoding header"""
+    if not accept_encoding:
+        return "identity"
+
+    qualities: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        quality = 1.0
+        params = params.strip().lower()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if coding:
+            qualities[coding] = quality
+
+    best, best_quality = "identity", 0.0
+    for encoding in ENCODINGS:
+        quality = qualities.get(encoding, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def encoding_headers(encoding: str) -> Dict[str, str]:
+    """Response headers for a body sent with the given encoding"""
+    headers = {"Vary": "Accept-Encoding"}
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return headers
+
+
+async def compress_stream(chunks: AsyncIterator[bytes], encoding: str) -> AsyncIterator[bytes]:
+    """Compress a stream of byte chunks on the fly with the given encoding"""
+    if encoding == "identity":
+        async for chunk in chunks:
+            yield chunk
+        return
+
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=STREAM_BROTLI_QUALITY)
+        compress_chunk, finish = compressor.process, compressor.finish
+    else:
+        compressor = zlib.compressobj(STREAM_GZIP_LEVEL, zlib.DEFLATED, 31)  # 31: gzip container
+        compress_chunk, finish = compressor.compress, compressor.flush
+
+    async for chunk in chunks:
+        data = compress_chunk(chunk)
+        if data:
+            yield data
+    yield finish()
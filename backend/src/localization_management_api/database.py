@@ -1,54 +1,361 @@
+import asyncio
+import base64
+import json
+import logging
 import os
+import uuid
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
 from dotenv import load_dotenv
-from supabase import create_client, Client
+from .cache import BundleCache, SingleFlight
+from .events import EventBroker, Subscription
+from .invalidation import create_invalidation_listener
+from .releases import ReleaseStore
+from .storage import StorageBackend, create_backend
+from . import compression
 from .models import (
     Project, TranslationKey, CreateProjectRequest, UpdateProjectRequest,
-    CreateTranslationKeyRequest, UpdateTranslationRequest, Translation
+    CreateTranslationKeyRequest, UpdateTranslationRequest, Translation,
+    LocalizationResponse, LocalizationBatchResponse, TranslationFilter, BulkImportProgress, BulkImportRowError,
+    BatchUpdateResult, ProjectStatsSummary, LocalizationChangesResponse, ProjectEvent, Release
 )
 
-# Load environment variables
-load_dotenv()
+logger = logging.getLogger(__name__)
+
+# Where translation values are written: the translations JSONB column of
+# translation_keys, or one row per key and locale in the translations table
+TRANSLATION_STORAGE_LAYOUTS = ("jsonb", "table")
+
+# Page size limits for paginated translation key listings
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Rows per multi-row statement when bulk importing translation keys
+IMPORT_CHUNK_SIZE = 500
+
+# Keys per page when streaming project exports
+EXPORT_PAGE_SIZE = 1000
+
+# Keys per merge_translations_batch call when batch updating translations
+BATCH_UPDATE_CHUNK_SIZE = 500
+
+# A namespace is a ("category", name) or ("prefix", key prefix) pair selecting part of a bundle
+NAMESPACE_KINDS = ("category", "prefix")
+
+# Column limits from schema.sql, checked up front so one bad row can't fail a whole chunk
+MAX_KEY_LENGTH = 500
+MAX_CATEGORY_LENGTH = 100
+
+
+def encode_cursor(key: str, key_id: str) -> str:
+    """Encode the (key, id) position of the last row on a page as an opaque cursor"""
+    return base64.urlsafe_b64encode(json.dumps([key, key_id]).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """Decode a cursor produced by encode_cursor, raising ValueError if it is malformed"""
+    try:
+        key, key_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        # The ID is compared as a UUID in the query, so anything else would fail there
+        return str(key), str(uuid.UUID(key_id))
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def escape_like(value: str) -> str:
+    """Escape LIKE wildcards so user input is matched literally"""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def fallback_chain(locale: str, project: Project, fallbacks: Optional[List[str]] = None) -> List[str]:
+    """Locales to look a key up in, most preferred first.
+
+    An explicit `fallbacks` list follows the locale as given, and raises ValueError if
+    it names a locale the project does not support. Otherwise the chain is derived: the
+    locale, its BCP 47 parents the project supports (pt-BR -> pt), then the project's
+    default language.
+    """
+    supported = {language.lower(): language for language in project.supported_languages}
+    if fallbacks:
+        unsupported = [language for language in fallbacks if language.lower() not in supported]
+        if unsupported:
+            raise ValueError(f"Fallback locales not supported by the project: {', '.join(unsupported)}")
+        chain = [locale] + [supported[language.lower()] for language in fallbacks]
+    else:
+        chain = [locale]
+        subtags = locale.split("-")
+        while len(subtags) > 1:
+            subtags.pop()
+            parent = supported.get("-".join(subtags).lower())
+            if parent:
+                chain.append(parent)
+        chain.append(project.default_language)
+    return list(dict.fromkeys(chain))  # Drop repeats, keeping the first
+
 
 class DatabaseService:
-    def __init__(self):
-        supabase_url = os.getenv("SUPABASE_URL")
-        supabase_key = os.getenv("SUPABASE_ANON_KEY")
+    def __init__(self, backend: Optional[StorageBackend] = None):
+        # Every query goes through the storage backend selected by DATABASE_BACKEND
+        self.backend = backend or create_backend()
+
+        self.translation_storage = os.getenv("TRANSLATION_STORAGE", "jsonb")
+        if self.translation_storage not in TRANSLATION_STORAGE_LAYOUTS:
+            raise ValueError(f"TRANSLATION_STORAGE must be one of: {', '.join(TRANSLATION_STORAGE_LAYOUTS)}")
+
+        # Serialized localization bundles, invalidated by every write that can change them
+        self.bundle_cache = BundleCache(
+            max_entries=int(os.getenv("BUNDLE_CACHE_MAX_ENTRIES", "1024")),
+            ttl_seconds=float(os.getenv("BUNDLE_CACHE_TTL_SECONDS", "300"))
+        )
+
+        # Project rows without key counts, for the existence and content version checks at
+        # the start of most requests. Writes through this worker invalidate them; writes
+        # through other workers show up once the TTL runs out, or as soon as their
+        # invalidation event arrives when CACHE_INVALIDATION is enabled.
+        self.project_cache = BundleCache(
+            max_entries=int(os.getenv("PROJECT_CACHE_MAX_ENTRIES", "1024")),
+            ttl_seconds=float(os.getenv("PROJECT_CACHE_TTL_SECONDS", "10"))
+        )
+
+        # Concurrent identical reads (bundles, stats, project rows, delta syncs) share one
+        # in-flight query; a burst of clients after a release costs one load per bundle
+        self.single_flight = SingleFlight()
+
+        # Change events from every worker, selected by CACHE_INVALIDATION
+        self.invalidation_listener = create_invalidation_listener()
+
+        # Live change events for GET /projects/{project_id}/events subscribers in this worker
+        self.events = EventBroker(max_queue_size=int(os.getenv("EVENT_QUEUE_SIZE", "1000")))
+        self._event_tasks: Set[asyncio.Task] = set()
+
+        # Published releases: frozen bundle files served without touching the database
+        self.releases = ReleaseStore(os.getenv("RELEASES_DIR", "releases"))
+
+    async def start_cache_invalidation(self) -> None:
+        """Start dropping cached projects as change events arrive from other workers"""
+        if self.invalidation_listener is not None:
+            await self.invalidation_listener.start(self._on_project_changed, self._on_changes_missed)
+
+    async def close(self) -> None:
+        """Stop listening for change events and release the backend's connections"""
+        if self.invalidation_listener is not None:
+            await self.invalidation_listener.stop()
+        for task in list(self._event_tasks):
+            task.cancel()
+        await self.backend.close()
+
+    def _invalidate_project(self, project_id: str) -> None:
+        """Drop a project's cached metadata and bundles after a write that changes them"""
+        self.project_cache.invalidate_project(project_id)
+        self.bundle_cache.invalidate_project(project_id)
+        self.single_flight.forget_project(project_id)
+
+    def _clear_caches(self) -> None:
+        """Drop every cached project and bundle"""
+        self.project_cache.clear()
+        self.bundle_cache.clear()
+
+    def _on_project_changed(self, project_id: str) -> None:
+        """Handle a change event from any worker, including this one"""
+        self._invalidate_project(project_id)
+        if self.events.has_subscribers(project_id):
+            self._spawn_event_task(self._publish_remote_changes(project_id))
+
+    def _on_changes_missed(self) -> None:
+        """Handle lost change events by dropping every cache and rechecking subscribed projects"""
+        self._clear_caches()
+        for project_id in self.events.projects():
+            self._spawn_event_task(self._publish_remote_changes(project_id))
+
+    def _spawn_event_task(self, coroutine) -> None:
+        task = asyncio.ensure_future(coroutine)
+        self._event_tasks.add(task)
+        task.add_done_callback(self._event_tasks.discard)
+
+    async def _publish_remote_changes(self, project_id: str) -> None:
+        """Tell subscribers about a change another worker (or an import) made to a project"""
+        try:
+            project = await self.get_project_metadata(project_id)
+        except Exception as e:
+            logger.warning("Could not read project %s for change events: %s", project_id, e)
+            return
+        if not project or not project.is_active:
+            self._publish("project_deleted", project_id)
+            return
+        self._publish_language_changes(project)
+        if project.content_version > self.events.latest_version(project_id):
+            self.events.request_catch_up(project_id)
+
+    def _publish(self, event_type: str, project_id: str, **fields) -> None:
+        """Publish an event to the project's subscribers, if it has any"""
+        if self.events.has_subscribers(project_id):
+            self.events.publish(ProjectEvent(type=event_type, project_id=project_id, **fields))
+
+    def _publish_language_changes(self, project: Project) -> None:
+        added, removed = self.events.update_languages(project.id, project.supported_languages)
+        for language in added:
+            self._publish("language_added", project.id, language=language, supported_languages=project.supported_languages)
+        for language in removed:
+            self._publish("language_removed", project.id, language=language, supported_languages=project.supported_languages)
+
+    async def subscribe_to_events(
+        self,
+        project_id: str,
+        locales: Optional[List[str]] = None,
+        since: Optional[int] = None
+    ) -> Optional[Tuple[Subscription, ProjectEvent]]:
+        """Subscribe to a project's change events, returning the subscription and its ready event.
+
+        Without `since` the subscriber is assumed to have loaded the current version;
+        with it, what changed after that version is read back first. Returns None if
+        there is no such project.
+        """
+        # Subscribe before reading the version, so no write can fall between the two
+        subscription = self.events.subscribe(project_id, locales)
+        try:
+            project = await self.get_project_metadata(project_id)
+        except Exception:
+            self.events.unsubscribe(subscription)
+            raise
+        if not project or not project.is_active:
+            self.events.unsubscribe(subscription)
+            return None
+
+        self._publish_language_changes(project)
+        self.events.note_version(project_id, project.content_version)
+        subscription.mark_caught_up(project.content_version if since is None else min(since, project.content_version))
+        if subscription.synced_version < project.content_version:
+            subscription.request_catch_up()
+        ready = ProjectEvent(
+            type="ready",
+            project_id=project_id,
+            version=subscription.synced_version,
+            supported_languages=project.supported_languages
+        )
+        return subscription, ready
+
+    async def catch_up_events(self, subscription: Subscription) -> List[ProjectEvent]:
+        """Read what changed since a subscription's synced version, as one sync event per locale"""
+        subscription.catch_up_pending = False
+        project_id = subscription.project_id
+        project = await self.get_project_metadata(project_id)
+        if not project or not project.is_active:
+            return [ProjectEvent(type="project_deleted", project_id=project_id)]
+
+        locales = sorted(subscription.locales) if subscription.locales else project.supported_languages
+        changes = await asyncio.gather(*(
+            self.get_localization_changes(project_id, locale, subscription.synced_version) for locale in locales
+        ))
+        changes = [locale_changes for locale_changes in changes if locale_changes is not None]
+        # Locales are read one after another, so only the oldest version is covered by all of them
+        version = min((locale_changes.version for locale_changes in changes), default=subscription.synced_version)
+
+        events = [
+            ProjectEvent(
+                type="sync",
+                project_id=project_id,
+                version=version,
+                locale=locale_changes.locale,
+                full=locale_changes.full,
+                upserted=locale_changes.upserted,
+                deleted=locale_changes.deleted
+            )
+            for locale_changes in changes
+            if locale_changes.full or locale_changes.upserted or locale_changes.deleted
+        ]
+        subscription.mark_caught_up(version)
+        self.events.note_version(project_id, version)
+        return events
+
+    @staticmethod
+    def _translation_key_row(project_id: str, key_data: CreateTranslationKeyRequest, created_by: str, now: datetime) -> dict:
+        """Build the translation_keys row for a new key"""
+        # Convert simple translations dict to full Translation objects
+        translations_dict = {}
+        for lang_code, value in key_data.translations.items():
+            translations_dict[lang_code] = {
+                "value": value,
+                "updated_at": now.isoformat(),
+                "updated_by": created_by
+            }
         
-        if not supabase_url or not supabase_key:
-            raise ValueError("SUPABASE_URL and SUPABASE_ANON_KEY environment variables are required")
+        return {
+            "project_id": project_id,
+            "key": key_data.key,
+            "category": key_data.category,
+            "description": key_data.description,
+            "translations": translations_dict
+        }
+
+    @staticmethod
+    def _merge_translation_rows(key_data: dict) -> dict:
+        """Fold translations table rows embedded by the supabase backend into the translations column"""
+        translation_rows = key_data.pop("translation_rows", None)
+        if translation_rows:
+            # Writes keep each locale in one layout; were one left in both, the JSONB value wins as in the SQL functions
+            key_data["translations"] = {
+                **{
+                    row["locale"]: {"value": row["value"], "updated_at": row["updated_at"], "updated_by": row["updated_by"]}
+                    for row in translation_rows
+                },
+                **(key_data.get("translations") or {})
+            }
+        return key_data
+
+    @classmethod
+    def _parse_translation_key(cls, key_data: dict) -> TranslationKey:
+        """Build a TranslationKey from a translation_keys row"""
+        cls._merge_translation_rows(key_data)
+        translations_dict = {}
+        if key_data.get("translations"):
+            for lang_code, translation_data in key_data["translations"].items():
+                translations_dict[lang_code] = Translation(**translation_data)
         
-        self.supabase: Client = create_client(supabase_url, supabase_key)
+        key_data["translations"] = translations_dict
+        return TranslationKey(**key_data)
 
     # Project operations
     async def get_projects(self) -> List[Project]:
         """Get all active projects"""
         try:
-            response = self.supabase.table("projects").select("*").eq("is_active", True).execute()
-            projects = []
-            for project_data in response.data:
-                # Count translation keys for each project
-                key_count_response = self.supabase.table("translation_keys").select("id", count="exact").eq("project_id", project_data["id"]).execute()
-                project_data["translation_key_count"] = key_count_response.count or 0
-                projects.append(Project(**project_data))
-            return projects
+            return [Project(**project_data) for project_data in await self.backend.list_projects()]
         except Exception as e:
             raise Exception(f"Failed to fetch projects: {str(e)}")
 
     async def get_project(self, project_id: str) -> Optional[Project]:
         """Get a single project by ID"""
         try:
-            response = self.supabase.table("projects").select("*").eq("id", project_id).single().execute()
-            if response.data:
-                # Count translation keys
-                key_count_response = self.supabase.table("translation_keys").select("id", count="exact").eq("project_id", project_id).execute()
-                response.data["translation_key_count"] = key_count_response.count or 0
-                return Project(**response.data)
+            project_data = await self.backend.get_project(project_id)
+            if project_data:
+                return Project(**project_data)
             return None
         except Exception as e:
             raise Exception(f"Failed to fetch project {project_id}: {str(e)}")
 
+    async def get_project_metadata(self, project_id: str) -> Optional[Project]:
+        """Get a single project by ID without counting its translation keys, served from the project cache"""
+        cache_key = (project_id,)
+        project = self.project_cache.get(cache_key)
+        if project is not None:
+            return project
+
+        try:
+            generation = self.project_cache.generation(project_id)
+            project_data = await self.single_flight.run(
+                "project", cache_key, lambda: self.backend.get_project_row(project_id)
+            )
+            if project_data:
+                project = Project(**project_data)
+                self.project_cache.set(cache_key, project, generation)
+                return project
+            return None
+        except Exception as e:
+            raise Exception(f"Failed to fetch project {project_id}: {str(e)}")
+
+    async def project_exists(self, project_id: str) -> bool:
+        """Check that a project exists, without counting its translation keys"""
+        return await self.get_project_metadata(project_id) is not None
+
     async def create_project(self, project_data: CreateProjectRequest, created_by: str) -> Project:
         """Create a new project"""
         try:
@@ -64,9 +371,8 @@ class DatabaseService:
                 "is_active": True
             }
             
-            response = self.supabase.table("projects").insert(project_dict).execute()
-            if response.data:
-                project_data = response.data[0]
+            project_data = await self.backend.insert_project(project_dict)
+            if project_data:
                 project_data["translation_key_count"] = 0
                 return Project(**project_data)
             raise Exception("Failed to create project")
@@ -79,9 +385,12 @@ class DatabaseService:
             update_dict = {k: v for k, v in project_data.model_dump(exclude_unset=True).items() if v is not None}
             update_dict["updated_at"] = datetime.utcnow().isoformat()
             
-            response = self.supabase.table("projects").update(update_dict).eq("id", project_id).execute()
-            if response.data:
-                return await self.get_project(project_id)
+            if await self.backend.update_project(project_id, update_dict):
+                self._invalidate_project(project_id)
+                project = await self.get_project(project_id)
+                if project:
+                    self._publish_language_changes(project)
+                return project
             return None
         except Exception as e:
             raise Exception(f"Failed to update project {project_id}: {str(e)}")
@@ -89,11 +398,14 @@ class DatabaseService:
     async def delete_project(self, project_id: str) -> bool:
         """Soft delete a project"""
         try:
-            response = self.supabase.table("projects").update({
+            project_data = await self.backend.update_project(project_id, {
                 "is_active": False,
                 "updated_at": datetime.utcnow().isoformat()
-            }).eq("id", project_id).execute()
-            return len(response.data) > 0
+            })
+            self._invalidate_project(project_id)
+            if project_data is not None:
+                self._publish("project_deleted", project_id)
+            return project_data is not None
         except Exception as e:
             raise Exception(f"Failed to delete project {project_id}: {str(e)}")
 
@@ -101,62 +413,79 @@ class DatabaseService:
     async def get_translation_keys(self, project_id: Optional[str] = None) -> List[TranslationKey]:
         """Get translation keys, optionally filtered by project"""
         try:
-            query = self.supabase.table("translation_keys").select("*")
-            if project_id:
-                query = query.eq("project_id", project_id)
-            
-            response = query.execute()
-            translation_keys = []
+            rows = await self.backend.list_translation_keys(project_id)
+            return [self._parse_translation_key(key_data) for key_data in rows]
+        except Exception as e:
+            raise Exception(f"Failed to fetch translation keys: {str(e)}")
+
+    async def search_translation_keys(
+        self,
+        filters: TranslationFilter,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[TranslationKey], Optional[str]]:
+        """Get one page of translation keys matching a filter, ordered by key, plus the cursor for the next page"""
+        rows, next_cursor = await self.search_translation_key_rows(filters, limit, cursor)
+        return [self._parse_translation_key(key_data) for key_data in rows], next_cursor
+
+    async def search_translation_key_rows(
+        self,
+        filters: TranslationFilter,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[dict], Optional[str]]:
+        """Like search_translation_keys, but return the raw translation_keys rows"""
+        after_key, after_id = decode_cursor(cursor) if cursor else (None, None)
+        try:
+            # Filtering and keyset pagination run in the search_translation_keys SQL function,
+            # so each page is a single query reading keys in (key, id) index order
+            params = {
+                "p_project_id": filters.project_id,
+                "p_search_pattern": f"%{escape_like(filters.search)}%" if filters.search else None,
+                "p_categories": filters.categories or None,
+                "p_languages": filters.languages or None,
+                "p_updated_by": filters.updated_by,
+                "p_after_key": after_key,
+                "p_after_id": after_id,
+                # One extra row tells us whether another page follows
+                "p_limit": limit + 1
+            }
+            page = await self.backend.search_translation_keys(params)
+            rows = page[:limit]
             
-            for key_data in response.data:
-                # Parse translations JSON
-                translations_dict = {}
-                if key_data.get("translations"):
-                    for lang_code, translation_data in key_data["translations"].items():
-                        translations_dict[lang_code] = Translation(**translation_data)
-                
-                key_data["translations"] = translations_dict
-                translation_keys.append(TranslationKey(**key_data))
+            next_cursor = None
+            if len(page) > limit:
+                next_cursor = encode_cursor(rows[-1]["key"], rows[-1]["id"])
             
-            return translation_keys
+            return rows, next_cursor
         except Exception as e:
-            raise Exception(f"Failed to fetch translation keys: {str(e)}")
+            raise Exception(f"Failed to search translation keys: {str(e)}")
 
     async def get_translation_key(self, key_id: str) -> Optional[TranslationKey]:
         """Get a single translation key by ID"""
+        key_data = await self.get_translation_key_row(key_id)
+        if key_data:
+            return self._parse_translation_key(key_data)
+        return None
+
+    async def get_translation_key_row(self, key_id: str) -> Optional[dict]:
+        """Get the raw translation_keys row for a key ID"""
         try:
-            response = self.supabase.table("translation_keys").select("*").eq("id", key_id).single().execute()
-            if response.data:
-                key_data = response.data
-                # Parse translations JSON
-                translations_dict = {}
-                if key_data.get("translations"):
-                    for lang_code, translation_data in key_data["translations"].items():
-                        translations_dict[lang_code] = Translation(**translation_data)
-                
-                key_data["translations"] = translations_dict
-                return TranslationKey(**key_data)
-            return None
+            key_data = await self.backend.get_translation_key(key_id)
+            return self._merge_translation_rows(key_data) if key_data else None
         except Exception as e:
             raise Exception(f"Failed to fetch translation key {key_id}: {str(e)}")
 
     async def get_translation_keys_by_ids(self, key_ids: List[str]) -> List[TranslationKey]:
         """Get multiple translation keys by their IDs"""
+        rows = await self.get_translation_key_rows_by_ids(key_ids)
+        return [self._parse_translation_key(key_data) for key_data in rows]
+
+    async def get_translation_key_rows_by_ids(self, key_ids: List[str]) -> List[dict]:
+        """Get the raw translation_keys rows for multiple key IDs"""
         try:
-            response = self.supabase.table("translation_keys").select("*").in_("id", key_ids).execute()
-            translation_keys = []
-            
-            for key_data in response.data:
-                # Parse translations JSON
-                translations_dict = {}
-                if key_data.get("translations"):
-                    for lang_code, translation_data in key_data["translations"].items():
-                        translations_dict[lang_code] = Translation(**translation_data)
-                
-                key_data["translations"] = translations_dict
-                translation_keys.append(TranslationKey(**key_data))
-            
-            return translation_keys
+            rows = await self.backend.get_translation_keys_by_ids(key_ids)
+            return [self._merge_translation_rows(key_data) for key_data in rows]
         except Exception as e:
             raise Exception(f"Failed to fetch translation keys by IDs: {str(e)}")
 
@@ -164,27 +493,26 @@ class DatabaseService:
         """Create a new translation key"""
         try:
             now = datetime.utcnow()
+            translation_key_dict = self._translation_key_row(project_id, key_data, created_by, now)
+            translations = translation_key_dict["translations"]
+            if self.translation_storage == "table":
+                translation_key_dict["translations"] = {}
+                key_data = await self.backend.insert_translation_key(translation_key_dict, translations)
+            else:
+                key_data = await self.backend.insert_translation_key(translation_key_dict)
             
-            # Convert simple translations dict to full Translation objects
-            translations_dict = {}
-            for lang_code, value in key_data.translations.items():
-                translations_dict[lang_code] = {
-                    "value": value,
-                    "updated_at": now.isoformat(),
-                    "updated_by": created_by
-                }
-            
-            translation_key_dict = {
-                "project_id": project_id,
-                "key": key_data.key,
-                "category": key_data.category,
-                "description": key_data.description,
-                "translations": translations_dict
-            }
-            
-            response = self.supabase.table("translation_keys").insert(translation_key_dict).execute()
-            if response.data:
-                key_data = response.data[0]
+            if key_data:
+                key_data["translations"] = translations
+                self._invalidate_project(project_id)
+                self._publish(
+                    "key_created",
+                    project_id,
+                    version=key_data.get("version"),
+                    key_id=key_data["id"],
+                    key=key_data["key"],
+                    category=key_data["category"],
+                    translations={lang_code: translation["value"] for lang_code, translation in translations.items()}
+                )
                 # Parse translations back to Translation objects
                 translations_dict = {}
                 for lang_code, translation_data in key_data["translations"].items():
@@ -195,49 +523,194 @@ class DatabaseService:
         except Exception as e:
             raise Exception(f"Failed to create translation key: {str(e)}")
 
+    async def import_translation_keys(
+        self,
+        project_id: str,
+        keys: List[CreateTranslationKeyRequest],
+        created_by: str,
+        upsert: bool = False
+    ) -> AsyncIterator[BulkImportProgress]:
+        """Insert (or upsert) many translation keys in chunked multi-row statements.
+        
+        Yields progress after every chunk; failed rows are reported, never abort the import.
+        Each progress update lists only the failures from its own chunk.
+        """
+        now = datetime.utcnow()
+        seen_keys: Set[str] = set()
+        progress = BulkImportProgress(total=len(keys), processed=0, imported=0)
+        
+        for start in range(0, len(keys), IMPORT_CHUNK_SIZE):
+            chunk = keys[start:start + IMPORT_CHUNK_SIZE]
+            failures = []
+            rows = []
+            for index, key_data in enumerate(chunk, start):
+                error = self._validate_import_row(key_data, seen_keys)
+                if error:
+                    failures.append(BulkImportRowError(index=index, key=key_data.key, error=error))
+                    continue
+                seen_keys.add(key_data.key)
+                rows.append((index, self._translation_key_row(project_id, key_data, created_by, now)))
+            
+            if rows:
+                imported, write_failures = await self._write_import_chunk(rows, upsert)
+                failures.extend(write_failures)
+                if imported:
+                    self._invalidate_project(project_id)
+                    # Imports write too many keys to send one by one; subscribers read the chunk back
+                    self.events.request_catch_up(project_id)
+                progress.imported += imported
+            
+            progress.processed += len(chunk)
+            progress.failed_count += len(failures)
+            progress.failed = sorted(failures, key=lambda failure: failure.index)
+            progress.done = progress.processed == progress.total
+            yield progress.model_copy()
+        
+        if not keys:
+            yield BulkImportProgress(total=0, processed=0, imported=0, done=True)
+
+    @staticmethod
+    def _validate_import_row(key_data: CreateTranslationKeyRequest, seen_keys: Set[str]) -> Optional[str]:
+        """Check a row against the table constraints, returning an error message if it would fail"""
+        if not key_data.key.strip():
+            return "Key must not be empty"
+        if not key_data.category.strip():
+            return "Category must not be empty"
+        if len(key_data.key) > MAX_KEY_LENGTH:
+            return f"Key is longer than {MAX_KEY_LENGTH} characters"
+        if len(key_data.category) > MAX_CATEGORY_LENGTH:
+            return f"Category is longer than {MAX_CATEGORY_LENGTH} characters"
+        if key_data.key in seen_keys:
+            return "Duplicate key in import"
+        return None
+
+    async def _write_import_chunk(self, rows: List[Tuple[int, dict]], upsert: bool) -> Tuple[int, List[BulkImportRowError]]:
+        """Write one chunk of import rows, returning how many were written and which failed"""
+        # With table storage the values are passed apart from the rows and written to the
+        # translations table by the same SQL function as the keys
+        translations_by_key = None
+        if self.translation_storage == "table":
+            translations_by_key = {row["key"]: row["translations"] for _, row in rows}
+            rows = [(index, {**row, "translations": {}}) for index, row in rows]
+        try:
+            written_rows = await self.backend.upsert_translation_keys([row for _, row in rows], upsert, translations_by_key)
+            # When not upserting, existing keys are skipped and left out of the returned rows
+            written_keys = {row["key"] for row in written_rows}
+            failures = [
+                BulkImportRowError(index=index, key=row["key"], error="Key already exists")
+                for index, row in rows if row["key"] not in written_keys
+            ]
+            return len(written_keys), failures
+        except Exception:
+            # Something in the chunk was rejected; retry row by row to isolate it
+            written = 0
+            failures = []
+            for index, row in rows:
+                try:
+                    if await self.backend.upsert_translation_keys([row], upsert, translations_by_key):
+                        written += 1
+                    else:
+                        failures.append(BulkImportRowError(index=index, key=row["key"], error="Key already exists"))
+                except Exception as e:
+                    failures.append(BulkImportRowError(index=index, key=row["key"], error=str(e)))
+            return written, failures
+
     async def update_translation_key(self, key_id: str, update_data: UpdateTranslationRequest, updated_by: str) -> Optional[TranslationKey]:
         """Update translations for a translation key"""
         try:
-            # Get existing key to merge translations
-            existing_key = await self.get_translation_key(key_id)
-            if not existing_key:
-                return None
-            
             now = datetime.utcnow()
-            updated_translations = existing_key.translations.copy()
-            
-            # Update with new translations
-            for lang_code, value in update_data.translations.items():
-                updated_translations[lang_code] = Translation(
-                    value=value,
-                    updated_at=now,
-                    updated_by=updated_by
-                )
             
-            # Convert to dict for database storage
+            # Only the changed locales are sent; merge_translations patches them into the
+            # stored JSONB in one statement, so concurrent edits to other locales are kept.
+            # merge_translation_rows does the same with one translations table row per locale.
             translations_dict = {}
-            for lang_code, translation in updated_translations.items():
+            for lang_code, value in update_data.translations.items():
                 translations_dict[lang_code] = {
-                    "value": translation.value,
-                    "updated_at": translation.updated_at.isoformat(),
-                    "updated_by": translation.updated_by
+                    "value": value,
+                    "updated_at": now.isoformat(),
+                    "updated_by": updated_by
                 }
             
-            response = self.supabase.table("translation_keys").update({
-                "translations": translations_dict
-            }).eq("id", key_id).execute()
-            
-            if response.data:
-                return await self.get_translation_key(key_id)
+            key_data = await self.backend.merge_translations(key_id, translations_dict, self.translation_storage)
+            if key_data:
+                version = key_data.get("version")
+                updated_key = self._parse_translation_key(key_data)
+                self._invalidate_project(updated_key.project_id)
+                self._publish(
+                    "key_updated",
+                    updated_key.project_id,
+                    version=version,
+                    key_id=updated_key.id,
+                    key=updated_key.key,
+                    translations=update_data.translations
+                )
+                return updated_key
             return None
         except Exception as e:
             raise Exception(f"Failed to update translation key {key_id}: {str(e)}")
 
+    async def update_translation_keys_batch(self, updates: Dict[str, Dict[str, str]], updated_by: str) -> BatchUpdateResult:
+        """Update translations for many keys, one merge_translations_batch statement per chunk of keys"""
+        try:
+            now = datetime.utcnow().isoformat()
+            updated: List[str] = []
+            not_found: List[str] = []
+            
+            # IDs that are not UUIDs can't match a key and would make the whole statement fail.
+            # The others are sent in canonical form, which is how the database returns them,
+            # and mapped back to the IDs the caller gave.
+            patches = {}
+            requested_ids = {}
+            for key_id, translations in updates.items():
+                try:
+                    canonical_id = str(uuid.UUID(key_id))
+                except ValueError:
+                    not_found.append(key_id)
+                    continue
+                requested_ids[canonical_id] = key_id
+                patches[canonical_id] = {
+                    lang_code: {"value": value, "updated_at": now, "updated_by": updated_by}
+                    for lang_code, value in translations.items()
+                }
+            
+            key_ids = list(patches)
+            for start in range(0, len(key_ids), BATCH_UPDATE_CHUNK_SIZE):
+                chunk = {key_id: patches[key_id] for key_id in key_ids[start:start + BATCH_UPDATE_CHUNK_SIZE]}
+                updated_rows = await self.backend.merge_translations_batch(chunk, self.translation_storage)
+                
+                updated_ids = {row["id"] for row in updated_rows}
+                for project_id in {row["project_id"] for row in updated_rows}:
+                    self._invalidate_project(project_id)
+                for row in updated_rows:
+                    self._publish(
+                        "key_updated",
+                        row["project_id"],
+                        version=row.get("version"),
+                        key_id=row["id"],
+                        key=row.get("key"),
+                        translations=updates[requested_ids[row["id"]]]
+                    )
+                updated.extend(requested_ids[key_id] for key_id in chunk if key_id in updated_ids)
+                not_found.extend(requested_ids[key_id] for key_id in chunk if key_id not in updated_ids)
+            
+            return BatchUpdateResult(updated=updated, not_found=not_found)
+        except Exception as e:
+            raise Exception(f"Failed to batch update translation keys: {str(e)}")
+
     async def delete_translation_key(self, key_id: str) -> bool:
         """Delete a translation key"""
         try:
-            response = self.supabase.table("translation_keys").delete().eq("id", key_id).execute()
-            return len(response.data) > 0
+            deleted_keys = await self.backend.delete_translation_key(key_id)
+            for deleted_key in deleted_keys:
+                self._invalidate_project(deleted_key["project_id"])
+                self._publish(
+                    "key_deleted",
+                    deleted_key["project_id"],
+                    version=deleted_key.get("version"),
+                    key_id=deleted_key["id"],
+                    key=deleted_key.get("key")
+                )
+            return len(deleted_keys) > 0
         except Exception as e:
             raise Exception(f"Failed to delete translation key {key_id}: {str(e)}")
 
@@ -245,87 +718,452 @@ class DatabaseService:
     async def get_localizations(self, project_id: str, locale: str) -> Dict[str, str]:
         """Get all localizations for a project and locale"""
         try:
-            translation_keys = await self.get_translation_keys(project_id)
-            localizations = {}
-            
-            for key in translation_keys:
-                if locale in key.translations:
-                    localizations[key.key] = key.translations[locale].value
+            bundles = await self.backend.get_localization_bundles(project_id, [locale])
+            return bundles.get(locale, {})
+        except Exception as e:
+            raise Exception(f"Failed to get localizations for project {project_id}, locale {locale}: {str(e)}")
+
+    async def iter_localization_pages(
+        self,
+        project_id: str,
+        locales: List[str],
+        page_size: int = EXPORT_PAGE_SIZE
+    ) -> AsyncIterator[List[Tuple[str, Dict[str, str]]]]:
+        """Page through a project's keys in byte order, yielding (key, {locale: value}) rows"""
+        after_key = None
+        while True:
+            try:
+                rows = await self.backend.get_localization_page(project_id, locales, after_key, page_size)
+            except Exception as e:
+                raise Exception(f"Failed to export localizations for project {project_id}: {str(e)}")
             
+            if rows:
+                yield [(row["key"], row["localizations"]) for row in rows]
+            if len(rows) < page_size:
+                return
+            after_key = rows[-1]["key"]
+
+    async def get_localization_changes(self, project_id: str, locale: str, since: int) -> Optional[LocalizationChangesResponse]:
+        """Get the keys of a locale written or deleted after content version `since`"""
+        try:
+            # Clients updating after a release tend to sync from the same version at once
+            changes = await self.single_flight.run(
+                "changes", (project_id, locale, since), lambda: self.backend.get_localization_changes(project_id, locale, since)
+            )
+            if not changes:
+                return None
+            return LocalizationChangesResponse(project_id=project_id, locale=locale, **changes)
+        except Exception as e:
+            raise Exception(f"Failed to get localization changes for project {project_id}, locale {locale}: {str(e)}")
+
+    async def get_localization_bundle(self, project_id: str, locale: str, content_version: int = 0) -> Dict[str, bytes]:
+        """Get the serialized localization response for a project and locale in every offered encoding, cached until the project changes"""
+        # Keying on the content version keeps bundles written by other workers from being served stale
+        cache_key = (project_id, locale, content_version)
+        bundle = self.bundle_cache.get(cache_key)
+        if bundle is not None:
+            return bundle
+        return await self.single_flight.run(
+            "bundle", cache_key, lambda: self._load_localization_bundle(project_id, locale, cache_key)
+        )
+
+    async def _load_localization_bundle(self, project_id: str, locale: str, cache_key: tuple) -> Dict[str, bytes]:
+        """Build, compress and cache a localization bundle after a cache miss"""
+        generation = self.bundle_cache.generation(project_id)
+        localizations = await self.get_localizations(project_id, locale)
+        body = LocalizationResponse(
+            project_id=project_id,
+            locale=locale,
+            localizations=localizations
+        ).model_dump_json(by_alias=True).encode()
+        bundle = await self._compress(body)
+        self.bundle_cache.set(cache_key, bundle, generation)
+        return bundle
+
+    async def get_namespace_localizations(
+        self,
+        project_id: str,
+        locale: str,
+        namespace: Tuple[str, str],
+        content_version: int = 0
+    ) -> Dict[str, str]:
+        """Get a locale's values for the keys in one namespace, cached until the project changes"""
+        kind, name = namespace
+        if kind not in NAMESPACE_KINDS:
+            raise ValueError(f"Namespace kind must be one of: {', '.join(NAMESPACE_KINDS)}")
+        cache_key = (project_id, locale, "namespace", kind, name, content_version)
+        localizations = self.bundle_cache.get(cache_key)
+        if localizations is not None:
+            return localizations
+        return await self.single_flight.run(
+            "namespace", cache_key, lambda: self._load_namespace_localizations(project_id, locale, kind, name, cache_key)
+        )
+
+    async def _load_namespace_localizations(self, project_id: str, locale: str, kind: str, name: str, cache_key: tuple) -> Dict[str, str]:
+        """Read and cache one namespace of a locale after a cache miss"""
+        try:
+            generation = self.bundle_cache.generation(project_id)
+            localizations = await self.backend.get_localization_namespace(
+                project_id,
+                locale,
+                category=name if kind == "category" else None,
+                key_prefix=name if kind == "prefix" else None
+            )
+            self.bundle_cache.set(cache_key, localizations, generation)
             return localizations
         except Exception as e:
-            raise Exception(f"Failed to get localizations for project {project_id}, locale {locale}: {str(e)}")
+            raise Exception(f"Failed to get {kind} {name} localizations for project {project_id}, locale {locale}: {str(e)}")
+
+    async def get_localization_namespace_bundle(
+        self,
+        project_id: str,
+        locale: str,
+        namespaces: List[Tuple[str, str]],
+        content_version: int = 0
+    ) -> Dict[str, bytes]:
+        """Like get_localization_bundle, for only the keys in the given namespaces.
+
+        Each namespace is cached on its own, so requests for different combinations of
+        the same namespaces share reads.
+        """
+        cache_key = (project_id, locale, "namespaces", tuple(namespaces), content_version)
+        bundle = self.bundle_cache.get(cache_key)
+        if bundle is not None:
+            return bundle
+        return await self.single_flight.run(
+            "namespace_bundle",
+            cache_key,
+            lambda: self._load_localization_namespace_bundle(project_id, locale, namespaces, content_version, cache_key)
+        )
+
+    async def _load_localization_namespace_bundle(
+        self,
+        project_id: str,
+        locale: str,
+        namespaces: List[Tuple[str, str]],
+        content_version: int,
+        cache_key: tuple
+    ) -> Dict[str, bytes]:
+        """Merge, compress and cache a namespace-scoped bundle after a cache miss"""
+        generation = self.bundle_cache.generation(project_id)
+        localizations = await self._get_namespaces_localizations(project_id, locale, namespaces, content_version)
+        body = LocalizationResponse(
+            project_id=project_id,
+            locale=locale,
+            localizations=localizations
+        ).model_dump_json(by_alias=True).encode()
+        bundle = await self._compress(body)
+        self.bundle_cache.set(cache_key, bundle, generation)
+        return bundle
+
+    async def _get_namespaces_localizations(
+        self,
+        project_id: str,
+        locale: str,
+        namespaces: List[Tuple[str, str]],
+        content_version: int
+    ) -> Dict[str, str]:
+        """Merge the cached localizations of several namespaces of a locale"""
+        localizations = {}
+        for namespace_localizations in await asyncio.gather(*(
+            self.get_namespace_localizations(project_id, locale, namespace, content_version) for namespace in namespaces
+        )):
+            localizations.update(namespace_localizations)
+        return localizations
+
+    async def get_merged_localizations(
+        self,
+        project_id: str,
+        chain: List[str],
+        namespaces: Optional[List[Tuple[str, str]]] = None,
+        content_version: int = 0
+    ) -> Dict[str, str]:
+        """Resolve localizations through a fallback chain: each key from the first locale in `chain` that has it"""
+        if namespaces:
+            chain_localizations = await asyncio.gather(*(
+                self._get_namespaces_localizations(project_id, locale, namespaces, content_version) for locale in chain
+            ))
+        else:
+            batch_localizations = await self.get_localizations_batch(project_id, chain)
+            chain_localizations = [batch_localizations[locale] for locale in chain]
+        
+        merged = {}
+        for localizations in reversed(chain_localizations):
+            merged.update(localizations)
+        return merged
+
+    async def get_localization_fallback_bundle(
+        self,
+        project_id: str,
+        chain: List[str],
+        namespaces: Optional[List[Tuple[str, str]]] = None,
+        content_version: int = 0
+    ) -> Dict[str, bytes]:
+        """Like get_localization_bundle, for the localizations of chain[0] merged with its fallbacks"""
+        namespaces = namespaces or []
+        cache_key = (project_id, tuple(chain), "fallback", tuple(namespaces), content_version)
+        bundle = self.bundle_cache.get(cache_key)
+        if bundle is not None:
+            return bundle
+        return await self.single_flight.run(
+            "fallback_bundle",
+            cache_key,
+            lambda: self._load_localization_fallback_bundle(project_id, chain, namespaces, content_version, cache_key)
+        )
+
+    async def _load_localization_fallback_bundle(
+        self,
+        project_id: str,
+        chain: List[str],
+        namespaces: List[Tuple[str, str]],
+        content_version: int,
+        cache_key: tuple
+    ) -> Dict[str, bytes]:
+        """Resolve, compress and cache a merged fallback bundle after a cache miss"""
+        generation = self.bundle_cache.generation(project_id)
+        localizations = await self.get_merged_localizations(project_id, chain, namespaces, content_version)
+        body = LocalizationResponse(
+            project_id=project_id,
+            locale=chain[0],
+            localizations=localizations
+        ).model_dump_json(by_alias=True).encode()
+        bundle = await self._compress(body)
+        self.bundle_cache.set(cache_key, bundle, generation)
+        return bundle
+
+    async def get_localization_batch_bundle(self, project_id: str, locales: List[str], content_version: int = 0) -> Dict[str, bytes]:
+        """Like get_localization_bundle, for the LocalizationBatchResponse of several locales"""
+        cache_key = (project_id, tuple(locales), content_version)
+        bundle = self.bundle_cache.get(cache_key)
+        if bundle is not None:
+            return bundle
+        return await self.single_flight.run(
+            "batch_bundle", cache_key, lambda: self._load_localization_batch_bundle(project_id, locales, cache_key)
+        )
+
+    async def _load_localization_batch_bundle(self, project_id: str, locales: List[str], cache_key: tuple) -> Dict[str, bytes]:
+        """Build, compress and cache a batch localization bundle after a cache miss"""
+        generation = self.bundle_cache.generation(project_id)
+        localizations = await self.get_localizations_batch(project_id, locales)
+        body = LocalizationBatchResponse(
+            project_id=project_id,
+            localizations=localizations
+        ).model_dump_json(by_alias=True).encode()
+        bundle = await self._compress(body)
+        self.bundle_cache.set(cache_key, bundle, generation)
+        return bundle
+
+    @staticmethod
+    async def _compress(body: bytes) -> Dict[str, bytes]:
+        """Precompress a response body off the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, compression.compress, body)
+
+    async def prewarm_bundles(self, targets: List[Tuple[str, Optional[str]]]) -> int:
+        """Load (project_id, locale) bundles into the bundle cache ahead of requests, returning how many were cached.
+        
+        A None locale stands for every supported language of the project. Projects that
+        no longer exist are skipped.
+        """
+        async def prewarm_project(project_id: str, locales: List[Optional[str]]) -> int:
+            project = await self.get_project_metadata(project_id)
+            if not project:
+                return 0
+            locales = project.supported_languages if None in locales else list(dict.fromkeys(locales))
+            await asyncio.gather(*(
+                self.get_localization_bundle(project_id, locale, project.content_version)
+                for locale in locales
+            ))
+            return len(locales)
+        
+        locales_by_project: Dict[str, List[Optional[str]]] = {}
+        for project_id, locale in targets:
+            locales_by_project.setdefault(project_id, []).append(locale)
+        try:
+            counts = await asyncio.gather(*(
+                prewarm_project(project_id, locales) for project_id, locales in locales_by_project.items()
+            ))
+            return sum(counts)
+        except Exception as e:
+            raise Exception(f"Failed to prewarm localization bundles: {str(e)}")
 
     async def get_localizations_batch(self, project_id: str, locales: List[str]) -> Dict[str, Dict[str, str]]:
         """Get localizations for multiple locales"""
         try:
-            translation_keys = await self.get_translation_keys(project_id)
-            batch_localizations = {}
-            
-            for locale in locales:
-                localizations = {}
-                for key in translation_keys:
-                    if locale in key.translations:
-                        localizations[key.key] = key.translations[locale].value
-                batch_localizations[locale] = localizations
-            
-            return batch_localizations
+            # The database builds the locale -> key -> value object, so only the
+            # requested locales' values cross the wire
+            batch_localizations = await self.backend.get_localization_bundles(project_id, locales)
+            return {locale: batch_localizations.get(locale, {}) for locale in locales}
         except Exception as e:
             raise Exception(f"Failed to get batch localizations for project {project_id}: {str(e)}")
 
+    # Release operations
+    async def publish_release(self, project_id: str, created_by: str) -> Optional[Release]:
+        """Snapshot every supported locale of a project into a new release and start serving it"""
+        try:
+            # Read past the project cache so the release records the version it was read at
+            project_data = await self.backend.get_project_row(project_id)
+            if not project_data or not project_data.get("is_active", True):
+                return None
+            project = Project(**project_data)
+            # One statement for all locales, so every bundle comes from the same snapshot
+            localizations = await self.get_localizations_batch(project_id, project.supported_languages)
+            bodies = {
+                locale: LocalizationResponse(
+                    project_id=project_id,
+                    locale=locale,
+                    localizations=locale_localizations
+                ).model_dump_json(by_alias=True).encode()
+                for locale, locale_localizations in localizations.items()
+            }
+            return await self._release_io(self.releases.publish, project_id, project.content_version, bodies, created_by)
+        except Exception as e:
+            raise Exception(f"Failed to publish release of project {project_id}: {str(e)}")
+
+    async def get_releases(self, project_id: str) -> List[Release]:
+        """Get a project's published releases, newest first"""
+        return await self._release_io(self.releases.list_releases, project_id)
+
+    async def get_current_release(self, project_id: str) -> Optional[Release]:
+        """Get the release being served for a project, without database access"""
+        return await self._release_io(self.releases.current_release, project_id)
+
+    async def set_current_release(self, project_id: str, release_id: str) -> Optional[Release]:
+        """Serve an earlier (or later) published release, e.g. to roll back"""
+        return await self._release_io(self.releases.set_current, project_id, release_id)
+
+    @staticmethod
+    async def _release_io(function, *args):
+        """Run a ReleaseStore method off the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, function, *args)
+
+    # Project statistics operations
+    async def get_project_stats(self, project_id: str) -> Optional[ProjectStatsSummary]:
+        """Get the trigger-maintained translation and category counts for a project"""
+        try:
+            stats = await self.single_flight.run("stats", (project_id,), lambda: self.backend.get_project_stats(project_id))
+            if not stats:
+                return None
+            
+            category_counts = {row["category"]: row["key_count"] for row in stats["project_categories"]}
+            return ProjectStatsSummary(
+                supported_languages=stats["supported_languages"],
+                total_keys=sum(category_counts.values()),
+                translated_counts={row["language"]: row["translated_count"] for row in stats["project_language_stats"]},
+                category_counts=category_counts
+            )
+        except Exception as e:
+            raise Exception(f"Failed to fetch stats for project {project_id}: {str(e)}")
+
+    async def get_project_categories(self, project_id: str) -> Dict[str, int]:
+        """Get a project's categories and how many keys each holds, without loading any keys"""
+        try:
+            rows = await self.single_flight.run(
+                "categories", (project_id,), lambda: self.backend.get_project_categories(project_id)
+            )
+            return {row["category"]: row["key_count"] for row in rows}
+        except Exception as e:
+            raise Exception(f"Failed to fetch categories for project {project_id}: {str(e)}")
+
+    async def rebuild_project_stats(self, project_id: Optional[str] = None) -> None:
+        """Recompute the maintained statistics from the stored translations, for one project or all of them"""
+        try:
+            await self.backend.rebuild_project_stats(project_id)
+        except Exception as e:
+            raise Exception(f"Failed to rebuild project stats: {str(e)}")
+
+    async def migrate_translations(self, layout: str, project_id: Optional[str] = None) -> None:
+        """Move stored translation values into the given storage layout, for one project or all of them"""
+        if layout not in TRANSLATION_STORAGE_LAYOUTS:
+            raise ValueError(f"Unknown translation storage layout: {layout}")
+        try:
+            await self.backend.migrate_translations(layout, project_id)
+            if project_id:
+                self._invalidate_project(project_id)
+            else:
+                self._clear_caches()
+        except Exception as e:
+            raise Exception(f"Failed to migrate translations to {layout} storage: {str(e)}")
+
+    async def prune_tombstones(self, retention_days: int) -> int:
+        """Delete deletion tombstones older than the retention period, returning how many were deleted"""
+        try:
+            return await self.backend.prune_tombstones(retention_days)
+        except Exception as e:
+            raise Exception(f"Failed to prune tombstones: {str(e)}")
+
     # Project Language Management operations
     async def add_project_language(self, project_id: str, language_code: str) -> bool:
         """Add a language to project's supported languages"""
         try:
-            # First get the current project
-            project = await self.get_project(project_id)
-            if not project:
-                return False
+            # add_project_language appends the language in one statement, so no read is
+            # needed first and concurrent changes to the list are never overwritten
+            project_data = await self.backend.add_project_language(project_id, language_code)
+            if project_data:
+                self._invalidate_project(project_id)
+                self._publish_language_changes(Project(**project_data))
+                return True
             
-            # Check if language is already supported
-            if language_code in project.supported_languages:
-                return True  # Already supported, consider it success
-            
-            # Add the new language to supported_languages
-            updated_languages = project.supported_languages + [language_code]
-            
-            response = self.supabase.table("projects").update({
-                "supported_languages": updated_languages,
-                "updated_at": datetime.utcnow().isoformat()
-            }).eq("id", project_id).execute()
-            
-            return len(response.data) > 0
+            # Nothing changed: the language was already supported (success) or there is no project
+            return await self.project_exists(project_id)
         except Exception as e:
             raise Exception(f"Failed to add language {language_code} to project {project_id}: {str(e)}")
 
     async def remove_project_language(self, project_id: str, language_code: str) -> bool:
         """Remove a language from project's supported languages"""
         try:
-            # First get the current project
-            project = await self.get_project(project_id)
-            if not project:
-                return False
-            
-            # Check if language is supported
-            if language_code not in project.supported_languages:
-                return False  # Language not supported
+            # remove_project_language never removes the default language
+            project_data = await self.backend.remove_project_language(project_id, language_code)
+            if project_data:
+                self._invalidate_project(project_id)
+                self._publish_language_changes(Project(**project_data))
+                return True
             
-            # Don't allow removing the default language
-            if language_code == project.default_language:
+            # Nothing changed: find out why
+            project = await self.get_project_metadata(project_id)
+            if project and language_code == project.default_language:
                 raise Exception(f"Cannot remove default language '{language_code}' from project")
-            
-            # Remove the language from supported_languages
-            updated_languages = [lang for lang in project.supported_languages if lang != language_code]
-            
-            response = self.supabase.table("projects").update({
-                "supported_languages": updated_languages,
-                "updated_at": datetime.utcnow().isoformat()
-            }).eq("id", project_id).execute()
-            
-            return len(response.data) > 0
+            return False  # Project not found or language not supported
         except Exception as e:
             raise Exception(f"Failed to remove language {language_code} from project {project_id}: {str(e)}")
 
 
+# The shared DatabaseService is created on first use rather than at import time, so
+# importing the app, the models or the CLI tools needs no database credentials
+_db_service: Optional[DatabaseService] = None
+
+
+def get_db_service() -> DatabaseService:
+    """Get the shared DatabaseService, creating it and its database client on first use"""
+    global _db_service
+    if _db_service is None:
+        load_dotenv()
+        _db_service = DatabaseService()
+    return _db_service
+
+
+async def close_db_service() -> None:
+    """Release the shared DatabaseService's connections, if it was ever created"""
+    global _db_service
+    if _db_service is not None:
+        await _db_service.close()
+        _db_service = None
+
+
+class _LazyDatabaseService:
+    """Stand-in for the shared DatabaseService that creates it on first attribute access"""
+
+    def __getattr__(self, name):
+        return getattr(get_db_service(), name)
+
+    # Attributes set or deleted on the stand-in (e.g. by monkeypatch) go to the real service
+    def __setattr__(self, name, value):
+        setattr(get_db_service(), name, value)
+
+    def __delattr__(self, name):
+        delattr(get_db_service(), name)
+
+
 # Global database service instance
-db_service = DatabaseService() 
\ No newline at end of file
+db_service = _LazyDatabaseService()
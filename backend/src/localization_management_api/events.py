@@ -0,0 +1,178 @@
+"""Live project change events (GET /projects/{project_id}/events).
+
+DatabaseService publishes an event for every write it makes, and EventBroker fans it out
+to the subscriptions of that project in this worker. Each subscription has a bounded
+queue so a slow subscriber never holds up writers: when its queue fills up, the queued
+events are dropped and the subscriber is told to resync, i.e. reconnect and resume from
+the last version it received. Writes this worker only hears about afterwards (bulk
+imports, and other workers' writes with CACHE_INVALIDATION enabled) queue a catch-up
+instead, which the stream answers from the database with get_localization_changes.
+
+Events can arrive out of version order (two writes finishing in reverse, or an earlier
+write from another worker that only comes with the next catch-up), so the version a
+client resumes from only moves up once every change below it has been sent.
+"""
+import asyncio
+from typing import Dict, List, Optional, Set, Tuple
+
+from .models import ProjectEvent
+
+# Queued for a subscription to read what changed since its synced version from the database
+CATCH_UP = object()
+
+# Queued in place of the events a full queue had to drop
+OVERFLOW = object()
+
+# Events that carry key values, filtered to the locales a subscription asked for
+KEY_EVENT_TYPES = ("key_created", "key_updated", "key_deleted")
+
+
+class Subscription:
+    """One subscriber's queue of events for a project"""
+
+    def __init__(self, project_id: str, locales: Optional[List[str]] = None, max_queue_size: int = 1000):
+        self.project_id = project_id
+        self.locales = set(locales) if locales else None
+        # Changes up to this version have been sent, or are covered by what was loaded before subscribing
+        self.synced_version = 0
+        # Changes up to this version were read from the database (on subscribing, or by a
+        # catch-up), so their events are redundant
+        self.caught_up_version = 0
+        # Versions sent while an earlier one was still outstanding
+        self._sent_ahead: Set[int] = set()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self.catch_up_pending = False
+        self.overflowed = False
+
+    def deliver(self, event: ProjectEvent) -> None:
+        """Queue an event, leaving out translations for locales the subscriber did not ask for"""
+        if self.locales is not None and event.translations is not None:
+            translations = {locale: value for locale, value in event.translations.items() if locale in self.locales}
+            if not translations and event.type == "key_updated":
+                return
+            event = event.model_copy(update={"translations": translations})
+        self._put(event)
+
+    def mark_sent(self, version: int) -> Optional[int]:
+        """Record that the change at a version was sent.
+
+        Returns the synced version (the ID to resume from) if every change up to this one
+        has now been sent, or None while an earlier one is still outstanding.
+        """
+        if version > self.synced_version:
+            self._sent_ahead.add(version)
+            self._advance()
+        return self.synced_version if version <= self.synced_version else None
+
+    def mark_caught_up(self, version: int) -> None:
+        """Record that every change up to a version was read from the database and sent"""
+        self.caught_up_version = max(self.caught_up_version, version)
+        if version > self.synced_version:
+            self.synced_version = version
+            self._sent_ahead = {sent for sent in self._sent_ahead if sent > version}
+            self._advance()
+
+    def _advance(self) -> None:
+        while self.synced_version + 1 in self._sent_ahead:
+            self.synced_version += 1
+            self._sent_ahead.discard(self.synced_version)
+
+    def request_catch_up(self) -> None:
+        """Queue a catch-up unless one is already waiting"""
+        if not self.catch_up_pending:
+            self.catch_up_pending = True
+            self._put(CATCH_UP)
+
+    def _put(self, item) -> None:
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(item)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(OVERFLOW)
+            self.overflowed = True
+
+
+class EventBroker:
+    """In-process fan-out of project events to their subscriptions"""
+
+    def __init__(self, max_queue_size: int = 1000):
+        self.max_queue_size = max_queue_size
+        self._subscriptions: Dict[str, Set[Subscription]] = {}
+        self._versions: Dict[str, int] = {}  # project -> highest version published or caught up to
+        self._languages: Dict[str, List[str]] = {}  # project -> supported languages subscribers last saw
+
+    def subscribe(self, project_id: str, locales: Optional[List[str]] = None) -> Subscription:
+        subscription = Subscription(project_id, locales, self.max_queue_size)
+        self._subscriptions.setdefault(project_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscriptions = self._subscriptions.get(subscription.project_id)
+        if subscriptions is None:
+            return
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            del self._subscriptions[subscription.project_id]
+            self._versions.pop(subscription.project_id, None)
+            self._languages.pop(subscription.project_id, None)
+
+    def has_subscribers(self, project_id: str) -> bool:
+        return project_id in self._subscriptions
+
+    def projects(self) -> List[str]:
+        return list(self._subscriptions)
+
+    def publish(self, event: ProjectEvent) -> None:
+        subscriptions = self._subscriptions.get(event.project_id)
+        if not subscriptions:
+            return
+        if event.version is not None:
+            self.note_version(event.project_id, event.version)
+        for subscription in subscriptions:
+            subscription.deliver(event)
+
+    def request_catch_up(self, project_id: str) -> None:
+        for subscription in self._subscriptions.get(project_id, ()):
+            subscription.request_catch_up()
+
+    def note_version(self, project_id: str, version: int) -> None:
+        if self.has_subscribers(project_id) and version > self._versions.get(project_id, 0):
+            self._versions[project_id] = version
+
+    def latest_version(self, project_id: str) -> int:
+        return self._versions.get(project_id, 0)
+
+    def update_languages(self, project_id: str, supported_languages: List[str]) -> Tuple[List[str], List[str]]:
+        """Record a project's supported languages, returning the (added, removed) ones since last time"""
+        if not self.has_subscribers(project_id):
+            return [], []
+        previous = self._languages.get(project_id)
+        self._languages[project_id] = list(supported_languages)
+        if previous is None:
+            return [], []
+        added = [language for language in supported_languages if language not in previous]
+        removed = [language for language in previous if language not in supported_languages]
+        return added, removed
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "projects": len(self._subscriptions),
+            "subscriptions": sum(len(subscriptions) for subscriptions in self._subscriptions.values())
+        }
+
+
+def encode_sse(event: ProjectEvent, event_id: Optional[int] = None) -> bytes:
+    """Format an event as a server-sent event, with the version to resume from as its ID if given"""
+    lines = [f"event: {event.type}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {event.model_dump_json(by_alias=True, exclude_none=True)}")
+    return ("\n".join(lines) + "\n\n").encode()
+
+
+def encode_sse_id(event_id: int) -> bytes:
+    """Format a message that only moves the client's last event ID, without dispatching an event"""
+    return f"id: {event_id}\n\n".encode()
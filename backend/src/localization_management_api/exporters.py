@@ -0,0 +1,247 @@
+"""Streaming export of project localizations in standard file formats.
+
+Every exporter is an async generator of byte chunks built from pages of
+(key, {locale: value}) rows, so memory use depends on the page size rather than
+on the size of the project. Pages must arrive ordered by key in byte order.
+"""
+import io
+import json
+import re
+import struct
+import tempfile
+import zipfile
+from typing import AsyncIterator, Callable, Dict, List, Set, Tuple
+from xml.sax.saxutils import escape as xml_escape
+
+LocalizationPage = List[Tuple[str, Dict[str, str]]]
+PageSource = Callable[[List[str]], AsyncIterator[LocalizationPage]]
+
+# Formats holding a single locale, and the extension of their files
+SINGLE_LOCALE_FORMATS = {
+    "json": "json",
+    "po": "po",
+    "mo": "mo",
+    "android": "xml",
+    "ios": "strings",
+}
+
+MEDIA_TYPES = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+    "po": "text/x-gettext-translation",
+    "mo": "application/x-gettext-translation",
+    "android": "application/xml",
+    "ios": "text/plain; charset=utf-8",
+    "zip": "application/zip",
+}
+
+# MO strings are spooled in memory up to this many bytes per table, then to disk
+MO_SPOOL_MAX_SIZE = 1024 * 1024
+MO_CHUNK_SIZE = 64 * 1024
+
+
+async def export_json(pages: PageSource, project_id: str, locales: List[str]) -> AsyncIterator[bytes]:
+    """Stream a LocalizationBatchResponse-shaped JSON document, one pass per locale"""
+    yield b'{"projectId":' + json.dumps(project_id).encode() + b',"localizations":{'
+    for locale_index, locale in enumerate(locales):
+        if locale_index:
+            yield b","
+        yield json.dumps(locale).encode() + b":"
+        async for chunk in export_locale_json(pages, locale):
+            yield chunk
+    yield b"}}"
+
+
+async def export_locale_json(pages: PageSource, locale: str) -> AsyncIterator[bytes]:
+    """Stream one locale as a flat {key: value} JSON object"""
+    yield b"{"
+    first = True
+    async for page in pages([locale]):
+        entries = [
+            json.dumps(key, ensure_ascii=False) + ":" + json.dumps(values[locale], ensure_ascii=False)
+            for key, values in page if locale in values
+        ]
+        if entries:
+            yield (("" if first else ",") + ",".join(entries)).encode()
+            first = False
+    yield b"}"
+
+
+async def export_ndjson(pages: PageSource, locales: List[str]) -> AsyncIterator[bytes]:
+    """Stream one {"key": ..., "translations": {...}} line per key"""
+    async for page in pages(locales):
+        yield "".join(
+            json.dumps({"key": key, "translations": values}, ensure_ascii=False) + "\n"
+            for key, values in page
+        ).encode()
+
+
+def _po_quote(text: str) -> str:
+    return '"' + text.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n").replace("\t", "\\t") + '"'
+
+
+async def export_po(pages: PageSource, locale: str) -> AsyncIterator[bytes]:
+    """Stream one locale as a gettext PO file with keys as msgids"""
+    yield (
+        'msgid ""\n'
+        'msgstr ""\n'
+        f'"Language: {locale}\\n"\n'
+        '"MIME-Version: 1.0\\n"\n'
+        '"Content-Type: text/plain; charset=UTF-8\\n"\n'
+        '"Content-Transfer-Encoding: 8bit\\n"\n\n'
+    ).encode()
+    async for page in pages([locale]):
+        yield "".join(
+            f"msgid {_po_quote(key)}\nmsgstr {_po_quote(values[locale])}\n\n"
+            for key, values in page if locale in values
+        ).encode()
+
+
+async def export_mo(pages: PageSource, locale: str) -> AsyncIterator[bytes]:
+    """Stream one locale as a gettext MO file.
+
+    MO files start with offset tables for every string, so a single pass over the
+    pages spools the strings to temporary files while recording their lengths, and
+    the strings are streamed from there after the tables. An edit landing during the
+    pass can change which values are exported but never the offsets they are read by.
+    """
+    header = (
+        f"Language: {locale}\nMIME-Version: 1.0\n"
+        "Content-Type: text/plain; charset=UTF-8\nContent-Transfer-Encoding: 8bit\n"
+    ).encode()
+    # Strings are NUL-terminated: all msgids first, then all msgstrs
+    with tempfile.SpooledTemporaryFile(MO_SPOOL_MAX_SIZE) as originals, \
+            tempfile.SpooledTemporaryFile(MO_SPOOL_MAX_SIZE) as translations:
+        lengths = [(0, len(header))]  # The "" entry holding the header sorts first
+        originals.write(b"\0")
+        translations.write(header + b"\0")
+        async for page in pages([locale]):
+            for key, values in page:
+                if locale in values:
+                    key_bytes, value_bytes = key.encode(), values[locale].encode()
+                    originals.write(key_bytes + b"\0")
+                    translations.write(value_bytes + b"\0")
+                    lengths.append((len(key_bytes), len(value_bytes)))
+
+        count = len(lengths)
+        originals_offset = 28
+        translations_offset = originals_offset + count * 8
+        strings_offset = translations_offset + count * 8
+
+        originals_table = []
+        position = strings_offset
+        for key_length, _ in lengths:
+            originals_table.append(struct.pack("<II", key_length, position))
+            position += key_length + 1
+        translations_table = []
+        for _, value_length in lengths:
+            translations_table.append(struct.pack("<II", value_length, position))
+            position += value_length + 1
+
+        yield struct.pack("<7I", 0x950412DE, 0, count, originals_offset, translations_offset, 0, strings_offset)
+        yield b"".join(originals_table)
+        yield b"".join(translations_table)
+
+        for spool in (originals, translations):
+            spool.seek(0)
+            while True:
+                chunk = spool.read(MO_CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+
+
+def _android_name(key: str, used_names: Set[str]) -> str:
+    """Turn a key into a unique resource name, recording it in used_names.
+
+    Characters not allowed in resource names become underscores and a leading digit
+    gets an underscore prefix. Keys that still collide (a.b and a_b are both a_b) get
+    a numeric suffix, in key order, so the first one keeps the plain name.
+    """
+    base_name = re.sub(r"[^A-Za-z0-9_]", "_", key)
+    if not base_name or base_name[0].isdigit():
+        base_name = "_" + base_name
+    name = base_name
+    suffix = 2
+    while name in used_names:
+        name = f"{base_name}_{suffix}"
+        suffix += 1
+    used_names.add(name)
+    return name
+
+
+def _android_escape(text: str) -> str:
+    text = xml_escape(text).replace("\\", "\\\\").replace("'", "\\'").replace('"', '\\"').replace("\n", "\\n")
+    if text.startswith(("@", "?")):
+        text = "\\" + text
+    return text
+
+
+async def export_android(pages: PageSource, locale: str) -> AsyncIterator[bytes]:
+    """Stream one locale as an Android strings.xml resource file"""
+    used_names: Set[str] = set()
+    yield b'<?xml version="1.0" encoding="utf-8"?>\n<resources>\n'
+    async for page in pages([locale]):
+        yield "".join(
+            f'    <string name="{_android_name(key, used_names)}">{_android_escape(values[locale])}</string>\n'
+            for key, values in page if locale in values
+        ).encode()
+    yield b"</resources>\n"
+
+
+def _strings_quote(text: str) -> str:
+    return '"' + text.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+
+
+async def export_ios(pages: PageSource, locale: str) -> AsyncIterator[bytes]:
+    """Stream one locale as an iOS Localizable.strings file"""
+    async for page in pages([locale]):
+        yield "".join(
+            f"{_strings_quote(key)} = {_strings_quote(values[locale])};\n"
+            for key, values in page if locale in values
+        ).encode()
+
+
+LOCALE_EXPORTERS = {
+    "json": export_locale_json,
+    "po": export_po,
+    "mo": export_mo,
+    "android": export_android,
+    "ios": export_ios,
+}
+
+
+class _ZipStream(io.RawIOBase):
+    """Write-only, unseekable sink that hands written bytes back to the caller"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def export_zip(pages: PageSource, locales: List[str], file_format: str) -> AsyncIterator[bytes]:
+    """Stream a zip archive holding one file per locale in the given single-locale format"""
+    exporter = LOCALE_EXPORTERS[file_format]
+    extension = SINGLE_LOCALE_FORMATS[file_format]
+    stream = _ZipStream()
+    with zipfile.ZipFile(stream, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for locale in locales:
+            with archive.open(f"{locale}.{extension}", "w") as entry:
+                async for chunk in exporter(pages, locale):
+                    entry.write(chunk)
+                    data = stream.drain()
+                    if data:
+                        yield data
+    # Whatever the compressor still held, plus the central directory
+    yield stream.drain()
@@ -0,0 +1,49 @@
+"""Cross-worker cache invalidation (CACHE_INVALIDATION).
+
+Every worker caches project metadata and localization bundles in process. A write only
+invalidates the caches of the worker that made it, so without invalidation events the
+other workers keep serving a project's old metadata until PROJECT_CACHE_TTL_SECONDS runs
+out. With CACHE_INVALIDATION=postgres each worker LISTENs on the channel that schema.sql
+NOTIFYs whenever a project or its keys change, and drops that project from its caches.
+"""
+import os
+from abc import ABC, abstractmethod
+from typing import Callable, Optional
+
+# Channel notified by the notify_project_changed trigger, with the project ID as payload
+PROJECT_CHANGES_CHANNEL = "project_changes"
+
+CACHE_INVALIDATION_MODES = ("none", "postgres")
+
+
+class InvalidationListener(ABC):
+    """Delivers project change events published by any worker"""
+
+    @abstractmethod
+    async def start(self, on_change: Callable[[str], None], on_reset: Callable[[], None]) -> None:
+        """Start calling on_change(project_id) for every change event.
+
+        on_reset() is called whenever events may have been missed (after a lost connection
+        is re-established), so the caller can drop everything it cached.
+        """
+
+    @abstractmethod
+    async def stop(self) -> None:
+        """Stop listening and release the listener's connection"""
+
+
+def create_invalidation_listener() -> Optional[InvalidationListener]:
+    """Create the listener selected by CACHE_INVALIDATION, or None when it is disabled"""
+    mode = os.getenv("CACHE_INVALIDATION", "none")
+
+    if mode == "none":
+        return None
+
+    if mode == "postgres":
+        database_url = os.getenv("DATABASE_URL")
+        if not database_url:
+            raise ValueError("DATABASE_URL environment variable is required when CACHE_INVALIDATION=postgres")
+        from .postgres import PostgresInvalidationListener  # asyncpg is only needed for this listener
+        return PostgresInvalidationListener(database_url)
+
+    raise ValueError(f"CACHE_INVALIDATION must be one of: {', '.join(CACHE_INVALIDATION_MODES)}")
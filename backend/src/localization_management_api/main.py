@@ -1,22 +1,84 @@
-from typing import List, Optional
-from fastapi import FastAPI, HTTPException, Query, Depends
+import asyncio
+import contextlib
+import hashlib
+import json
+import logging
+import os
+from typing import Dict, List, Literal, Optional, Tuple
+from fastapi import FastAPI, HTTPException, Query, Depends, Response, Header
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import FileResponse, StreamingResponse
 from dotenv import load_dotenv
 
 from .models import (
     Project, TranslationKey, CreateProjectRequest, UpdateProjectRequest,
     CreateTranslationKeyRequest, UpdateTranslationRequest,
-    LocalizationResponse, LocalizationBatchResponse
+    LocalizationResponse, LocalizationBatchResponse, LocalizationChangesResponse, TranslationFilter,
+    BulkImportRequest, BulkImportProgress, BatchUpdateResult, ProjectEvent, Release, SetCurrentReleaseRequest
 )
-from .database import db_service
+from .database import db_service, get_db_service, close_db_service, fallback_chain, DatabaseService, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from .events import CATCH_UP, KEY_EVENT_TYPES, OVERFLOW, Subscription, encode_sse, encode_sse_id
+from . import compression, exporters, serialization
 
 # Load environment variables
 load_dotenv()
 
+# Cache-Control sent with localization responses. Clients always revalidate with
+# If-None-Match by default; set e.g. "public, max-age=60" to let a CDN serve them.
+LOCALIZATION_CACHE_CONTROL = os.getenv("LOCALIZATION_CACHE_CONTROL", "no-cache")
+
+# Opt-in fast path for translation key reads: rows from the database are encoded
+# straight to JSON instead of being built into models and re-validated by FastAPI
+FAST_JSON_RESPONSES = os.getenv("FAST_JSON_RESPONSES", "false").lower() == "true"
+
+# Localization bundles loaded into the bundle cache at startup, before /health/ready reports
+# the worker ready: comma-separated "project_id:locale" entries, or a bare project_id for
+# every supported language of the project
+PREWARM_BUNDLES = os.getenv("PREWARM_BUNDLES", "")
+
+# Seconds between keepalive comments on idle event streams, so proxies don't time them out
+EVENT_KEEPALIVE_SECONDS = 15
+
+logger = logging.getLogger(__name__)
+
+def parse_prewarm_targets(value: str) -> List[Tuple[str, Optional[str]]]:
+    """Parse PREWARM_BUNDLES into (project_id, locale) pairs, with None for every supported language"""
+    targets = []
+    for entry in value.split(","):
+        project_id, _, locale = entry.strip().partition(":")
+        if project_id:
+            targets.append((project_id, locale or None))
+    return targets
+
+async def prewarm(service: DatabaseService) -> None:
+    """Warm the bundle cache, then mark the worker ready"""
+    try:
+        app.state.prewarmed_bundles = await service.prewarm_bundles(parse_prewarm_targets(PREWARM_BUNDLES))
+    except Exception as e:
+        # Cold bundles only slow down first requests; they must not keep the worker out of rotation
+        logger.warning("Bundle prewarming failed: %s", e)
+    app.state.ready = True
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI):
+    # The database client is created when the worker starts, not when the app is imported.
+    # Prewarming runs in the background so /health answers while /health/ready waits for it.
+    app.state.ready = False
+    app.state.prewarmed_bundles = 0
+    service = get_db_service()
+    await service.start_cache_invalidation()
+    prewarm_task = asyncio.create_task(prewarm(service))
+    yield
+    prewarm_task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await prewarm_task
+    await close_db_service()
+
 app = FastAPI(
     title="Localization Management API",
     description="API for managing translation projects and localized content",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -26,6 +88,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Content-Version", "X-Next-Cursor", "X-Release-Id", "X-Fallback-Chain"],
 )
 
 # Dependency to get current user (simplified for demo)
@@ -33,11 +96,63 @@ async def get_current_user() -> str:
     # In a real app, this would validate JWT tokens, etc.
     return "demo-user"
 
+def localization_etag(project: Project, variant: str, encoding: str = "identity") -> str:
+    """Build a strong ETag from the project's content version, the requested locales and the content encoding"""
+    digest = hashlib.sha256(f"{project.id}:{project.content_version}:{variant}:{encoding}".encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison, per RFC 9110)"""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+def localization_headers(etag: str, project: Project) -> dict:
+    # X-Content-Version is the `since` token for a later delta sync
+    return {
+        "ETag": etag,
+        "Cache-Control": LOCALIZATION_CACHE_CONTROL,
+        "Vary": "Accept-Encoding",
+        "X-Content-Version": str(project.content_version)
+    }
+
+def bundle_response(bundle: Dict[str, bytes], encoding: str, headers: dict) -> Response:
+    """Send the precompressed representation of a cached bundle for the negotiated encoding"""
+    return Response(
+        content=bundle[encoding],
+        media_type="application/json",
+        headers={**headers, **compression.encoding_headers(encoding)}
+    )
+
 # Health check endpoint
 @app.get("/health")
 async def health_check():
     return {"status": "healthy", "service": "localization-management-api"}
 
+# Readiness check endpoint: point load balancers here so cold workers get no traffic
+@app.get("/health/ready")
+async def readiness_check(response: Response):
+    if not getattr(app.state, "ready", False):
+        response.status_code = 503
+        return {"status": "starting", "service": "localization-management-api"}
+    return {
+        "status": "ready",
+        "service": "localization-management-api",
+        "prewarmedBundles": app.state.prewarmed_bundles
+    }
+
+# Worker metrics: per kind of read, the loads that hit the database and the calls coalesced into them
+@app.get("/metrics")
+async def get_metrics():
+    return {
+        "singleFlight": db_service.single_flight.stats(),
+        "inFlightLoads": len(db_service.single_flight),
+        "bundleCacheEntries": len(db_service.bundle_cache),
+        "projectCacheEntries": len(db_service.project_cache),
+        "eventSubscriptions": db_service.events.stats()
+    }
+
 # ============================================================================
 # PROJECT ENDPOINTS
 # ============================================================================
@@ -107,6 +222,87 @@ async def delete_project(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+async def project_event_stream(subscription: Subscription, ready: ProjectEvent):
+    """Send a subscription's events as server-sent events until the client disconnects"""
+    try:
+        yield encode_sse(ready, ready.version)
+        while True:
+            try:
+                item = await asyncio.wait_for(subscription.queue.get(), EVENT_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield b": keepalive\n\n"
+                continue
+
+            if item is OVERFLOW:
+                # The client fell too far behind; it reconnects and resumes from its last event ID
+                yield encode_sse(ProjectEvent(type="resync", project_id=subscription.project_id))
+                return
+            if item is CATCH_UP:
+                synced_version = subscription.synced_version
+                try:
+                    events = await db_service.catch_up_events(subscription)
+                except Exception as e:
+                    logger.warning("Event catch-up for project %s failed: %s", subscription.project_id, e)
+                    yield encode_sse(ProjectEvent(type="resync", project_id=subscription.project_id))
+                    return
+                # Only the last sync event carries the ID: resuming from it must not skip the others
+                for index, event in enumerate(events):
+                    last = index == len(events) - 1
+                    yield encode_sse(event, subscription.synced_version if last and event.type == "sync" else None)
+                    if event.type == "project_deleted":
+                        return
+                if subscription.synced_version > synced_version and not events:
+                    yield encode_sse_id(subscription.synced_version)
+                continue
+
+            event = item
+            event_id = None
+            if event.type in KEY_EVENT_TYPES and event.version is not None:
+                # Already covered by what the client loaded or was sent during a catch-up
+                if event.version <= subscription.caught_up_version:
+                    continue
+                event_id = subscription.mark_sent(event.version)
+                if event_id is None:
+                    # Sent ahead of an earlier change; read that one back rather than wait for it
+                    subscription.request_catch_up()
+            yield encode_sse(event, event_id)
+            if event.type == "project_deleted":
+                return
+    finally:
+        db_service.events.unsubscribe(subscription)
+
+@app.get("/projects/{project_id}/events")
+async def stream_project_events(
+    project_id: str,
+    since: Optional[int] = Query(None, ge=0),
+    locales: List[str] = Query([]),
+    last_event_id: Optional[str] = Header(None)
+):
+    """Stream a project's changes as server-sent events.
+    
+    Event IDs are content versions up to which every change has been sent, so EventSource
+    resumes where it left off after a reconnect (Last-Event-ID). An event sent ahead of
+    an earlier change carries no ID until a catch-up has filled the gap. Pass the
+    X-Content-Version of the data already loaded as `since` to first receive what changed
+    after it, as one sync event per locale. `locales` limits the translations sent.
+    """
+    if last_event_id and last_event_id.isdigit():
+        since = int(last_event_id)
+    try:
+        subscribed = await db_service.subscribe_to_events(project_id, locales, since)
+        if subscribed is None:
+            raise HTTPException(status_code=404, detail="Project not found")
+        subscription, ready = subscribed
+        return StreamingResponse(
+            project_event_stream(subscription, ready),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 # ============================================================================
 # PROJECT LANGUAGE MANAGEMENT ENDPOINTS
 # ============================================================================
@@ -150,10 +346,43 @@ async def remove_project_language(
 # ============================================================================
 
 @app.get("/translation-keys", response_model=List[TranslationKey])
-async def get_translation_keys(project_id: Optional[str] = Query(None)):
-    """Get translation keys, optionally filtered by project"""
+async def get_translation_keys(
+    response: Response,
+    project_id: Optional[str] = Query(None),
+    search: Optional[str] = Query(None),
+    categories: List[str] = Query([]),
+    languages: List[str] = Query([]),
+    updated_by: Optional[str] = Query(None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None)
+):
+    """Get a page of translation keys ordered by key, optionally filtered.
+    
+    When more keys match, the X-Next-Cursor response header holds the cursor for the next page.
+    """
     try:
-        return await db_service.get_translation_keys(project_id)
+        filters = TranslationFilter(
+            search=search,
+            categories=categories,
+            languages=languages,
+            project_id=project_id,
+            updated_by=updated_by
+        )
+        if FAST_JSON_RESPONSES:
+            rows, next_cursor = await db_service.search_translation_key_rows(filters, limit, cursor)
+            headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+            return Response(
+                content=serialization.dump_translation_key_rows(rows),
+                media_type="application/json",
+                headers=headers
+            )
+        
+        keys, next_cursor = await db_service.search_translation_keys(filters, limit, cursor)
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        return keys
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -161,6 +390,12 @@ async def get_translation_keys(project_id: Optional[str] = Query(None)):
 async def get_translation_key(key_id: str):
     """Get a single translation key by ID"""
     try:
+        if FAST_JSON_RESPONSES:
+            row = await db_service.get_translation_key_row(key_id)
+            if not row:
+                raise HTTPException(status_code=404, detail="Translation key not found")
+            return Response(content=serialization.dump_translation_key_row(row), media_type="application/json")
+        
         key = await db_service.get_translation_key(key_id)
         if not key:
             raise HTTPException(status_code=404, detail="Translation key not found")
@@ -174,6 +409,10 @@ async def get_translation_key(key_id: str):
 async def get_translation_keys_batch(key_ids: List[str]):
     """Get multiple translation keys by their IDs"""
     try:
+        if FAST_JSON_RESPONSES:
+            rows = await db_service.get_translation_key_rows_by_ids(key_ids)
+            return Response(content=serialization.dump_translation_key_rows(rows), media_type="application/json")
+        
         return await db_service.get_translation_keys_by_ids(key_ids)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -187,8 +426,7 @@ async def create_translation_key(
     """Create a new translation key for a project"""
     try:
         # Verify project exists
-        project = await db_service.get_project(project_id)
-        if not project:
+        if not await db_service.project_exists(project_id):
             raise HTTPException(status_code=404, detail="Project not found")
         
         return await db_service.create_translation_key(project_id, key_data, current_user)
@@ -197,6 +435,58 @@ async def create_translation_key(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/projects/{project_id}/translation-keys/import", response_model=BulkImportProgress)
+async def import_translation_keys(
+    project_id: str,
+    import_data: BulkImportRequest,
+    stream: bool = Query(False),
+    current_user: str = Depends(get_current_user)
+):
+    """Bulk import translation keys for a project.
+    
+    Rows that fail are reported by index without aborting the import. With stream=true,
+    progress is streamed as NDJSON after each chunk instead of returned once at the end.
+    """
+    try:
+        project = await db_service.get_project_metadata(project_id)
+        if not project:
+            raise HTTPException(status_code=404, detail="Project not found")
+        
+        progress_updates = db_service.import_translation_keys(
+            project_id, import_data.keys, current_user, import_data.upsert
+        )
+        
+        if stream:
+            async def stream_progress():
+                try:
+                    async for progress in progress_updates:
+                        yield progress.model_dump_json(by_alias=True) + "\n"
+                except Exception as e:
+                    yield json.dumps({"error": str(e)}) + "\n"
+            
+            return StreamingResponse(stream_progress(), media_type="application/x-ndjson")
+        
+        failed = []
+        async for progress in progress_updates:
+            failed.extend(progress.failed)
+        progress.failed = failed
+        return progress
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.put("/translation-keys/batch", response_model=BatchUpdateResult)
+async def update_translation_keys_batch(
+    updates: Dict[str, Dict[str, str]],
+    current_user: str = Depends(get_current_user)
+):
+    """Update translations for many keys at once (key ID -> locale -> value)"""
+    try:
+        return await db_service.update_translation_keys_batch(updates, current_user)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.put("/translation-keys/{key_id}", response_model=TranslationKey)
 async def update_translation_key(
     key_id: str,
@@ -235,80 +525,328 @@ async def delete_translation_key(
 # ============================================================================
 
 @app.get("/localizations/{project_id}/{locale}", response_model=LocalizationResponse)
-async def get_localizations(project_id: str, locale: str):
-    """Get all localizations for a project and locale"""
+async def get_localizations(
+    project_id: str,
+    locale: str,
+    categories: List[str] = Query([]),
+    prefixes: List[str] = Query([]),
+    fallback: bool = Query(False),
+    fallbacks: List[str] = Query([]),
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None)
+):
+    """Get all localizations for a project and locale.
+    
+    With `categories` and/or key `prefixes`, only the keys in those namespaces are
+    returned (keys matching any of them), so a client can load just what a screen needs.
+    With `fallback=true`, keys missing in the locale are filled in from its parent
+    locales and then the project's default language (pt-BR -> pt -> en), or from the
+    explicit `fallbacks` chain when given, and returned as one merged object. Explicit
+    fallbacks must be languages the project supports.
+    """
     try:
-        # Verify project exists
-        project = await db_service.get_project(project_id)
+        # Verify project exists and read its content version
+        project = await db_service.get_project_metadata(project_id)
         if not project:
             raise HTTPException(status_code=404, detail="Project not found")
         
-        localizations = await db_service.get_localizations(project_id, locale)
+        # Sorted and deduplicated so equivalent requests share a cache entry and ETag
+        namespaces = sorted(set(
+            [("category", category) for category in categories] + [("prefix", prefix) for prefix in prefixes if prefix]
+        ))
+        chain = fallback_chain(locale, project, fallbacks) if fallback or fallbacks else [locale]
+        variant = ",".join(chain)
+        if namespaces:
+            variant += f":{json.dumps(namespaces)}"
         
-        return LocalizationResponse(
-            project_id=project_id,
-            locale=locale,
-            localizations=localizations
-        )
+        encoding = compression.negotiate_encoding(accept_encoding)
+        etag = localization_etag(project, variant, encoding)
+        headers = localization_headers(etag, project)
+        if len(chain) > 1:
+            headers["X-Fallback-Chain"] = ", ".join(chain)
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+        
+        # Served pre-serialized and precompressed from the bundle cache; the body already matches LocalizationResponse
+        if len(chain) > 1:
+            bundle = await db_service.get_localization_fallback_bundle(project_id, chain, namespaces, project.content_version)
+        elif namespaces:
+            bundle = await db_service.get_localization_namespace_bundle(project_id, locale, namespaces, project.content_version)
+        else:
+            bundle = await db_service.get_localization_bundle(project_id, locale, project.content_version)
+        return bundle_response(bundle, encoding, headers)
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/localizations/{project_id}/{locale}/changes", response_model=LocalizationChangesResponse)
+async def get_localization_changes(project_id: str, locale: str, since: int = Query(0, ge=0)):
+    """Get the keys of a locale added, changed or deleted since a content version.
+    
+    Use the X-Content-Version header of a bundle, or the `version` of a previous
+    sync, as `since`. When `full` is true the client should replace its bundle.
+    """
+    try:
+        changes = await db_service.get_localization_changes(project_id, locale, since)
+        if not changes:
+            raise HTTPException(status_code=404, detail="Project not found")
+        return changes
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/localizations/{project_id}/batch", response_model=LocalizationBatchResponse)
-async def get_localizations_batch(project_id: str, locales: List[str]):
+async def get_localizations_batch(
+    project_id: str,
+    locales: List[str],
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None)
+):
     """Get localizations for multiple locales at once"""
     try:
-        # Verify project exists
-        project = await db_service.get_project(project_id)
+        # Verify project exists and read its content version
+        project = await db_service.get_project_metadata(project_id)
         if not project:
             raise HTTPException(status_code=404, detail="Project not found")
         
-        batch_localizations = await db_service.get_localizations_batch(project_id, locales)
+        encoding = compression.negotiate_encoding(accept_encoding)
+        etag = localization_etag(project, ",".join(locales), encoding)
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=localization_headers(etag, project))
         
-        return LocalizationBatchResponse(
-            project_id=project_id,
-            localizations=batch_localizations
-        )
+        bundle = await db_service.get_localization_batch_bundle(project_id, locales, project.content_version)
+        return bundle_response(bundle, encoding, localization_headers(etag, project))
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/localizations/{project_id}")
-async def get_all_project_localizations(project_id: str):
+@app.get("/localizations/{project_id}", response_model=LocalizationBatchResponse)
+async def get_all_project_localizations(
+    project_id: str,
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None)
+):
     """Get all localizations for a project across all supported languages"""
     try:
         # Verify project exists and get supported languages
-        project = await db_service.get_project(project_id)
+        project = await db_service.get_project_metadata(project_id)
         if not project:
             raise HTTPException(status_code=404, detail="Project not found")
         
-        batch_localizations = await db_service.get_localizations_batch(
+        encoding = compression.negotiate_encoding(accept_encoding)
+        etag = localization_etag(project, "all:" + ",".join(project.supported_languages), encoding)
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=localization_headers(etag, project))
+        
+        bundle = await db_service.get_localization_batch_bundle(
             project_id, 
-            project.supported_languages
+            project.supported_languages,
+            project.content_version
         )
+        return bundle_response(bundle, encoding, localization_headers(etag, project))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/projects/{project_id}/export")
+async def export_project_localizations(
+    project_id: str,
+    format: Literal["json", "ndjson", "po", "mo", "android", "ios", "zip"] = Query("json"),
+    locale: Optional[str] = Query(None),
+    locales: List[str] = Query([]),
+    file_format: Literal["json", "po", "mo", "android", "ios"] = Query("json"),
+    accept_encoding: Optional[str] = Header(None)
+):
+    """Stream a project's localizations as a file.
+    
+    json, ndjson and zip cover `locales` (default: every supported language); po, mo,
+    android and ios export the single `locale`. A zip holds one `file_format` file per locale.
+    Keys are read page by page, so memory use does not grow with the project.
+    """
+    try:
+        project = await db_service.get_project_metadata(project_id)
+        if not project:
+            raise HTTPException(status_code=404, detail="Project not found")
         
-        return LocalizationBatchResponse(
-            project_id=project_id,
-            localizations=batch_localizations
+        export_locales = locales or project.supported_languages
+        pages = lambda page_locales: db_service.iter_localization_pages(project_id, page_locales)
+        
+        if format == "json":
+            body = exporters.export_json(pages, project_id, export_locales)
+            filename = f"{project_id}.json"
+        elif format == "ndjson":
+            body = exporters.export_ndjson(pages, export_locales)
+            filename = f"{project_id}.ndjson"
+        elif format == "zip":
+            body = exporters.export_zip(pages, export_locales, file_format)
+            filename = f"{project_id}.zip"
+        else:
+            if not locale:
+                raise HTTPException(status_code=400, detail=f"The {format} format requires a locale")
+            body = exporters.LOCALE_EXPORTERS[format](pages, locale)
+            filename = f"{locale}.{exporters.SINGLE_LOCALE_FORMATS[format]}"
+        
+        # Zip archives are already deflated; everything else is compressed as it streams
+        encoding = "identity" if format == "zip" else compression.negotiate_encoding(accept_encoding)
+        return StreamingResponse(
+            compression.compress_stream(body, encoding),
+            media_type=exporters.MEDIA_TYPES[format],
+            headers={
+                "Content-Disposition": f'attachment; filename="{filename}"',
+                **compression.encoding_headers(encoding)
+            }
         )
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# ============================================================================
+# RELEASE ENDPOINTS
+# ============================================================================
+
+# Cache-Control for content-hashed bundle files, whose content never changes
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+def release_file_response(project_id: str, bundle_hash: str, encoding: str, headers: dict) -> Response:
+    """Send a published bundle file straight from disk in the negotiated encoding"""
+    path = db_service.releases.bundle_path(project_id, bundle_hash, encoding)
+    if path is None and encoding != "identity":
+        # Published without this encoding (e.g. before brotli was installed)
+        encoding = "identity"
+        path = db_service.releases.bundle_path(project_id, bundle_hash, encoding)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Bundle not found")
+    return FileResponse(path, media_type="application/json", headers={**headers, **compression.encoding_headers(encoding)})
+
+@app.post("/projects/{project_id}/releases", response_model=Release)
+async def publish_release(
+    project_id: str,
+    current_user: str = Depends(get_current_user)
+):
+    """Freeze the project's current translations into a release and start serving it"""
+    try:
+        release = await db_service.publish_release(project_id, current_user)
+        if not release:
+            raise HTTPException(status_code=404, detail="Project not found")
+        return release
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/projects/{project_id}/releases", response_model=List[Release])
+async def get_releases(project_id: str):
+    """Get a project's published releases, newest first"""
+    try:
+        return await db_service.get_releases(project_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Project not found")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.put("/projects/{project_id}/releases/current", response_model=Release)
+async def set_current_release(
+    project_id: str,
+    request: SetCurrentReleaseRequest,
+    current_user: str = Depends(get_current_user)
+):
+    """Serve a previously published release, e.g. to roll back"""
+    try:
+        release = await db_service.set_current_release(project_id, request.release_id)
+        if not release:
+            raise HTTPException(status_code=404, detail="Release not found")
+        return release
+    except HTTPException:
+        raise
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Project not found")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/releases/{project_id}", response_model=Release)
+async def get_current_release(project_id: str):
+    """Get the manifest of the release being served. Reads release files only, never the database"""
+    try:
+        release = await db_service.get_current_release(project_id)
+        if not release:
+            raise HTTPException(status_code=404, detail="No published release")
+        return release
+    except HTTPException:
+        raise
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Project not found")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/releases/{project_id}/bundles/{bundle_hash}.json")
+async def get_release_bundle(project_id: str, bundle_hash: str, accept_encoding: Optional[str] = Header(None)):
+    """Get a published bundle by content hash, cacheable forever"""
+    try:
+        encoding = compression.negotiate_encoding(accept_encoding)
+        return release_file_response(project_id, bundle_hash, encoding, {"Cache-Control": IMMUTABLE_CACHE_CONTROL})
+    except HTTPException:
+        raise
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Project not found")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/releases/{project_id}/{locale}", response_model=LocalizationResponse)
+async def get_release_localizations(
+    project_id: str,
+    locale: str,
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None)
+):
+    """Get a locale's bundle from the release being served, in the same shape as /localizations.
+    
+    Reads release files only, never the database. X-Content-Version is the version the
+    release was published at, so a client can delta sync from it to the live strings.
+    """
+    try:
+        release = await db_service.get_current_release(project_id)
+        if not release:
+            raise HTTPException(status_code=404, detail="No published release")
+        bundle = release.bundles.get(locale)
+        if not bundle:
+            raise HTTPException(status_code=404, detail="Locale not in release")
+        
+        encoding = compression.negotiate_encoding(accept_encoding)
+        etag = f'"{bundle.hash[:32]}-{encoding}"'
+        headers = {
+            "ETag": etag,
+            "Cache-Control": LOCALIZATION_CACHE_CONTROL,
+            "Vary": "Accept-Encoding",
+            "X-Content-Version": str(release.content_version),
+            "X-Release-Id": release.release_id
+        }
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+        return release_file_response(project_id, bundle.hash, encoding, headers)
+    except HTTPException:
+        raise
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Project not found")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 # ============================================================================
 # UTILITY ENDPOINTS
 # ============================================================================
 
 @app.get("/projects/{project_id}/categories")
 async def get_project_categories(project_id: str):
-    """Get all unique categories for a project"""
+    """Get all unique categories for a project, with the number of keys in each"""
     try:
-        translation_keys = await db_service.get_translation_keys(project_id)
-        categories = list(set(key.category for key in translation_keys if key.category))
-        return {"categories": sorted(categories)}
+        category_counts = await db_service.get_project_categories(project_id)
+        return {"categories": list(category_counts), "counts": category_counts}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -316,35 +854,27 @@ async def get_project_categories(project_id: str):
 async def get_project_stats(project_id: str):
     """Get statistics for a project"""
     try:
-        project = await db_service.get_project(project_id)
-        if not project:
+        # Counts are maintained on write, so this is one lookup whatever the project size
+        stats = await db_service.get_project_stats(project_id)
+        if not stats:
             raise HTTPException(status_code=404, detail="Project not found")
         
-        translation_keys = await db_service.get_translation_keys(project_id)
-        
         # Calculate completion stats
-        total_keys = len(translation_keys)
         language_stats = {}
-        
-        for lang in project.supported_languages:
-            translated_count = sum(
-                1 for key in translation_keys 
-                if lang in key.translations and key.translations[lang].value.strip()
-            )
+        for lang in stats.supported_languages:
+            translated_count = stats.translated_counts.get(lang, 0)
             language_stats[lang] = {
                 "translated": translated_count,
-                "total": total_keys,
-                "completion_percentage": (translated_count / total_keys * 100) if total_keys > 0 else 0
+                "total": stats.total_keys,
+                "completion_percentage": (translated_count / stats.total_keys * 100) if stats.total_keys > 0 else 0
             }
         
-        categories = list(set(key.category for key in translation_keys if key.category))
-        
         return {
             "project_id": project_id,
-            "total_keys": total_keys,
-            "categories": sorted(categories),
+            "total_keys": stats.total_keys,
+            "categories": sorted(stats.category_counts),
             "language_stats": language_stats,
-            "supported_languages": project.supported_languages
+            "supported_languages": stats.supported_languages
         }
     except HTTPException:
         raise
@@ -355,29 +885,23 @@ async def get_project_stats(project_id: str):
 async def get_project_analytics(project_id: str):
     """Get translation completion analytics for a project"""
     try:
-        project = await db_service.get_project(project_id)
-        if not project:
+        stats = await db_service.get_project_stats(project_id)
+        if not stats:
             raise HTTPException(status_code=404, detail="Project not found")
         
-        translation_keys = await db_service.get_translation_keys(project_id)
-        total_keys = len(translation_keys)
-        
         # Calculate completion percentages for each language
         completion_stats = {}
-        for lang in project.supported_languages:
-            translated_count = sum(
-                1 for key in translation_keys 
-                if lang in key.translations and key.translations[lang].value.strip()
-            )
+        for lang in stats.supported_languages:
+            translated_count = stats.translated_counts.get(lang, 0)
             completion_stats[lang] = {
                 "translated": translated_count,
-                "total": total_keys,
-                "percentage": (translated_count / total_keys * 100) if total_keys > 0 else 0
+                "total": stats.total_keys,
+                "percentage": (translated_count / stats.total_keys * 100) if stats.total_keys > 0 else 0
             }
         
         return {
             "project_id": project_id,
-            "total_keys": total_keys,
+            "total_keys": stats.total_keys,
             "completion_stats": completion_stats
         }
     except HTTPException:
@@ -0,0 +1,28 @@
+"""Move translation values between the JSONB column and the normalized translations table.
+
+Usage:
+    python -m src.localization_management_api.migrate_translations [--to {table,jsonb}] [PROJECT_ID]
+
+Set TRANSLATION_STORAGE to the same layout so new writes land there too. Without a
+project ID every project is migrated.
+"""
+import argparse
+import asyncio
+
+from .database import db_service, close_db_service, TRANSLATION_STORAGE_LAYOUTS
+
+
+async def main(layout, project_id=None):
+    try:
+        await db_service.migrate_translations(layout, project_id)
+    finally:
+        await close_db_service()
+    print(f"Migrated translations to {layout} storage for {'project ' + project_id if project_id else 'all projects'}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Migrate translation values to another storage layout")
+    parser.add_argument("--to", dest="layout", choices=TRANSLATION_STORAGE_LAYOUTS, default="table", help="Target layout (default: table)")
+    parser.add_argument("project_id", nargs="?", help="Only migrate this project")
+    args = parser.parse_args()
+    asyncio.run(main(args.layout, args.project_id))
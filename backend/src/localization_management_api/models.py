@@ -33,6 +33,7 @@ class Project(BaseModel):
     created_by: str = Field(alias="createdBy")
     translation_key_count: int = Field(alias="translationKeyCount", default=0)
     is_active: bool = Field(alias="isActive", default=True)
+    content_version: int = Field(alias="contentVersion", default=0)
 
     class Config:
         populate_by_name = True
@@ -81,6 +82,47 @@ class UpdateTranslationRequest(BaseModel):
     translations: Dict[str, str]
 
 
+class ProjectStatsSummary(BaseModel):
+    supported_languages: List[str] = Field(alias="supportedLanguages")
+    total_keys: int = Field(alias="totalKeys")
+    translated_counts: Dict[str, int] = Field(alias="translatedCounts")  # language -> translated keys
+    category_counts: Dict[str, int] = Field(alias="categoryCounts")  # category -> keys
+
+    class Config:
+        populate_by_name = True
+
+
+class BatchUpdateResult(BaseModel):
+    updated: List[str]
+    not_found: List[str] = Field(alias="notFound", default=[])
+
+    class Config:
+        populate_by_name = True
+
+
+class BulkImportRequest(BaseModel):
+    keys: List[CreateTranslationKeyRequest]
+    upsert: bool = False  # Overwrite existing keys instead of reporting them as failures
+
+
+class BulkImportRowError(BaseModel):
+    index: int
+    key: str
+    error: str
+
+
+class BulkImportProgress(BaseModel):
+    total: int
+    processed: int
+    imported: int
+    failed_count: int = Field(alias="failedCount", default=0)
+    failed: List[BulkImportRowError] = []
+    done: bool = False
+
+    class Config:
+        populate_by_name = True
+
+
 class TranslationFilter(BaseModel):
     search: Optional[str] = ""
     categories: List[str] = []
@@ -102,9 +144,63 @@ class LocalizationResponse(BaseModel):
         populate_by_name = True
 
 
+class LocalizationChangesResponse(BaseModel):
+    project_id: str = Field(alias="projectId")
+    locale: str
+    version: int  # Pass back as `since` on the next sync
+    full: bool = False  # True when `upserted` is the whole bundle and should replace it
+    upserted: Dict[str, str]  # key -> value
+    deleted: List[str]
+
+    class Config:
+        populate_by_name = True
+
+
 class LocalizationBatchResponse(BaseModel):
     project_id: str = Field(alias="projectId")
     localizations: Dict[str, Dict[str, str]]  # locale -> key -> value
 
     class Config:
-        populate_by_name = True 
\ No newline at end of file
+        populate_by_name = True 
+
+class ProjectEvent(BaseModel):
+    type: str  # ready, key_created, key_updated, key_deleted, language_added, language_removed, sync, project_deleted, resync
+    project_id: str = Field(alias="projectId")
+    version: Optional[int] = None  # Content version the event brings the subscriber up to
+    key_id: Optional[str] = Field(alias="keyId", default=None)
+    key: Optional[str] = None
+    category: Optional[str] = None
+    translations: Optional[Dict[str, str]] = None  # locale -> value, for the locales written
+    language: Optional[str] = None
+    supported_languages: Optional[List[str]] = Field(alias="supportedLanguages", default=None)
+    locale: Optional[str] = None  # sync events carry one locale's changes, as in LocalizationChangesResponse
+    full: Optional[bool] = None
+    upserted: Optional[Dict[str, str]] = None
+    deleted: Optional[List[str]] = None
+
+    class Config:
+        populate_by_name = True
+
+
+class ReleaseBundle(BaseModel):
+    hash: str  # sha256 of the uncompressed LocalizationResponse body, also its file name
+    size: int
+
+
+class Release(BaseModel):
+    release_id: str = Field(alias="releaseId")
+    project_id: str = Field(alias="projectId")
+    content_version: int = Field(alias="contentVersion")  # Project content version the bundles were read at
+    created_at: datetime = Field(alias="createdAt")
+    created_by: str = Field(alias="createdBy")
+    bundles: Dict[str, ReleaseBundle]  # locale -> bundle
+
+    class Config:
+        populate_by_name = True
+
+
+class SetCurrentReleaseRequest(BaseModel):
+    release_id: str = Field(alias="releaseId")
+
+    class Config:
+        populate_by_name = True
@@ -0,0 +1,334 @@
+"""Direct PostgreSQL storage backend (DATABASE_BACKEND=postgres).
+
+Queries go straight to the database over a pool of asyncpg connections instead of
+through PostgREST over HTTP. asyncpg prepares every statement on first use and
+reuses it per connection, and writes that touch several tables run in a single
+transaction. The SQL functions from schema.sql are called exactly as PostgREST
+calls them, so both backends return the same data.
+"""
+import asyncio
+import json
+import logging
+import uuid
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import asyncpg
+
+from .invalidation import PROJECT_CHANGES_CHANNEL, InvalidationListener
+from .storage import StorageBackend
+
+logger = logging.getLogger(__name__)
+
+# Translation keys with values from the normalized translations table folded in, as
+# the TRANSLATION_KEY_SELECT embed does for the supabase backend
+TRANSLATION_KEY_QUERY = "SELECT merged.* FROM translation_keys tk CROSS JOIN LATERAL with_translation_rows(tk) merged"
+
+# How often the invalidation listener checks its connection is alive, and how long it
+# waits between reconnection attempts (doubling up to the maximum) once it is lost
+LISTENER_HEALTH_CHECK_SECONDS = 5
+LISTENER_RECONNECT_DELAY_SECONDS = 1
+LISTENER_MAX_RECONNECT_DELAY_SECONDS = 30
+
+
+def _json_value(value: Any) -> Any:
+    """Convert a value decoded by asyncpg to what PostgREST would have sent as JSON"""
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, list):
+        return [_json_value(item) for item in value]
+    return value
+
+
+def _row(record: Optional[asyncpg.Record]) -> Optional[dict]:
+    """Convert an asyncpg record to a PostgREST-shaped row"""
+    if record is None:
+        return None
+    return {name: _json_value(value) for name, value in record.items()}
+
+
+def _rows(records: List[asyncpg.Record]) -> List[dict]:
+    return [_row(record) for record in records]
+
+
+def _column_list(columns) -> str:
+    return ", ".join(f'"{column}"' for column in columns)
+
+
+async def _init_connection(connection: asyncpg.Connection) -> None:
+    """Exchange json and jsonb values as Python objects"""
+    for type_name in ("json", "jsonb"):
+        await connection.set_type_codec(type_name, encoder=json.dumps, decoder=json.loads, schema="pg_catalog")
+
+
+class PostgresBackend(StorageBackend):
+    """Storage over a pool of direct asyncpg connections"""
+
+    def __init__(self, database_url: str, max_concurrency: int = 10):
+        self.database_url = database_url
+        self.max_concurrency = max_concurrency
+        self._pool: Optional[asyncpg.Pool] = None
+        self._pool_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pool_lock: Optional[asyncio.Lock] = None
+
+    async def pool(self) -> asyncpg.Pool:
+        """Get the connection pool, creating it on first use"""
+        # A pool only works on the event loop it was created on, so callers that run
+        # several loops in turn (scripts calling asyncio.run, tests) each get their own
+        loop = asyncio.get_running_loop()
+        if self._pool_loop is not loop:
+            self._pool, self._pool_loop, self._pool_lock = None, loop, asyncio.Lock()
+        if self._pool is None:
+            async with self._pool_lock:
+                if self._pool is None:
+                    self._pool = await asyncpg.create_pool(
+                        self.database_url,
+                        min_size=1,
+                        max_size=self.max_concurrency,
+                        init=_init_connection
+                    )
+        return self._pool
+
+    async def close(self) -> None:
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+    async def _fetch(self, query: str, *args) -> List[dict]:
+        pool = await self.pool()
+        return _rows(await pool.fetch(query, *args))
+
+    async def _fetchrow(self, query: str, *args) -> Optional[dict]:
+        pool = await self.pool()
+        return _row(await pool.fetchrow(query, *args))
+
+    async def _fetchval(self, query: str, *args) -> Any:
+        pool = await self.pool()
+        return await pool.fetchval(query, *args)
+
+    @staticmethod
+    def _insert_statement(table: str, columns, row_source: str, conflict: str = "") -> str:
+        """Build an INSERT of `columns` taking typed values from a jsonb_populate_record(set) call.
+
+        Rows are passed as one JSONB parameter and cast by the database, like PostgREST does,
+        so ISO timestamps, arrays and nested JSON need no conversion on this side.
+        """
+        column_list = _column_list(columns)
+        return f"INSERT INTO {table} ({column_list}) SELECT {column_list} FROM {row_source} {conflict} RETURNING *"
+
+    # Projects
+    async def list_projects(self) -> List[dict]:
+        return await self._fetch("""
+            SELECT p.*, (SELECT COUNT(*) FROM translation_keys tk WHERE tk.project_id = p.id) AS translation_key_count
+            FROM projects p
+            WHERE p.is_active
+        """)
+
+    async def get_project(self, project_id: str) -> Optional[dict]:
+        return await self._fetchrow("""
+            SELECT p.*, (SELECT COUNT(*) FROM translation_keys tk WHERE tk.project_id = p.id) AS translation_key_count
+            FROM projects p
+            WHERE p.id = $1
+        """, project_id)
+
+    async def get_project_row(self, project_id: str) -> Optional[dict]:
+        return await self._fetchrow("SELECT * FROM projects WHERE id = $1", project_id)
+
+    async def insert_project(self, row: dict) -> Optional[dict]:
+        return await self._fetchrow(
+            self._insert_statement("projects", row, "jsonb_populate_record(NULL::projects, $1)"),
+            row
+        )
+
+    async def update_project(self, project_id: str, values: dict) -> Optional[dict]:
+        column_list = _column_list(values)
+        return await self._fetchrow(f"""
+            UPDATE projects
+            SET ({column_list}) = (SELECT {column_list} FROM jsonb_populate_record(NULL::projects, $2))
+            WHERE id = $1
+            RETURNING *
+        """, project_id, values)
+
+    async def add_project_language(self, project_id: str, language_code: str) -> Optional[dict]:
+        return await self._fetchrow("SELECT * FROM add_project_language($1, $2)", project_id, language_code)
+
+    async def remove_project_language(self, project_id: str, language_code: str) -> Optional[dict]:
+        return await self._fetchrow("SELECT * FROM remove_project_language($1, $2)", project_id, language_code)
+
+    async def get_project_stats(self, project_id: str) -> Optional[dict]:
+        return await self._fetchrow("""
+            SELECT
+                p.supported_languages,
+                COALESCE((
+                    SELECT jsonb_agg(jsonb_build_object('language', s.language, 'translated_count', s.translated_count))
+                    FROM project_language_stats s
+                    WHERE s.project_id = p.id
+                ), '[]'::jsonb) AS project_language_stats,
+                COALESCE((
+                    SELECT jsonb_agg(jsonb_build_object('category', c.category, 'key_count', c.key_count))
+                    FROM project_categories c
+                    WHERE c.project_id = p.id
+                ), '[]'::jsonb) AS project_categories
+            FROM projects p
+            WHERE p.id = $1
+        """, project_id)
+
+    async def get_project_categories(self, project_id: str) -> List[dict]:
+        return await self._fetch(
+            "SELECT category, key_count FROM project_categories WHERE project_id = $1 ORDER BY category",
+            project_id
+        )
+
+    # Translation keys
+    async def list_translation_keys(self, project_id: Optional[str] = None) -> List[dict]:
+        if project_id:
+            return await self._fetch(f"{TRANSLATION_KEY_QUERY} WHERE tk.project_id = $1", project_id)
+        return await self._fetch(TRANSLATION_KEY_QUERY)
+
+    async def get_translation_key(self, key_id: str) -> Optional[dict]:
+        return await self._fetchrow(f"{TRANSLATION_KEY_QUERY} WHERE tk.id = $1", key_id)
+
+    async def get_translation_keys_by_ids(self, key_ids: List[str]) -> List[dict]:
+        return await self._fetch(f"{TRANSLATION_KEY_QUERY} WHERE tk.id = ANY($1::uuid[])", key_ids)
+
+    async def search_translation_keys(self, params: dict) -> List[dict]:
+        return await self._fetch("""
+            SELECT * FROM search_translation_keys(
+                p_project_id => $1, p_search_pattern => $2, p_categories => $3, p_languages => $4,
+                p_updated_by => $5, p_after_key => $6, p_after_id => $7, p_limit => $8
+            )
+        """, *(params[name] for name in (
+            "p_project_id", "p_search_pattern", "p_categories", "p_languages",
+            "p_updated_by", "p_after_key", "p_after_id", "p_limit"
+        )))
+
+    async def insert_translation_key(self, row: dict, translations: Optional[dict] = None) -> Optional[dict]:
+        return await self._fetchrow("SELECT * FROM insert_translation_key($1, $2)", row, translations)
+
+    async def upsert_translation_keys(
+        self,
+        rows: List[dict],
+        upsert: bool,
+        translations_by_key: Optional[Dict[str, dict]] = None
+    ) -> List[dict]:
+        return await self._fetch("SELECT * FROM upsert_translation_keys($1, $2, $3)", rows, upsert, translations_by_key)
+
+    async def merge_translations(self, key_id: str, translations: dict, layout: str) -> Optional[dict]:
+        merge_function = "merge_translation_rows" if layout == "table" else "merge_translations"
+        return await self._fetchrow(f"SELECT * FROM {merge_function}($1, $2)", key_id, translations)
+
+    async def merge_translations_batch(self, updates: Dict[str, dict], layout: str) -> List[dict]:
+        merge_function = "merge_translation_rows_batch" if layout == "table" else "merge_translations_batch"
+        return await self._fetch(f"SELECT * FROM {merge_function}($1)", updates)
+
+    async def delete_translation_key(self, key_id: str) -> List[dict]:
+        return await self._fetch("SELECT * FROM delete_translation_key($1)", key_id)
+
+    # Localizations
+    async def get_localization_bundles(self, project_id: str, locales: List[str]) -> dict:
+        return await self._fetchval("SELECT get_localization_bundles($1, $2)", project_id, locales) or {}
+
+    async def get_localization_namespace(
+        self,
+        project_id: str,
+        locale: str,
+        category: Optional[str] = None,
+        key_prefix: Optional[str] = None
+    ) -> dict:
+        return await self._fetchval(
+            "SELECT get_localization_namespace($1, $2, $3, $4)", project_id, locale, category, key_prefix
+        ) or {}
+
+    async def get_localization_page(
+        self,
+        project_id: str,
+        locales: List[str],
+        after_key: Optional[str],
+        limit: int
+    ) -> List[dict]:
+        return await self._fetch("SELECT * FROM get_localization_page($1, $2, $3, $4)", project_id, locales, after_key, limit)
+
+    async def get_localization_changes(self, project_id: str, locale: str, since: int) -> Optional[dict]:
+        return await self._fetchval("SELECT get_localization_changes($1, $2, $3)", project_id, locale, since)
+
+    # Maintenance
+    async def rebuild_project_stats(self, project_id: Optional[str] = None) -> None:
+        await self._fetchval("SELECT rebuild_project_stats($1)", project_id)
+
+    async def migrate_translations(self, layout: str, project_id: Optional[str] = None) -> None:
+        await self._fetchval(f"SELECT migrate_translations_to_{layout}($1)", project_id)
+
+    async def prune_tombstones(self, retention_days: int) -> int:
+        return await self._fetchval("SELECT prune_translation_key_tombstones($1)", retention_days)
+
+
+class PostgresInvalidationListener(InvalidationListener):
+    """Receives project change events over a dedicated LISTEN connection.
+
+    LISTEN needs a session of its own, so the URL must not point at a pooler in
+    transaction mode (use Supabase's direct or session mode connection string).
+    """
+
+    def __init__(self, database_url: str):
+        self.database_url = database_url
+        self._connection: Optional[asyncpg.Connection] = None
+        self._task: Optional[asyncio.Task] = None
+        self._on_change: Callable[[str], None] = lambda project_id: None
+        self._on_reset: Callable[[], None] = lambda: None
+
+    async def start(self, on_change: Callable[[str], None], on_reset: Callable[[], None]) -> None:
+        self._on_change = on_change
+        self._on_reset = on_reset
+        # Listen before the worker starts caching, so no change can slip in between
+        await self._connect()
+        self._task = asyncio.create_task(self._watch())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._connection is not None:
+            await self._connection.close()
+            self._connection = None
+
+    async def _connect(self) -> bool:
+        try:
+            connection = await asyncpg.connect(self.database_url)
+            await connection.add_listener(PROJECT_CHANGES_CHANNEL, self._notify)
+        except Exception as e:
+            logger.warning("Cache invalidation listener could not connect: %s", e)
+            return False
+        self._connection = connection
+        return True
+
+    def _notify(self, connection: asyncpg.Connection, pid: int, channel: str, payload: str) -> None:
+        self._on_change(payload)
+
+    async def _watch(self) -> None:
+        """Check the connection periodically and re-establish it when it is lost"""
+        delay = LISTENER_RECONNECT_DELAY_SECONDS
+        while True:
+            if self._connection is not None:
+                await asyncio.sleep(LISTENER_HEALTH_CHECK_SECONDS)
+                try:
+                    await self._connection.fetchval("SELECT 1")
+                    continue
+                except Exception as e:
+                    logger.warning("Cache invalidation listener lost its connection: %s", e)
+                    self._connection.terminate()
+                    self._connection = None
+            else:
+                await asyncio.sleep(delay)
+
+            if await self._connect():
+                # Changes made while disconnected were never heard about
+                self._on_reset()
+                delay = LISTENER_RECONNECT_DELAY_SECONDS
+            else:
+                delay = min(delay * 2, LISTENER_MAX_RECONNECT_DELAY_SECONDS)
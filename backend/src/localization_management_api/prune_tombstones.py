@@ -0,0 +1,34 @@
+"""Delete the tombstones delta syncs use to report deleted keys once they are old enough.
+
+Usage:
+    python -m src.localization_management_api.prune_tombstones [--days DAYS]
+
+Clients whose last sync is older than the pruned tombstones get the whole bundle on
+their next delta sync. Run it periodically, e.g. daily from cron.
+"""
+import argparse
+import asyncio
+
+from .database import db_service, close_db_service
+
+DEFAULT_RETENTION_DAYS = 30
+
+
+async def main(retention_days):
+    try:
+        pruned = await db_service.prune_tombstones(retention_days)
+    finally:
+        await close_db_service()
+    print(f"Pruned {pruned} tombstones older than {retention_days} days")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Delete deletion tombstones older than the retention period")
+    parser.add_argument(
+        "--days",
+        type=int,
+        default=DEFAULT_RETENTION_DAYS,
+        help=f"Keep tombstones this many days (default: {DEFAULT_RETENTION_DAYS})"
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.days))
@@ -0,0 +1,26 @@
+"""Rebuild the maintained project statistics from translation_keys.
+
+Usage:
+    python -m src.localization_management_api.rebuild_stats [PROJECT_ID]
+
+Without a project ID every project is rebuilt.
+"""
+import argparse
+import asyncio
+
+from .database import db_service, close_db_service
+
+
+async def main(project_id=None):
+    try:
+        await db_service.rebuild_project_stats(project_id)
+    finally:
+        await close_db_service()
+    print(f"Rebuilt stats for {'project ' + project_id if project_id else 'all projects'}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild per-language and per-category project statistics")
+    parser.add_argument("project_id", nargs="?", help="Only rebuild this project")
+    args = parser.parse_args()
+    asyncio.run(main(args.project_id))
@@ -0,0 +1,147 @@
+"""Published releases: immutable, content-hashed snapshots of a project's bundles.
+
+Publishing writes the LocalizationResponse body of every supported locale to
+{RELEASES_DIR}/{project_id}/bundles/{sha256}.json, precompressed next to it as .json.gz
+(and .json.br when brotli is installed), plus a manifest {project_id}/releases/{release_id}.json
+listing the bundle of each locale. {project_id}/current holds the ID of the release being
+served; rolling back rewrites it to an earlier release. Nothing else is ever modified,
+so the directory can be synced to an object store or CDN as is, and serving a release
+reads only these files, never the database.
+"""
+import hashlib
+import json
+import os
+import re
+import tempfile
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from . import compression
+from .models import Release, ReleaseBundle
+
+# File suffix of each Content-Encoding a bundle is stored in
+ENCODING_SUFFIXES = {"identity": "", "gzip": ".gz", "br": ".br"}
+
+BUNDLE_HASH_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+RELEASE_ID_PATTERN = re.compile(r"^[0-9a-f]{16}$")
+
+
+def bundle_hash(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()
+
+
+def release_id_for(bundles: Dict[str, ReleaseBundle]) -> str:
+    """Derive a release ID from its bundles, so publishing unchanged content returns the same release"""
+    digest = hashlib.sha256(json.dumps({locale: bundle.hash for locale, bundle in bundles.items()}, sort_keys=True).encode())
+    return digest.hexdigest()[:16]
+
+
+def is_project_id(project_id: str) -> bool:
+    try:
+        uuid.UUID(project_id)
+        return True
+    except ValueError:
+        return False
+
+
+def write_atomically(path: Path, data: bytes) -> None:
+    """Write a file under a temporary name and rename it into place, so readers never see it half written"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+class ReleaseStore:
+    """Release files under one directory. Methods do blocking file I/O; call them off the event loop"""
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+        # project -> ((mtime, inode) of its current pointer, release it names)
+        self._current: Dict[str, Tuple[Tuple[int, int], Optional[Release]]] = {}
+
+    def _project_dir(self, project_id: str) -> Path:
+        if not is_project_id(project_id):
+            raise ValueError("Invalid project ID")
+        return self.root / project_id
+
+    def publish(self, project_id: str, content_version: int, bodies: Dict[str, bytes], created_by: str) -> Release:
+        """Write bundles and a release manifest for them, then make it the current release"""
+        project_dir = self._project_dir(project_id)
+        bundles = {}
+        for locale, body in bodies.items():
+            digest = bundle_hash(body)
+            for encoding, encoded in compression.compress(body).items():
+                path = project_dir / "bundles" / f"{digest}.json{ENCODING_SUFFIXES[encoding]}"
+                if not path.exists():  # Same hash, same content: bundles are shared between releases
+                    write_atomically(path, encoded)
+            bundles[locale] = ReleaseBundle(hash=digest, size=len(body))
+
+        release_id = release_id_for(bundles)
+        release = self.get_release(project_id, release_id)
+        if release is None:
+            release = Release(
+                release_id=release_id,
+                project_id=project_id,
+                content_version=content_version,
+                created_at=datetime.utcnow(),
+                created_by=created_by,
+                bundles=bundles
+            )
+            write_atomically(project_dir / "releases" / f"{release_id}.json", release.model_dump_json(by_alias=True).encode())
+        self.set_current(project_id, release_id)
+        return release
+
+    def get_release(self, project_id: str, release_id: str) -> Optional[Release]:
+        if not RELEASE_ID_PATTERN.match(release_id):
+            return None
+        path = self._project_dir(project_id) / "releases" / f"{release_id}.json"
+        try:
+            return Release.model_validate_json(path.read_bytes())
+        except FileNotFoundError:
+            return None
+
+    def list_releases(self, project_id: str) -> List[Release]:
+        """Get a project's releases, newest first"""
+        releases_dir = self._project_dir(project_id) / "releases"
+        if not releases_dir.is_dir():
+            return []
+        releases = [Release.model_validate_json(path.read_bytes()) for path in releases_dir.glob("*.json")]
+        return sorted(releases, key=lambda release: release.created_at, reverse=True)
+
+    def set_current(self, project_id: str, release_id: str) -> Optional[Release]:
+        """Serve an existing release from now on (publish, or roll back), returning it"""
+        release = self.get_release(project_id, release_id)
+        if release is not None:
+            write_atomically(self._project_dir(project_id) / "current", release_id.encode())
+        return release
+
+    def current_release(self, project_id: str) -> Optional[Release]:
+        """Get the release being served, rereading the manifest only after the pointer was replaced"""
+        pointer = self._project_dir(project_id) / "current"
+        try:
+            stat = pointer.stat()
+        except FileNotFoundError:
+            return None
+        # Pointers are replaced by rename, so any worker's publish or rollback changes the inode
+        signature = (stat.st_mtime_ns, stat.st_ino)
+        cached = self._current.get(project_id)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        release = self.get_release(project_id, pointer.read_text().strip())
+        self._current[project_id] = (signature, release)
+        return release
+
+    def bundle_path(self, project_id: str, digest: str, encoding: str = "identity") -> Optional[Path]:
+        """Get the file of a bundle in an encoding, or None if it was not stored in that encoding"""
+        if not BUNDLE_HASH_PATTERN.match(digest) or encoding not in ENCODING_SUFFIXES:
+            return None
+        path = self._project_dir(project_id) / "bundles" / f"{digest}.json{ENCODING_SUFFIXES[encoding]}"
+        return path if path.is_file() else None
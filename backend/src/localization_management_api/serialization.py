@@ -0,0 +1,50 @@
+"""Fast JSON encoding of trusted database rows for read endpoints.
+
+Rows read back from translation_keys already have the shape of TranslationKey, so
+instead of building a model per row and per locale and letting FastAPI validate and
+serialize them again, they are renamed to the camelCase aliases from models.py and
+encoded straight to bytes.
+"""
+import json
+from typing import Any, Iterable
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library
+    orjson = None
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode an object as compact JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def translation_key_row_to_json(row: dict) -> dict:
+    """Map a translation_keys row to the JSON shape of TranslationKey (by alias)"""
+    return {
+        "id": row["id"],
+        "projectId": row["project_id"],
+        "key": row["key"],
+        "category": row["category"],
+        "description": row.get("description"),
+        "translations": {
+            lang_code: {
+                "value": translation["value"],
+                "updatedAt": translation["updated_at"],
+                "updatedBy": translation["updated_by"]
+            }
+            for lang_code, translation in (row.get("translations") or {}).items()
+        }
+    }
+
+
+def dump_translation_key_rows(rows: Iterable[dict]) -> bytes:
+    """Encode translation_keys rows as a JSON list of TranslationKey"""
+    return dumps([translation_key_row_to_json(row) for row in rows])
+
+
+def dump_translation_key_row(row: dict) -> bytes:
+    """Encode one translation_keys row as a JSON TranslationKey"""
+    return dumps(translation_key_row_to_json(row))
@@ -0,0 +1,382 @@
+"""Storage backends behind DatabaseService.
+
+DatabaseService keeps the application logic (validation, caching, chunking) and
+sends every query through a StorageBackend. Backends return plain rows shaped like
+PostgREST's JSON: UUIDs and timestamps as strings, JSONB columns as dicts and lists.
+
+DATABASE_BACKEND selects the implementation: "supabase" (the default) goes through
+PostgREST over HTTP, "postgres" speaks SQL to the database directly (see postgres.py).
+"""
+import asyncio
+import os
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+from supabase import create_client, Client
+
+# Projects are always read together with an embedded aggregate of their
+# translation keys so the key count comes back in the same round trip.
+PROJECT_SELECT = "*, translation_keys(count)"
+
+# Translation keys are read with their rows from the normalized translations table
+# embedded, so reads see values from either storage layout (see TRANSLATION_STORAGE)
+TRANSLATION_KEY_SELECT = "*, translation_rows:translations(locale, value, updated_at, updated_by)"
+
+DATABASE_BACKENDS = ("supabase", "postgres")
+
+
+class StorageBackend(ABC):
+    """The queries DatabaseService runs against the database"""
+
+    async def close(self) -> None:
+        """Release connections and threads held by the backend"""
+
+    # Projects
+    @abstractmethod
+    async def list_projects(self) -> List[dict]:
+        """Get all active project rows, each with its translation_key_count"""
+
+    @abstractmethod
+    async def get_project(self, project_id: str) -> Optional[dict]:
+        """Get a project row with its translation_key_count"""
+
+    @abstractmethod
+    async def get_project_row(self, project_id: str) -> Optional[dict]:
+        """Get a project row without counting its keys"""
+
+    @abstractmethod
+    async def insert_project(self, row: dict) -> Optional[dict]:
+        """Insert a project row and return it"""
+
+    @abstractmethod
+    async def update_project(self, project_id: str, values: dict) -> Optional[dict]:
+        """Update columns of a project row and return it, or None if there is no such project"""
+
+    @abstractmethod
+    async def add_project_language(self, project_id: str, language_code: str) -> Optional[dict]:
+        """Append a supported language, returning the row if anything changed"""
+
+    @abstractmethod
+    async def remove_project_language(self, project_id: str, language_code: str) -> Optional[dict]:
+        """Remove a supported language other than the default, returning the row if anything changed"""
+
+    @abstractmethod
+    async def get_project_stats(self, project_id: str) -> Optional[dict]:
+        """Get supported_languages plus the project_language_stats and project_categories rows of a project"""
+
+    @abstractmethod
+    async def get_project_categories(self, project_id: str) -> List[dict]:
+        """Get the project_categories rows of a project, ordered by category"""
+
+    # Translation keys
+    @abstractmethod
+    async def list_translation_keys(self, project_id: Optional[str] = None) -> List[dict]:
+        """Get translation_keys rows, optionally for one project"""
+
+    @abstractmethod
+    async def get_translation_key(self, key_id: str) -> Optional[dict]:
+        """Get a translation_keys row by ID"""
+
+    @abstractmethod
+    async def get_translation_keys_by_ids(self, key_ids: List[str]) -> List[dict]:
+        """Get translation_keys rows by ID"""
+
+    @abstractmethod
+    async def search_translation_keys(self, params: dict) -> List[dict]:
+        """Call the search_translation_keys SQL function"""
+
+    @abstractmethod
+    async def insert_translation_key(self, row: dict, translations: Optional[dict] = None) -> Optional[dict]:
+        """Insert a translation_keys row, plus `translations` as translations table rows if given"""
+
+    @abstractmethod
+    async def upsert_translation_keys(
+        self,
+        rows: List[dict],
+        upsert: bool,
+        translations_by_key: Optional[Dict[str, dict]] = None
+    ) -> List[dict]:
+        """Insert translation_keys rows in one statement, updating (upsert) or skipping existing keys.
+
+        Returns the rows written. translations_by_key holds values to write as translations
+        table rows for the written keys; an upsert removes the key's other rows.
+        """
+
+    @abstractmethod
+    async def merge_translations(self, key_id: str, translations: dict, layout: str) -> Optional[dict]:
+        """Merge {locale: translation} into a key in the given storage layout and return the key row"""
+
+    @abstractmethod
+    async def merge_translations_batch(self, updates: Dict[str, dict], layout: str) -> List[dict]:
+        """Merge {key_id: {locale: translation}} in the given storage layout, returning (id, project_id, key, version) rows"""
+
+    @abstractmethod
+    async def delete_translation_key(self, key_id: str) -> List[dict]:
+        """Delete a translation key, returning the deleted (id, project_id, key, version) rows"""
+
+    # Localizations
+    @abstractmethod
+    async def get_localization_bundles(self, project_id: str, locales: List[str]) -> dict:
+        """Call the get_localization_bundles SQL function"""
+
+    @abstractmethod
+    async def get_localization_namespace(
+        self,
+        project_id: str,
+        locale: str,
+        category: Optional[str] = None,
+        key_prefix: Optional[str] = None
+    ) -> dict:
+        """Call the get_localization_namespace SQL function"""
+
+    @abstractmethod
+    async def get_localization_page(
+        self,
+        project_id: str,
+        locales: List[str],
+        after_key: Optional[str],
+        limit: int
+    ) -> List[dict]:
+        """Call the get_localization_page SQL function"""
+
+    @abstractmethod
+    async def get_localization_changes(self, project_id: str, locale: str, since: int) -> Optional[dict]:
+        """Call the get_localization_changes SQL function"""
+
+    # Maintenance
+    @abstractmethod
+    async def rebuild_project_stats(self, project_id: Optional[str] = None) -> None:
+        """Call the rebuild_project_stats SQL function"""
+
+    @abstractmethod
+    async def migrate_translations(self, layout: str, project_id: Optional[str] = None) -> None:
+        """Call the migrate_translations_to_<layout> SQL function"""
+
+    @abstractmethod
+    async def prune_tombstones(self, retention_days: int) -> int:
+        """Call the prune_translation_key_tombstones SQL function"""
+
+
+class SupabaseBackend(StorageBackend):
+    """Storage through PostgREST with the supabase client"""
+
+    def __init__(self, supabase_url: str, supabase_key: str, max_concurrency: int = 10):
+        self.supabase: Client = create_client(supabase_url, supabase_key)
+
+        # The supabase client is synchronous, so every query runs on a bounded
+        # thread pool to keep the event loop free while waiting on PostgREST
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="db")
+
+    async def _execute(self, query):
+        """Run a blocking supabase query on the database thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, query.execute)
+
+    async def close(self) -> None:
+        self._executor.shutdown(wait=False)
+
+    @staticmethod
+    def _with_key_count(project_data: dict) -> dict:
+        """Flatten the key count embedded by PROJECT_SELECT into translation_key_count"""
+        key_counts = project_data.pop("translation_keys", None) or [{}]
+        project_data["translation_key_count"] = key_counts[0].get("count", 0)
+        return project_data
+
+    # Projects
+    async def list_projects(self) -> List[dict]:
+        response = await self._execute(self.supabase.table("projects").select(PROJECT_SELECT).eq("is_active", True))
+        return [self._with_key_count(project_data) for project_data in response.data]
+
+    async def get_project(self, project_id: str) -> Optional[dict]:
+        response = await self._execute(self.supabase.table("projects").select(PROJECT_SELECT).eq("id", project_id).single())
+        if response.data:
+            return self._with_key_count(response.data)
+        return None
+
+    async def get_project_row(self, project_id: str) -> Optional[dict]:
+        response = await self._execute(self.supabase.table("projects").select("*").eq("id", project_id).maybe_single())
+        if response and response.data:
+            return response.data
+        return None
+
+    async def insert_project(self, row: dict) -> Optional[dict]:
+        response = await self._execute(self.supabase.table("projects").insert(row))
+        return response.data[0] if response.data else None
+
+    async def update_project(self, project_id: str, values: dict) -> Optional[dict]:
+        response = await self._execute(self.supabase.table("projects").update(values).eq("id", project_id))
+        return response.data[0] if response.data else None
+
+    async def add_project_language(self, project_id: str, language_code: str) -> Optional[dict]:
+        response = await self._execute(self.supabase.rpc("add_project_language", {
+            "p_project_id": project_id,
+            "p_language": language_code
+        }))
+        return response.data[0] if response.data else None
+
+    async def remove_project_language(self, project_id: str, language_code: str) -> Optional[dict]:
+        response = await self._execute(self.supabase.rpc("remove_project_language", {
+            "p_project_id": project_id,
+            "p_language": language_code
+        }))
+        return response.data[0] if response.data else None
+
+    async def get_project_stats(self, project_id: str) -> Optional[dict]:
+        response = await self._execute(
+            self.supabase.table("projects")
+            .select("supported_languages, project_language_stats(language, translated_count), project_categories(category, key_count)")
+            .eq("id", project_id)
+            .maybe_single()
+        )
+        if response and response.data:
+            return response.data
+        return None
+
+    async def get_project_categories(self, project_id: str) -> List[dict]:
+        response = await self._execute(
+            self.supabase.table("project_categories")
+            .select("category, key_count")
+            .eq("project_id", project_id)
+            .order("category")
+        )
+        return response.data
+
+    # Translation keys
+    async def list_translation_keys(self, project_id: Optional[str] = None) -> List[dict]:
+        query = self.supabase.table("translation_keys").select(TRANSLATION_KEY_SELECT)
+        if project_id:
+            query = query.eq("project_id", project_id)
+        response = await self._execute(query)
+        return response.data
+
+    async def get_translation_key(self, key_id: str) -> Optional[dict]:
+        response = await self._execute(self.supabase.table("translation_keys").select(TRANSLATION_KEY_SELECT).eq("id", key_id).single())
+        return response.data or None
+
+    async def get_translation_keys_by_ids(self, key_ids: List[str]) -> List[dict]:
+        response = await self._execute(self.supabase.table("translation_keys").select(TRANSLATION_KEY_SELECT).in_("id", key_ids))
+        return response.data
+
+    async def search_translation_keys(self, params: dict) -> List[dict]:
+        response = await self._execute(self.supabase.rpc("search_translation_keys", params))
+        return response.data
+
+    async def insert_translation_key(self, row: dict, translations: Optional[dict] = None) -> Optional[dict]:
+        # PostgREST runs each request in its own transaction, so the key and its
+        # translations table rows are written by one SQL function
+        response = await self._execute(self.supabase.rpc("insert_translation_key", {
+            "p_row": row,
+            "p_translations": translations
+        }))
+        return response.data[0] if response.data else None
+
+    async def upsert_translation_keys(
+        self,
+        rows: List[dict],
+        upsert: bool,
+        translations_by_key: Optional[Dict[str, dict]] = None
+    ) -> List[dict]:
+        response = await self._execute(self.supabase.rpc("upsert_translation_keys", {
+            "p_rows": rows,
+            "p_upsert": upsert,
+            "p_translations": translations_by_key
+        }))
+        return response.data
+
+    async def merge_translations(self, key_id: str, translations: dict, layout: str) -> Optional[dict]:
+        merge_function = "merge_translation_rows" if layout == "table" else "merge_translations"
+        response = await self._execute(self.supabase.rpc(merge_function, {
+            "p_key_id": key_id,
+            "p_translations": translations
+        }))
+        return response.data[0] if response.data else None
+
+    async def merge_translations_batch(self, updates: Dict[str, dict], layout: str) -> List[dict]:
+        merge_function = "merge_translation_rows_batch" if layout == "table" else "merge_translations_batch"
+        response = await self._execute(self.supabase.rpc(merge_function, {"p_updates": updates}))
+        return response.data
+
+    async def delete_translation_key(self, key_id: str) -> List[dict]:
+        response = await self._execute(self.supabase.rpc("delete_translation_key", {"p_key_id": key_id}))
+        return response.data
+
+    # Localizations
+    async def get_localization_bundles(self, project_id: str, locales: List[str]) -> dict:
+        response = await self._execute(self.supabase.rpc("get_localization_bundles", {
+            "p_project_id": project_id,
+            "p_locales": locales
+        }))
+        return response.data or {}
+
+    async def get_localization_namespace(
+        self,
+        project_id: str,
+        locale: str,
+        category: Optional[str] = None,
+        key_prefix: Optional[str] = None
+    ) -> dict:
+        response = await self._execute(self.supabase.rpc("get_localization_namespace", {
+            "p_project_id": project_id,
+            "p_locale": locale,
+            "p_category": category,
+            "p_key_prefix": key_prefix
+        }))
+        return response.data or {}
+
+    async def get_localization_page(
+        self,
+        project_id: str,
+        locales: List[str],
+        after_key: Optional[str],
+        limit: int
+    ) -> List[dict]:
+        response = await self._execute(self.supabase.rpc("get_localization_page", {
+            "p_project_id": project_id,
+            "p_locales": locales,
+            "p_after_key": after_key,
+            "p_limit": limit
+        }))
+        return response.data
+
+    async def get_localization_changes(self, project_id: str, locale: str, since: int) -> Optional[dict]:
+        response = await self._execute(self.supabase.rpc("get_localization_changes", {
+            "p_project_id": project_id,
+            "p_locale": locale,
+            "p_since": since
+        }))
+        return response.data or None
+
+    # Maintenance
+    async def rebuild_project_stats(self, project_id: Optional[str] = None) -> None:
+        await self._execute(self.supabase.rpc("rebuild_project_stats", {"p_project_id": project_id}))
+
+    async def migrate_translations(self, layout: str, project_id: Optional[str] = None) -> None:
+        await self._execute(self.supabase.rpc(f"migrate_translations_to_{layout}", {"p_project_id": project_id}))
+
+    async def prune_tombstones(self, retention_days: int) -> int:
+        response = await self._execute(self.supabase.rpc("prune_translation_key_tombstones", {
+            "p_retention_days": retention_days
+        }))
+        return response.data
+
+
+def create_backend() -> StorageBackend:
+    """Create the storage backend selected by DATABASE_BACKEND"""
+    backend = os.getenv("DATABASE_BACKEND", "supabase")
+    max_concurrency = int(os.getenv("DB_MAX_CONCURRENCY", "10"))
+
+    if backend == "supabase":
+        supabase_url = os.getenv("SUPABASE_URL")
+        supabase_key = os.getenv("SUPABASE_ANON_KEY")
+        if not supabase_url or not supabase_key:
+            raise ValueError("SUPABASE_URL and SUPABASE_ANON_KEY environment variables are required")
+        return SupabaseBackend(supabase_url, supabase_key, max_concurrency)
+
+    if backend == "postgres":
+        database_url = os.getenv("DATABASE_URL")
+        if not database_url:
+            raise ValueError("DATABASE_URL environment variable is required when DATABASE_BACKEND=postgres")
+        from .postgres import PostgresBackend  # asyncpg is only needed for this backend
+        return PostgresBackend(database_url, max_concurrency)
+
+    raise ValueError(f"DATABASE_BACKEND must be one of: {', '.join(DATABASE_BACKENDS)}")
@@ -1,4 +1,8 @@
+import base64
+import json
+import time
 import pytest
+from fastapi.testclient import TestClient
 from httpx import AsyncClient
 from src.localization_management_api.main import app
 from src.localization_management_api.models import CreateProjectRequest, CreateTranslationKeyRequest
@@ -41,6 +45,18 @@ async def test_health_check(client):
     assert response.status_code == 200
     assert response.json() == {"status": "healthy", "service": "localization-management-api"}
 
+def test_readiness_check():
+    # TestClient runs the lifespan handler, which creates the database client and prewarms bundles
+    with TestClient(app) as lifespan_client:
+        for _ in range(50):
+            response = lifespan_client.get("/health/ready")
+            if response.status_code == 200:
+                break
+            assert response.json()["status"] == "starting"
+            time.sleep(0.1)
+        assert response.status_code == 200
+        assert response.json()["status"] == "ready"
+
 @pytest.mark.asyncio
 async def test_create_project(client):
     response = await client.post("/projects", json=TEST_PROJECT)
@@ -96,6 +112,67 @@ async def test_get_translation_keys(client, test_project_id):
     assert len(data) > 0
     assert any(key["key"] == TEST_TRANSLATION_KEY["key"] for key in data)
 
+@pytest.mark.asyncio
+async def test_get_translation_keys_paginated(client, test_project_id):
+    for i in range(5):
+        await client.post(
+            f"/projects/{test_project_id}/translation-keys",
+            json={**TEST_TRANSLATION_KEY, "key": f"test.page.{i}"}
+        )
+    
+    # Walk the pages with the cursor header
+    seen_keys = []
+    params = {"project_id": test_project_id, "limit": 2}
+    while True:
+        response = await client.get("/translation-keys", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page) <= 2
+        seen_keys.extend(key["key"] for key in page)
+        if "x-next-cursor" not in response.headers:
+            break
+        params["cursor"] = response.headers["x-next-cursor"]
+    
+    assert seen_keys == sorted(seen_keys)
+    assert [f"test.page.{i}" for i in range(5)] == [key for key in seen_keys if key.startswith("test.page.")]
+    
+    # Server-side search matches translation values too
+    response = await client.get("/translation-keys", params={"project_id": test_project_id, "search": "bienvenido"})
+    assert response.status_code == 200
+    assert len(response.json()) == 5
+    
+    response = await client.get("/translation-keys", params={"project_id": test_project_id, "categories": ["missing"]})
+    assert response.json() == []
+
+    # A cursor whose ID is not a UUID is rejected before it reaches the database
+    bad_cursor = base64.urlsafe_b64encode(json.dumps(["test.page.0", "not-a-uuid"]).encode()).decode()
+    response = await client.get("/translation-keys", params={"project_id": test_project_id, "cursor": bad_cursor})
+    assert response.status_code == 400
+
+@pytest.mark.asyncio
+async def test_update_translation_keys_batch(client, test_project_id):
+    response = await client.post(
+        f"/projects/{test_project_id}/translation-keys",
+        json=TEST_TRANSLATION_KEY
+    )
+    key_id = response.json()["id"]
+    missing_id = "00000000-0000-0000-0000-000000000000"
+    
+    response = await client.put("/translation-keys/batch", json={
+        key_id: {"fr": "Bienvenue !"},
+        missing_id: {"fr": "Rien"}
+    })
+    assert response.status_code == 200
+    data = response.json()
+    assert data["updated"] == [key_id]
+    assert data["notFound"] == [missing_id]
+    
+    # Other locales are left untouched
+    response = await client.get(f"/translation-keys/{key_id}")
+    translations = response.json()["translations"]
+    assert translations["fr"]["value"] == "Bienvenue !"
+    assert translations["en"]["value"] == TEST_TRANSLATION_KEY["translations"]["en"]
+
 @pytest.mark.asyncio
 async def test_get_localizations(client, test_project_id):
     # First create a translation key
@@ -112,6 +189,80 @@ async def test_get_localizations(client, test_project_id):
     assert TEST_TRANSLATION_KEY["key"] in data["translations"]
     assert data["translations"][TEST_TRANSLATION_KEY["key"]] == TEST_TRANSLATION_KEY["translations"]["en"]
 
+@pytest.mark.asyncio
+async def test_get_localizations_not_modified(client, test_project_id):
+    await client.post(
+        f"/projects/{test_project_id}/translation-keys",
+        json=TEST_TRANSLATION_KEY
+    )
+    
+    response = await client.get(f"/localizations/{test_project_id}/en")
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    assert "cache-control" in response.headers
+    
+    # Unchanged content revalidates without a body
+    response = await client.get(f"/localizations/{test_project_id}/en", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    
+    # Any key change produces a new version
+    await client.post(
+        f"/projects/{test_project_id}/translation-keys",
+        json={**TEST_TRANSLATION_KEY, "key": "test.goodbye"}
+    )
+    response = await client.get(f"/localizations/{test_project_id}/en", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+@pytest.mark.asyncio
+async def test_get_localizations_compressed(client, test_project_id):
+    await client.post(
+        f"/projects/{test_project_id}/translation-keys",
+        json=TEST_TRANSLATION_KEY
+    )
+    
+    plain = await client.get(f"/localizations/{test_project_id}/en", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    
+    response = await client.get(f"/localizations/{test_project_id}/en", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.headers["etag"] != plain.headers["etag"]
+    assert response.json() == plain.json()  # httpx decodes the body
+
+@pytest.mark.asyncio
+async def test_get_localization_changes(client, test_project_id):
+    response = await client.post(
+        f"/projects/{test_project_id}/translation-keys",
+        json=TEST_TRANSLATION_KEY
+    )
+    deleted_key_id = response.json()["id"]
+    
+    response = await client.get(f"/localizations/{test_project_id}/en")
+    since = int(response.headers["x-content-version"])
+    
+    # Nothing changed yet
+    response = await client.get(f"/localizations/{test_project_id}/en/changes", params={"since": since})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["version"] == since
+    assert data["upserted"] == {} and data["deleted"] == []
+    
+    await client.post(
+        f"/projects/{test_project_id}/translation-keys",
+        json={**TEST_TRANSLATION_KEY, "key": "test.goodbye", "translations": {"en": "Goodbye"}}
+    )
+    await client.delete(f"/translation-keys/{deleted_key_id}")
+    
+    response = await client.get(f"/localizations/{test_project_id}/en/changes", params={"since": since})
+    data = response.json()
+    assert data["version"] > since
+    assert data["full"] is False
+    assert data["upserted"] == {"test.goodbye": "Goodbye"}
+    assert data["deleted"] == [TEST_TRANSLATION_KEY["key"]]
+
 @pytest.mark.asyncio
 async def test_get_project_stats(client, test_project_id):
     # First create a translation key
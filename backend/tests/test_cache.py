@@ -0,0 +1,145 @@
+import asyncio
+import time
+import pytest
+from src.localization_management_api.cache import BundleCache, SingleFlight
+
+
+def test_get_returns_cached_value():
+    cache = BundleCache()
+    cache.set(("project-1", "en"), b"bundle")
+    assert cache.get(("project-1", "en")) == b"bundle"
+    assert cache.get(("project-1", "fr")) is None
+
+def test_least_recently_used_entry_is_evicted():
+    cache = BundleCache(max_entries=2)
+    cache.set(("project-1", "en"), b"en")
+    cache.set(("project-1", "fr"), b"fr")
+    cache.get(("project-1", "en"))  # Touch so "fr" becomes least recently used
+    cache.set(("project-1", "de"), b"de")
+
+    assert cache.get(("project-1", "fr")) is None
+    assert cache.get(("project-1", "en")) == b"en"
+    assert cache.get(("project-1", "de")) == b"de"
+
+def test_entries_expire_after_ttl():
+    cache = BundleCache(ttl_seconds=0.01)
+    cache.set(("project-1", "en"), b"bundle")
+    time.sleep(0.02)
+    assert cache.get(("project-1", "en")) is None
+    assert len(cache) == 0
+
+def test_invalidate_project_only_drops_that_project():
+    cache = BundleCache()
+    cache.set(("project-1", "en"), b"one")
+    cache.set(("project-2", "en"), b"two")
+    cache.invalidate_project("project-1")
+
+    assert cache.get(("project-1", "en")) is None
+    assert cache.get(("project-2", "en")) == b"two"
+
+def test_set_skips_values_loaded_before_invalidation():
+    cache = BundleCache()
+    generation = cache.generation("project-1")
+    cache.invalidate_project("project-1")  # A write lands while the bundle is loading
+    cache.set(("project-1", "en"), b"stale", generation)
+
+    assert cache.get(("project-1", "en")) is None
+
+def test_set_skips_values_loaded_before_clear():
+    cache = BundleCache()
+    generation = cache.generation("project-1")
+    cache.clear()  # e.g. invalidation events may have been missed while loading
+    cache.set(("project-1", "en"), b"stale", generation)
+    cache.set(("project-1", "fr"), b"fresh", cache.generation("project-1"))
+
+    assert cache.get(("project-1", "en")) is None
+    assert cache.get(("project-1", "fr")) == b"fresh"
+
+@pytest.mark.asyncio
+async def test_single_flight_coalesces_concurrent_loads():
+    single_flight = SingleFlight()
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return b"bundle"
+
+    results = await asyncio.gather(*(single_flight.run("bundle", ("project-1", "en"), load) for _ in range(10)))
+
+    assert results == [b"bundle"] * 10
+    assert len(calls) == 1
+    assert single_flight.stats() == {"bundle": {"loads": 1, "coalesced": 9}}
+    assert len(single_flight) == 0
+
+@pytest.mark.asyncio
+async def test_single_flight_only_coalesces_identical_keys():
+    single_flight = SingleFlight()
+
+    async def load(value):
+        await asyncio.sleep(0.01)
+        return value
+
+    results = await asyncio.gather(
+        single_flight.run("bundle", ("project-1", "en"), lambda: load("en")),
+        single_flight.run("bundle", ("project-1", "fr"), lambda: load("fr")),
+        single_flight.run("stats", ("project-1", "en"), lambda: load("stats"))
+    )
+
+    assert results == ["en", "fr", "stats"]
+    assert single_flight.stats() == {"bundle": {"loads": 2, "coalesced": 0}, "stats": {"loads": 1, "coalesced": 0}}
+
+@pytest.mark.asyncio
+async def test_single_flight_shares_exceptions_and_retries_afterwards():
+    single_flight = SingleFlight()
+
+    async def failing_load():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("database unavailable")
+
+    results = await asyncio.gather(
+        *(single_flight.run("bundle", ("project-1", "en"), failing_load) for _ in range(3)),
+        return_exceptions=True
+    )
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+    async def load():
+        return b"bundle"
+
+    assert await single_flight.run("bundle", ("project-1", "en"), load) == b"bundle"
+    assert single_flight.stats()["bundle"] == {"loads": 2, "coalesced": 2}
+
+@pytest.mark.asyncio
+async def test_single_flight_forget_project_starts_fresh_loads():
+    single_flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def stale_load():
+        await release.wait()
+        return "before write"
+
+    async def fresh_load():
+        return "after write"
+
+    stale = asyncio.ensure_future(single_flight.run("stats", ("project-1",), stale_load))
+    await asyncio.sleep(0)
+    single_flight.forget_project("project-1")
+
+    assert await single_flight.run("stats", ("project-1",), fresh_load) == "after write"
+    release.set()
+    assert await stale == "before write"
+
+@pytest.mark.asyncio
+async def test_single_flight_load_survives_cancelled_caller():
+    single_flight = SingleFlight()
+
+    async def load():
+        await asyncio.sleep(0.01)
+        return b"bundle"
+
+    first = asyncio.ensure_future(single_flight.run("bundle", ("project-1", "en"), load))
+    second = asyncio.ensure_future(single_flight.run("bundle", ("project-1", "en"), load))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await second == b"bundle"
@@ -0,0 +1,45 @@
+import asyncio
+import gzip
+import pytest
+from src.localization_management_api import compression
+
+BODY = b'{"projectId":"project-1","locale":"en","localizations":{' + b",".join(
+    f'"screen.label.{i}":"Label {i}"'.encode() for i in range(1000)
+) + b"}}"
+
+def test_compress_offers_every_encoding():
+    encoded = compression.compress(BODY)
+    assert encoded["identity"] == BODY
+    assert gzip.decompress(encoded["gzip"]) == BODY
+    assert len(encoded["gzip"]) < len(BODY) / 5
+    assert set(encoded) == {"identity", *compression.ENCODINGS}
+
+def test_compress_is_deterministic():
+    assert compression.compress(BODY)["gzip"] == compression.compress(BODY)["gzip"]
+
+@pytest.mark.parametrize("accept_encoding, expected", [
+    (None, "identity"),
+    ("", "identity"),
+    ("gzip", "gzip"),
+    ("gzip, deflate", "gzip"),
+    ("gzip;q=0", "identity"),
+    ("*", compression.ENCODINGS[0]),
+    ("deflate, identity", "identity"),
+])
+def test_negotiate_encoding(accept_encoding, expected):
+    assert compression.negotiate_encoding(accept_encoding) == expected
+
+def test_negotiate_encoding_prefers_brotli():
+    pytest.importorskip("brotli")
+    assert compression.negotiate_encoding("gzip, br") == "br"
+    assert compression.negotiate_encoding("gzip, br;q=0.5") == "gzip"
+
+def test_compress_stream_gzip():
+    async def chunks():
+        for start in range(0, len(BODY), 1000):
+            yield BODY[start:start + 1000]
+
+    async def run():
+        return b"".join([chunk async for chunk in compression.compress_stream(chunks(), "gzip")])
+
+    assert gzip.decompress(asyncio.run(run())) == BODY
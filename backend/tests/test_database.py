@@ -2,7 +2,8 @@ import pytest
 import asyncio
 import time
 from src.localization_management_api.database import db_service
-from src.localization_management_api.models import CreateProjectRequest, CreateTranslationKeyRequest
+from src.localization_management_api.models import CreateProjectRequest, CreateTranslationKeyRequest, UpdateTranslationRequest
+from src.localization_management_api.storage import SupabaseBackend
 
 # Test data
 SAMPLE_PROJECTS = [
@@ -42,18 +43,11 @@ async def setup_test_data():
         )
         project_ids.append(project.id)
     
-    # Create translation keys for each project
+    # Bulk import translation keys for each project
+    keys = [CreateTranslationKeyRequest(**key_data) for key_data in SAMPLE_TRANSLATION_KEYS]
     for project_id in project_ids:
-        for key_data in SAMPLE_TRANSLATION_KEYS:
-            try:
-                await db_service.create_translation_key(
-                    project_id,
-                    CreateTranslationKeyRequest(**key_data),
-                    "test-user"
-                )
-            except Exception as e:
-                if "duplicate key value" not in str(e):
-                    raise e
+        async for progress in db_service.import_translation_keys(project_id, keys, "test-user"):
+            pass
     
     return project_ids
 
@@ -169,4 +163,287 @@ async def test_concurrent_operations_performance(setup_test_data):
     print(f"\nConcurrent Operations Performance:")
     print(f"Time for 3 concurrent operations: {total_time:.2f}s")
     
-    assert total_time < 2.0  # Should take less than 2 seconds for concurrent operations 
\ No newline at end of file
+    assert total_time < 2.0  # Should take less than 2 seconds for concurrent operations
+
+
+@pytest.mark.asyncio
+async def test_project_listing_round_trips(monkeypatch):
+    """Test that listing projects costs the same number of queries as projects grow"""
+    if not isinstance(db_service.backend, SupabaseBackend):
+        pytest.skip("Counts PostgREST requests made by the supabase backend")
+    queried_tables = []
+    original_table = db_service.backend.supabase.table
+
+    def counting_table(table_name):
+        queried_tables.append(table_name)
+        return original_table(table_name)
+
+    monkeypatch.setattr(db_service.backend.supabase, "table", counting_table)
+
+    round_trips = []
+    for project_data in SAMPLE_PROJECTS:
+        await db_service.create_project(
+            CreateProjectRequest(**project_data),
+            "test-user"
+        )
+        queried_tables.clear()
+
+        start_time = time.time()
+        projects = await db_service.get_projects()
+        total_time = time.time() - start_time
+
+        round_trips.append(len(queried_tables))
+        print(f"\n{len(projects)} projects: {len(queried_tables)} queries in {total_time:.2f}s")
+
+    assert round_trips == [1] * len(SAMPLE_PROJECTS)  # One query no matter how many projects
+
+@pytest.mark.asyncio
+async def test_concurrent_throughput_scaling(setup_test_data, monkeypatch):
+    """Test that concurrent clients' queries overlap instead of serializing on the event loop"""
+    project_ids = await setup_test_data
+    project_id = project_ids[0]
+    requests_per_level = 20
+
+    # A query that blocked the event loop would finish before the next one started,
+    # so the number in flight at once shows whether they overlap, whatever their latency
+    in_flight = 0
+    peak_in_flight = 0
+    original_get_project = db_service.backend.get_project
+
+    async def counting_get_project(*args, **kwargs):
+        nonlocal in_flight, peak_in_flight
+        in_flight += 1
+        peak_in_flight = max(peak_in_flight, in_flight)
+        try:
+            return await original_get_project(*args, **kwargs)
+        finally:
+            in_flight -= 1
+
+    monkeypatch.setattr(db_service.backend, "get_project", counting_get_project)
+
+    peaks = {}
+    for concurrency in (1, 5, 10):
+        semaphore = asyncio.Semaphore(concurrency)
+        peak_in_flight = 0
+
+        async def client_request():
+            async with semaphore:
+                await db_service.get_project(project_id)
+
+        start_time = time.time()
+        await asyncio.gather(*(client_request() for _ in range(requests_per_level)))
+        total_time = time.time() - start_time
+        peaks[concurrency] = peak_in_flight
+
+        print(f"\n{concurrency} concurrent clients: {requests_per_level / total_time:.1f} requests/s, "
+              f"{peak_in_flight} queries in flight at most")
+
+    assert peaks == {1: 1, 5: 5, 10: 10}  # Every client's query is in flight at once
+
+@pytest.mark.asyncio
+async def test_bulk_import_performance():
+    """Test the performance of bulk importing translation keys"""
+    project = await db_service.create_project(
+        CreateProjectRequest(**SAMPLE_PROJECTS[0]),
+        "test-user"
+    )
+    keys = [
+        CreateTranslationKeyRequest(**{**SAMPLE_TRANSLATION_KEYS[0], "key": f"bulk.key.{i}"})
+        for i in range(2000)
+    ]
+    
+    start_time = time.time()
+    async for progress in db_service.import_translation_keys(project.id, keys, "test-user"):
+        pass
+    total_time = time.time() - start_time
+    
+    print(f"\nBulk Import Performance:")
+    print(f"Time to import {len(keys)} keys: {total_time:.2f}s")
+    
+    assert progress.done
+    assert progress.imported == len(keys)
+    assert total_time < 10.0  # Should take less than 5ms per key
+    
+    # Importing again reports every row as a failure instead of aborting
+    async for progress in db_service.import_translation_keys(project.id, keys[:10], "test-user"):
+        pass
+    assert progress.imported == 0
+    assert progress.failed_count == 10
+
+@pytest.mark.asyncio
+async def test_concurrent_locale_updates_are_not_lost(setup_test_data):
+    """Test that concurrent edits to different locales of one key both survive"""
+    project_ids = await setup_test_data
+    keys = await db_service.get_translation_keys(project_ids[0])
+    key_id = keys[0].id
+    
+    start_time = time.time()
+    await asyncio.gather(*(
+        db_service.update_translation_key(
+            key_id,
+            UpdateTranslationRequest(translations={locale: f"Concurrent {locale}"}),
+            "test-user"
+        )
+        for locale in ("en", "es", "fr", "de", "it")
+    ))
+    total_time = time.time() - start_time
+    
+    print(f"\nConcurrent Update Performance:")
+    print(f"Time for 5 concurrent locale updates: {total_time:.2f}s")
+    
+    key = await db_service.get_translation_key(key_id)
+    for locale in ("en", "es", "fr", "de", "it"):
+        assert key.translations[locale].value == f"Concurrent {locale}"
+
+@pytest.mark.asyncio
+async def test_maintained_stats_match_full_scan(setup_test_data):
+    """Test that trigger-maintained stats agree with a full key scan, before and after a rebuild"""
+    project_ids = await setup_test_data
+    project_id = project_ids[0]
+    keys = await db_service.get_translation_keys(project_id)
+    
+    # Blank out one translation so the counts differ per language
+    await db_service.update_translation_key(
+        keys[0].id,
+        UpdateTranslationRequest(translations={"de": "  "}),
+        "test-user"
+    )
+    keys = await db_service.get_translation_keys(project_id)
+    
+    start_time = time.time()
+    stats = await db_service.get_project_stats(project_id)
+    total_time = time.time() - start_time
+    
+    print(f"\nProject Stats Performance:")
+    print(f"Time to read stats for {len(keys)} keys: {total_time:.2f}s")
+    
+    expected_counts = {
+        lang: sum(1 for key in keys if lang in key.translations and key.translations[lang].value.strip())
+        for lang in stats.supported_languages
+    }
+    assert stats.total_keys == len(keys)
+    assert {lang: stats.translated_counts.get(lang, 0) for lang in stats.supported_languages} == expected_counts
+    assert set(stats.category_counts) == {key.category for key in keys}
+    
+    await db_service.rebuild_project_stats(project_id)
+    assert await db_service.get_project_stats(project_id) == stats
+    
+    assert total_time < 0.5  # Should not depend on the number of keys
+
+@pytest.mark.asyncio
+async def test_category_listing_performance():
+    """Test that listing categories stays fast on a 100k-key project"""
+    project = await db_service.create_project(
+        CreateProjectRequest(**SAMPLE_PROJECTS[0]),
+        "test-user"
+    )
+    keys = [
+        CreateTranslationKeyRequest(**{
+            **SAMPLE_TRANSLATION_KEYS[i % len(SAMPLE_TRANSLATION_KEYS)],
+            "key": f"large.key.{i}",
+            "category": f"category.{i % 50}"
+        })
+        for i in range(100_000)
+    ]
+    async for progress in db_service.import_translation_keys(project.id, keys, "test-user"):
+        pass
+    
+    start_time = time.time()
+    categories = await db_service.get_project_categories(project.id)
+    total_time = time.time() - start_time
+    
+    print(f"\nCategory Listing Performance:")
+    print(f"Time to list {len(categories)} categories over {progress.imported} keys: {total_time:.2f}s")
+    
+    assert len(categories) == 50
+    assert sum(categories.values()) == progress.imported
+    assert total_time < 0.5  # Should not load any translation keys
+
+@pytest.mark.asyncio
+async def test_projected_localizations_match_full_keys(setup_test_data):
+    """Test that the projected localization read returns the same values as the full key read"""
+    project_ids = await setup_test_data
+    project_id = project_ids[0]
+    keys = await db_service.get_translation_keys(project_id)
+    
+    start_time = time.time()
+    batch = await db_service.get_localizations_batch(project_id, ["en", "fr", "xx"])
+    total_time = time.time() - start_time
+    
+    print(f"\nProjected Localization Performance:")
+    print(f"Time to read 3 locales for {len(keys)} keys: {total_time:.2f}s")
+    
+    for locale in ("en", "fr"):
+        assert batch[locale] == {
+            key.key: key.translations[locale].value for key in keys if locale in key.translations
+        }
+    assert batch["xx"] == {}
+    assert await db_service.get_localizations(project_id, "fr") == batch["fr"]
+
+@pytest.mark.asyncio
+async def test_table_storage_matches_jsonb_storage(setup_test_data, monkeypatch):
+    """Test that keys migrated to the normalized translations table read and update like JSONB keys"""
+    project_ids = await setup_test_data
+    project_id = project_ids[0]
+    keys_before = await db_service.get_translation_keys(project_id)
+    batch_before = await db_service.get_localizations_batch(project_id, ["en", "fr"])
+    
+    monkeypatch.setattr(db_service, "translation_storage", "table")
+    await db_service.migrate_translations("table", project_id)
+    
+    keys_after = await db_service.get_translation_keys(project_id)
+    assert {key.key: {locale: t.value for locale, t in key.translations.items()} for key in keys_after} == \
+        {key.key: {locale: t.value for locale, t in key.translations.items()} for key in keys_before}
+    assert await db_service.get_localizations_batch(project_id, ["en", "fr"]) == batch_before
+    
+    start_time = time.time()
+    updated = await db_service.update_translation_key(
+        keys_after[0].id,
+        UpdateTranslationRequest(translations={"fr": "Table storage"}),
+        "test-user"
+    )
+    total_time = time.time() - start_time
+    
+    print(f"\nTable Storage Update Performance:")
+    print(f"Time to update one locale: {total_time:.2f}s")
+    
+    assert updated.translations["fr"].value == "Table storage"
+    assert updated.translations["en"].value == keys_after[0].translations["en"].value
+    assert (await db_service.get_localizations(project_id, "fr"))[keys_after[0].key] == "Table storage"
+    
+    stats = await db_service.get_project_stats(project_id)
+    await db_service.rebuild_project_stats(project_id)
+    assert await db_service.get_project_stats(project_id) == stats
+
+@pytest.mark.asyncio
+async def test_project_metadata_cache(setup_test_data, monkeypatch):
+    """Test that repeated project checks skip the database until a write invalidates them"""
+    project_ids = await setup_test_data
+    project_id = project_ids[0]
+    project_queries = []
+    original_get_project_row = db_service.backend.get_project_row
+
+    async def counting_get_project_row(queried_project_id):
+        project_queries.append(queried_project_id)
+        return await original_get_project_row(queried_project_id)
+
+    monkeypatch.setattr(db_service.backend, "get_project_row", counting_get_project_row)
+
+    start_time = time.time()
+    for _ in range(20):
+        assert await db_service.project_exists(project_id)
+    total_time = time.time() - start_time
+
+    print(f"\nProject Metadata Cache Performance:")
+    print(f"20 existence checks: {len(project_queries)} queries in {total_time:.2f}s")
+
+    assert len(project_queries) <= 1
+
+    assert await db_service.add_project_language(project_id, "pt")
+    project = await db_service.get_project_metadata(project_id)
+    assert "pt" in project.supported_languages
+
+    assert await db_service.remove_project_language(project_id, "pt")
+    project = await db_service.get_project_metadata(project_id)
+    assert "pt" not in project.supported_languages
+    assert not await db_service.remove_project_language(project_id, "pt")
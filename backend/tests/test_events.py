@@ -0,0 +1,87 @@
+from src.localization_management_api.events import CATCH_UP, OVERFLOW, EventBroker, encode_sse
+from src.localization_management_api.models import ProjectEvent
+
+
+def key_updated(version: int, translations: dict, project_id: str = "project-1") -> ProjectEvent:
+    return ProjectEvent(type="key_updated", project_id=project_id, version=version, key="greeting", translations=translations)
+
+
+def drain(subscription) -> list:
+    items = []
+    while not subscription.queue.empty():
+        items.append(subscription.queue.get_nowait())
+    return items
+
+
+def test_publish_only_reaches_subscribers_of_the_project():
+    broker = EventBroker()
+    subscription = broker.subscribe("project-1")
+    other = broker.subscribe("project-2")
+    broker.publish(key_updated(5, {"en": "Hi"}))
+
+    assert [event.version for event in drain(subscription)] == [5]
+    assert drain(other) == []
+    assert broker.latest_version("project-1") == 5
+
+def test_translations_are_filtered_to_subscribed_locales():
+    broker = EventBroker()
+    subscription = broker.subscribe("project-1", ["es"])
+    broker.publish(key_updated(5, {"en": "Hi", "es": "Hola"}))
+    broker.publish(key_updated(6, {"en": "Hello"}))  # Nothing for this subscriber
+
+    events = drain(subscription)
+    assert [event.translations for event in events] == [{"es": "Hola"}]
+
+def test_full_queue_drops_events_for_a_resync():
+    broker = EventBroker(max_queue_size=2)
+    subscription = broker.subscribe("project-1")
+    for version in range(1, 5):
+        broker.publish(key_updated(version, {"en": str(version)}))
+
+    assert drain(subscription) == [OVERFLOW]
+    broker.publish(key_updated(5, {"en": "5"}))
+    assert drain(subscription) == []  # Nothing more until the client reconnects
+
+def test_catch_up_is_queued_once_until_handled():
+    broker = EventBroker()
+    subscription = broker.subscribe("project-1")
+    broker.request_catch_up("project-1")
+    broker.request_catch_up("project-1")
+
+    assert drain(subscription) == [CATCH_UP]
+    subscription.catch_up_pending = False
+    broker.request_catch_up("project-1")
+    assert drain(subscription) == [CATCH_UP]
+
+def test_update_languages_reports_changes_since_last_seen():
+    broker = EventBroker()
+    subscription = broker.subscribe("project-1")
+    assert broker.update_languages("project-1", ["en", "es"]) == ([], [])
+    assert broker.update_languages("project-1", ["en", "fr"]) == (["fr"], ["es"])
+
+    broker.unsubscribe(subscription)
+    assert not broker.has_subscribers("project-1")
+    assert broker.stats() == {"projects": 0, "subscriptions": 0}
+
+def test_resume_version_only_moves_past_contiguous_changes():
+    broker = EventBroker()
+    subscription = broker.subscribe("project-1")
+    subscription.mark_caught_up(4)
+
+    assert subscription.mark_sent(6) is None  # Version 5 has not been sent yet
+    assert subscription.mark_sent(5) == 6
+    assert subscription.mark_sent(7) == 7
+    assert subscription.mark_sent(7) == 7  # Another change of the same statement
+
+    assert subscription.mark_sent(9) is None
+    subscription.mark_caught_up(8)  # A catch-up read version 8 back
+    assert subscription.synced_version == 9
+    assert subscription.caught_up_version == 8
+
+def test_encode_sse_sets_the_given_event_id():
+    message = encode_sse(key_updated(7, {"en": "Hi"}), 7).decode()
+
+    assert message.startswith("event: key_updated\nid: 7\ndata: {")
+    assert '"projectId":"project-1"' in message
+    assert message.endswith("}\n\n")
+    assert "id:" not in encode_sse(key_updated(9, {"en": "Hi"})).decode()
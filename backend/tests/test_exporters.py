@@ -0,0 +1,63 @@
+import asyncio
+import gettext
+import io
+import json
+import zipfile
+from xml.dom import minidom
+from src.localization_management_api import exporters
+
+ROWS = [
+    (f"screen.label.{i:03d}", {"en": f'Say "hi" & <wave> {i}', "fr": f"Dites « salut »\nl'ami {i}"})
+    for i in range(25)
+]
+
+def pages(locales, page_size=10):
+    async def iterate():
+        for start in range(0, len(ROWS), page_size):
+            yield [
+                (key, {locale: values[locale] for locale in locales if locale in values})
+                for key, values in ROWS[start:start + page_size]
+            ]
+    return iterate()
+
+def collect(chunks):
+    async def run():
+        return b"".join([chunk async for chunk in chunks])
+    return asyncio.run(run())
+
+def test_export_json_matches_batch_shape():
+    data = json.loads(collect(exporters.export_json(pages, "project-1", ["en", "fr"])))
+    assert data["projectId"] == "project-1"
+    assert data["localizations"]["fr"] == {key: values["fr"] for key, values in ROWS}
+
+def test_export_ndjson_has_one_line_per_key():
+    lines = collect(exporters.export_ndjson(pages, ["en"])).decode().splitlines()
+    assert len(lines) == len(ROWS)
+    assert json.loads(lines[0]) == {"key": ROWS[0][0], "translations": {"en": ROWS[0][1]["en"]}}
+
+def test_export_mo_is_readable_by_gettext():
+    translations = gettext.GNUTranslations(io.BytesIO(collect(exporters.export_mo(pages, "fr"))))
+    for key, values in ROWS:
+        assert translations.gettext(key) == values["fr"]
+    assert translations.info()["language"] == "fr"
+
+def test_export_android_is_valid_xml():
+    document = minidom.parseString(collect(exporters.export_android(pages, "en")))
+    strings = document.getElementsByTagName("string")
+    assert len(strings) == len(ROWS)
+    assert strings[0].getAttribute("name") == "screen_label_000"
+
+def test_export_zip_holds_one_file_per_locale():
+    archive = zipfile.ZipFile(io.BytesIO(collect(exporters.export_zip(pages, ["en", "fr"], "json"))))
+    assert archive.namelist() == ["en.json", "fr.json"]
+    assert json.loads(archive.read("en.json")) == {key: values["en"] for key, values in ROWS}
+
+def test_export_android_names_are_unique_and_start_with_a_letter_or_underscore():
+    rows = [("1st.title", {"en": "First"}), ("a.b", {"en": "Dotted"}), ("a_b", {"en": "Underscored"})]
+
+    async def colliding_pages(locales):
+        yield rows
+
+    document = minidom.parseString(collect(exporters.export_android(colliding_pages, "en")))
+    names = [string.getAttribute("name") for string in document.getElementsByTagName("string")]
+    assert names == ["_1st_title", "a_b", "a_b_2"]
@@ -0,0 +1,47 @@
+from datetime import datetime
+
+import pytest
+
+from src.localization_management_api.database import fallback_chain
+from src.localization_management_api.models import Project
+
+
+def make_project(default_language: str, supported_languages: list) -> Project:
+    now = datetime.utcnow()
+    return Project(
+        id="project-1",
+        name="Fallback Project",
+        default_language=default_language,
+        supported_languages=supported_languages,
+        created_at=now,
+        updated_at=now,
+        created_by="test-user"
+    )
+
+
+def test_chain_goes_through_supported_parents_to_default_language():
+    project = make_project("en", ["en", "pt", "pt-BR", "zh", "zh-Hant"])
+
+    assert fallback_chain("pt-BR", project) == ["pt-BR", "pt", "en"]
+    assert fallback_chain("zh-Hant-TW", project) == ["zh-Hant-TW", "zh-Hant", "zh", "en"]
+
+def test_unsupported_parents_are_skipped_and_matched_case_insensitively():
+    project = make_project("en", ["en", "es"])
+    assert fallback_chain("es-MX", project) == ["es-MX", "es", "en"]
+    assert fallback_chain("ES-mx", project) == ["ES-mx", "es", "en"]
+    assert fallback_chain("fr-CA", project) == ["fr-CA", "en"]
+
+def test_default_language_is_not_repeated():
+    project = make_project("en", ["en", "en-GB"])
+    assert fallback_chain("en-GB", project) == ["en-GB", "en"]
+    assert fallback_chain("en", project) == ["en"]
+
+def test_explicit_fallbacks_are_used_as_given():
+    project = make_project("en", ["en", "pt", "pt-BR", "es"])
+    assert fallback_chain("pt-BR", project, ["es", "pt-BR", "en"]) == ["pt-BR", "es", "en"]
+
+def test_explicit_fallbacks_must_be_supported():
+    project = make_project("en", ["en", "pt", "pt-BR"])
+    assert fallback_chain("pt-BR", project, ["PT", "en"]) == ["pt-BR", "pt", "en"]
+    with pytest.raises(ValueError, match="de"):
+        fallback_chain("pt-BR", project, ["de", "en"])
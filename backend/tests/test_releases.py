@@ -0,0 +1,61 @@
+import gzip
+import uuid
+
+import pytest
+from src.localization_management_api.releases import ReleaseStore, bundle_hash
+
+PROJECT_ID = str(uuid.uuid4())
+
+
+def publish(store: ReleaseStore, values: dict, content_version: int = 1):
+    bodies = {locale: f'{{"greeting":"{value}"}}'.encode() for locale, value in values.items()}
+    return store.publish(PROJECT_ID, content_version, bodies, "test-user")
+
+
+def test_publish_writes_content_hashed_precompressed_bundles(tmp_path):
+    store = ReleaseStore(str(tmp_path))
+    release = publish(store, {"en": "Hello", "es": "Hola"})
+
+    en = release.bundles["en"]
+    assert en.hash == bundle_hash(b'{"greeting":"Hello"}')
+    assert store.bundle_path(PROJECT_ID, en.hash).read_bytes() == b'{"greeting":"Hello"}'
+    assert gzip.decompress(store.bundle_path(PROJECT_ID, en.hash, "gzip").read_bytes()) == b'{"greeting":"Hello"}'
+    assert store.current_release(PROJECT_ID) == release
+
+def test_publishing_unchanged_content_returns_the_same_release(tmp_path):
+    store = ReleaseStore(str(tmp_path))
+    first = publish(store, {"en": "Hello"})
+    second = publish(store, {"en": "Hello"}, content_version=2)
+
+    assert second == first
+    assert len(store.list_releases(PROJECT_ID)) == 1
+
+def test_rollback_repoints_the_current_release(tmp_path):
+    store = ReleaseStore(str(tmp_path))
+    first = publish(store, {"en": "Hello"})
+    second = publish(store, {"en": "Hi"}, content_version=2)
+    assert store.current_release(PROJECT_ID) == second
+
+    assert store.set_current(PROJECT_ID, first.release_id) == first
+    assert store.current_release(PROJECT_ID) == first
+    # Bundles of both releases stay on disk
+    assert store.bundle_path(PROJECT_ID, second.bundles["en"].hash) is not None
+
+def test_current_release_follows_pointer_replaced_by_another_worker(tmp_path):
+    store = ReleaseStore(str(tmp_path))
+    other_worker = ReleaseStore(str(tmp_path))
+    first = publish(store, {"en": "Hello"})
+    assert store.current_release(PROJECT_ID) == first
+
+    second = publish(other_worker, {"en": "Hi"}, content_version=2)
+    assert store.current_release(PROJECT_ID) == second
+
+def test_unknown_or_malformed_names_are_not_resolved(tmp_path):
+    store = ReleaseStore(str(tmp_path))
+    publish(store, {"en": "Hello"})
+
+    assert store.set_current(PROJECT_ID, "0" * 16) is None
+    assert store.get_release(PROJECT_ID, "../current") is None
+    assert store.bundle_path(PROJECT_ID, "../../etc/passwd") is None
+    with pytest.raises(ValueError):
+        store.current_release("../other")
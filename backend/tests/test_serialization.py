@@ -0,0 +1,74 @@
+import json
+import time
+import tracemalloc
+from typing import List
+from pydantic import TypeAdapter
+from src.localization_management_api.models import Translation, TranslationKey
+from src.localization_management_api.serialization import dump_translation_key_rows
+
+LOCALES = ["en", "es", "fr", "de", "it", "pt", "nl", "sv", "pl", "ja", "ko", "zh"]
+
+def make_rows(count):
+    return [
+        {
+            "id": f"00000000-0000-0000-0000-{i:012d}",
+            "project_id": "11111111-1111-1111-1111-111111111111",
+            "key": f"screen.{i // 100}.label.{i}",
+            "category": f"screen.{i // 100}",
+            "description": f"Label {i}",
+            "created_at": "2025-01-01T00:00:00+00:00",
+            "updated_at": "2025-01-01T00:00:00+00:00",
+            "translations": {
+                locale: {
+                    "value": f"Label {i} in {locale}",
+                    "updated_at": "2025-01-01T12:30:00.123456",
+                    "updated_by": "translator"
+                }
+                for locale in LOCALES
+            }
+        }
+        for i in range(count)
+    ]
+
+def model_path(rows):
+    # What DatabaseService + FastAPI's response_model do today
+    keys = [
+        TranslationKey(**{
+            **row,
+            "translations": {
+                locale: Translation(**translation) for locale, translation in row["translations"].items()
+            }
+        })
+        for row in rows
+    ]
+    adapter = TypeAdapter(List[TranslationKey])
+    validated = adapter.validate_python(keys)
+    return json.dumps(adapter.dump_python(validated, mode="json", by_alias=True)).encode()
+
+def measure(encode, rows):
+    tracemalloc.start()
+    start_time = time.process_time()
+    body = encode(rows)
+    cpu_time = time.process_time() - start_time
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return body, cpu_time, peak_memory
+
+def test_fast_path_matches_model_path():
+    rows = make_rows(10)
+    assert json.loads(dump_translation_key_rows(rows)) == json.loads(model_path(rows))
+
+def test_fast_path_performance():
+    """Compare CPU time and peak memory of both paths on a 20k-key, 12-locale project"""
+    rows = make_rows(20_000)
+
+    model_body, model_cpu, model_memory = measure(model_path, rows)
+    fast_body, fast_cpu, fast_memory = measure(dump_translation_key_rows, rows)
+
+    print(f"\nResponse Serialization Performance ({len(rows)} keys x {len(LOCALES)} locales):")
+    print(f"Model path: {model_cpu:.2f}s CPU, {model_memory / 1024 / 1024:.1f} MiB peak")
+    print(f"Fast path:  {fast_cpu:.2f}s CPU, {fast_memory / 1024 / 1024:.1f} MiB peak")
+
+    assert json.loads(fast_body) == json.loads(model_body)
+    assert fast_cpu < model_cpu
+    assert fast_memory < model_memory
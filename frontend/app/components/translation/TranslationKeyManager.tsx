@@ -1,10 +1,11 @@
 'use client';
 
 import React, { useMemo } from 'react';
-import { useTranslationKeys } from '../../hooks/useTranslations';
+import { useTranslationKeys, useProjectEvents } from '../../hooks/useTranslations';
 import { useTranslationStore } from '../../store/translationStore';
 import { TranslationKeyCard } from './TranslationKeyCard';
 import { ProjectAnalyticsCard } from './ProjectAnalyticsCard';
+import { Button } from '../ui/button';
 import { Loader2 } from 'lucide-react';
 
 export function TranslationKeyManager() {
@@ -13,9 +14,18 @@ export function TranslationKeyManager() {
     filter
   } = useTranslationStore();
   
-  const { data: translationKeys, isLoading, error } = useTranslationKeys(currentProject?.id);
+  const {
+    data: translationKeys,
+    isLoading,
+    error,
+    hasNextPage,
+    fetchNextPage,
+    isFetchingNextPage
+  } = useTranslationKeys(currentProject?.id, filter);
+  useProjectEvents(currentProject?.id);
 
-  // Filter translation keys based on current filter state
+  // The server already applied the filter; it is applied again to the loaded keys so
+  // keys added to the cache by edits and live updates respect it too
   const filteredKeys = useMemo(() => {
     if (!translationKeys) return [];
     
@@ -50,6 +60,8 @@ export function TranslationKeyManager() {
     return filtered;
   }, [translationKeys, filter]);
 
+  const hasActiveFilter = !!filter.search || filter.categories.length > 0 || filter.languages.length > 0;
+
   const getHeaderTitle = () => {
     if (!currentProject) return 'Translation Keys';
     return `${currentProject.name} - Translation Keys`;
@@ -58,12 +70,15 @@ export function TranslationKeyManager() {
   const getHeaderSubtitle = () => {
     if (!currentProject) return 'Select a project to view translation keys';
     if (isLoading) return 'Loading...';
-    if (!translationKeys || translationKeys.length === 0) return 'No translation keys found in this project';
+    if (!translationKeys || translationKeys.length === 0) {
+      return hasActiveFilter ? 'No translation keys match your current filters' : 'No translation keys found in this project';
+    }
     
-    const totalKeys = translationKeys.length;
-    const filteredCount = filteredKeys.length;
+    // Only some pages are loaded, so the total comes from the project
+    const totalKeys = Math.max(currentProject.translationKeyCount, translationKeys.length);
+    const filteredCount = `${filteredKeys.length}${hasNextPage ? '+' : ''}`;
     
-    if (totalKeys === filteredCount) {
+    if (!hasActiveFilter && !hasNextPage) {
       return `${totalKeys} translation key${totalKeys !== 1 ? 's' : ''}`;
     } else {
       return `${filteredCount} of ${totalKeys} translation key${totalKeys !== 1 ? 's' : ''}`;
@@ -119,12 +134,12 @@ export function TranslationKeyManager() {
       ) : filteredKeys.length === 0 ? (
         <div className="text-center py-12">
           <p className="text-stone-500 dark:text-stone-400">
-            {translationKeys && translationKeys.length > 0 
+            {hasActiveFilter
               ? 'No translation keys match your current filters.'
               : 'No translation keys found in this project.'
             }
           </p>
-          {translationKeys && translationKeys.length > 0 && (
+          {hasActiveFilter && (
             <p className="text-stone-400 dark:text-stone-500 text-sm mt-2">
               Try adjusting your search or filter criteria.
             </p>
@@ -140,6 +155,15 @@ export function TranslationKeyManager() {
               defaultLanguage={currentProject.defaultLanguage}
             />
           ))}
+          {hasNextPage && (
+            <Button
+              variant="outline"
+              onClick={() => fetchNextPage()}
+              disabled={isFetchingNextPage}
+            >
+              {isFetchingNextPage ? 'Loading...' : 'Load more'}
+            </Button>
+          )}
         </div>
       )}
     </div>
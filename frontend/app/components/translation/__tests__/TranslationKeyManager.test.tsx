@@ -1,4 +1,4 @@
-import { render, screen } from '@testing-library/react';
+import { render, screen, fireEvent } from '@testing-library/react';
 import { TranslationKeyManager } from '../TranslationKeyManager';
 import { useTranslationKeys } from '../../../hooks/useTranslations';
 import { useTranslationStore } from '../../../store/translationStore';
@@ -165,6 +165,34 @@ describe('TranslationKeyManager', () => {
     expect(screen.getByText('button.submit')).toBeInTheDocument();
   });
 
+  it('passes the filter to the server and loads further pages on request', () => {
+    const fetchNextPage = jest.fn();
+    const filter = {
+      search: 'welcome',
+      categories: ['general'],
+      languages: [],
+    };
+    (useTranslationStore as jest.Mock).mockReturnValue({
+      currentProject: mockProject,
+      filter,
+    });
+    (useTranslationKeys as jest.Mock).mockReturnValue({
+      data: [mockTranslationKeys[0]],
+      isLoading: false,
+      error: null,
+      hasNextPage: true,
+      fetchNextPage,
+      isFetchingNextPage: false,
+    });
+
+    render(<TranslationKeyManager />);
+
+    expect(useTranslationKeys).toHaveBeenCalledWith(mockProject.id, filter);
+    expect(screen.getByText('1+ of 2 translation keys')).toBeInTheDocument();
+    fireEvent.click(screen.getByText('Load more'));
+    expect(fetchNextPage).toHaveBeenCalled();
+  });
+
   it('shows no results message when filters match no keys', () => {
     (useTranslationStore as jest.Mock).mockReturnValue({
       currentProject: mockProject,
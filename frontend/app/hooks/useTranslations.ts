@@ -1,12 +1,19 @@
-import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
+import { useEffect } from 'react';
+import { useQuery, useInfiniteQuery, useMutation, useQueryClient } from '@tanstack/react-query';
+import type { InfiniteData, QueryClient } from '@tanstack/react-query';
 import { translationApi, projectApi, localizationApi, healthApi } from '../lib/api';
 import type { 
   TranslationKey, 
+  TranslationKeyPage,
+  TranslationKeyQuery,
   CreateTranslationKeyRequest, 
   CreateProjectRequest,
   UpdateProjectRequest
 } from '../types/translation';
 
+// Cached data of a ['translationKeys', projectId, query] list: the pages loaded so far
+type TranslationKeyPages = InfiniteData<TranslationKeyPage, string | null>;
+
 // Query keys
 export const translationKeys = {
   all: ['translations'] as const,
@@ -18,11 +25,70 @@ export const translationKeys = {
   batch: (ids: string[]) => [...translationKeys.all, 'batch', ids] as const,
 };
 
+// Replace (or, by returning null, drop) keys in every loaded page of the cached translation key lists
+function updateCachedKeys(
+  queryClient: QueryClient,
+  update: (key: TranslationKey) => TranslationKey | null,
+  projectId?: string
+) {
+  queryClient.setQueriesData<TranslationKeyPages>(
+    { queryKey: projectId ? ['translationKeys', projectId] : ['translationKeys'] },
+    (data) => data && {
+      ...data,
+      pages: data.pages.map(page => ({
+        ...page,
+        keys: page.keys.flatMap(key => update(key) ?? []),
+      })),
+    }
+  );
+}
+
+// Whether the server would list a key under a search and filter: a case-insensitive
+// substring of the key, description or a translation value, one of the categories,
+// and a translation in one of the languages
+function keyMatchesQuery(key: TranslationKey, query: TranslationKeyQuery = {}) {
+  const search = (query.search || '').toLowerCase();
+  const texts = [key.key, key.description || '', ...Object.values(key.translations).map(t => t.value)];
+  return (!search || texts.some(text => text.toLowerCase().includes(search)))
+    && (!query.categories?.length || query.categories.includes(key.category))
+    && (!query.languages?.length || query.languages.some(language => language in key.translations));
+}
+
+// Add a key to the last loaded page of the cached translation key lists of its project
+// whose search and filters it matches
+function addCachedKey(queryClient: QueryClient, newKey: TranslationKey) {
+  queryClient.setQueriesData<TranslationKeyPages>(
+    {
+      queryKey: ['translationKeys'],
+      predicate: (query) => (query.queryKey[1] === newKey.projectId || query.queryKey[1] === undefined)
+        && keyMatchesQuery(newKey, query.queryKey[2] as TranslationKeyQuery | undefined),
+    },
+    (data) => data && {
+      ...data,
+      pages: data.pages.map((page, index) => index === data.pages.length - 1
+        ? { ...page, keys: [...page.keys, newKey] }
+        : page
+      ),
+    }
+  );
+}
+
 // Translation Key Hooks
-export function useTranslationKeys(projectId?: string) {
-  return useQuery({
-    queryKey: ['translationKeys', projectId],
-    queryFn: () => translationApi.getTranslationKeys(projectId),
+// Keys are searched and filtered on the server and loaded one page at a time;
+// fetchNextPage loads the next page while hasNextPage is true
+export function useTranslationKeys(projectId?: string, filter: TranslationKeyQuery = {}) {
+  const query: TranslationKeyQuery = {
+    search: filter.search || '',
+    categories: filter.categories || [],
+    languages: filter.languages || [],
+  };
+
+  return useInfiniteQuery({
+    queryKey: ['translationKeys', projectId, query],
+    queryFn: ({ pageParam }) => translationApi.getTranslationKeys(projectId, query, pageParam),
+    initialPageParam: null as string | null,
+    getNextPageParam: (lastPage) => lastPage.nextCursor,
+    select: (data) => data.pages.flatMap(page => page.keys),
     staleTime: 5 * 60 * 1000, // 5 minutes
   });
 }
@@ -70,7 +136,7 @@ export function useCreateTranslationKey() {
       });
 
       // Snapshot previous values
-      const allQueries = queryClient.getQueriesData<TranslationKey[]>({
+      const allQueries = queryClient.getQueriesData<TranslationKeyPages>({
         queryKey: ['translationKeys'],
       });
 
@@ -92,11 +158,7 @@ export function useCreateTranslationKey() {
       };
 
       // Optimistically add to all translation key list caches
-      allQueries.forEach(([queryKey, data]) => {
-        if (data) {
-          queryClient.setQueryData(queryKey, [...data, optimisticKey]);
-        }
-      });
+      addCachedKey(queryClient, optimisticKey);
 
       return { allQueries, optimisticKey };
     },
@@ -113,15 +175,8 @@ export function useCreateTranslationKey() {
     },
     onSuccess: (newKey, variables, context) => {
       // Replace optimistic key with real key
-      if (context?.allQueries && context?.optimisticKey) {
-        context.allQueries.forEach(([queryKey, data]) => {
-          if (data) {
-            const updatedData = data.map(key => 
-              key.id === context.optimisticKey.id ? newKey : key
-            );
-            queryClient.setQueryData(queryKey, updatedData);
-          }
-        });
+      if (context?.optimisticKey) {
+        updateCachedKeys(queryClient, key => key.id === context.optimisticKey.id ? newKey : key);
       }
 
       // Update the project-specific list cache
@@ -179,7 +234,7 @@ export function useUpdateTranslationKey() {
       );
 
       // Get all translation key queries to update
-      const allQueries = queryClient.getQueriesData<TranslationKey[]>({
+      const allQueries = queryClient.getQueriesData<TranslationKeyPages>({
         queryKey: ['translationKeys'],
       });
 
@@ -203,14 +258,7 @@ export function useUpdateTranslationKey() {
         queryClient.setQueryData(translationKeys.detail(variables.id), optimisticKey);
         
         // Update all translation key list caches
-        allQueries.forEach(([queryKey, data]) => {
-          if (data) {
-            queryClient.setQueryData(
-              queryKey,
-              data.map(key => key.id === variables.id ? optimisticKey : key)
-            );
-          }
-        });
+        updateCachedKeys(queryClient, key => key.id === variables.id ? optimisticKey : key);
       }
 
       return { previousKey, allQueries };
@@ -340,6 +388,125 @@ export function useProjectStats(projectId: string) {
   });
 }
 
+// Translations as cached for a key, from the {locale: value} object of a live event
+function eventTranslations(values: Record<string, string>): TranslationKey['translations'] {
+  const updatedAt = new Date().toISOString();
+  return Object.fromEntries(
+    Object.entries(values).map(([lang, value]) => [lang, { value, updatedAt, updatedBy: '' }])
+  );
+}
+
+// Live updates: apply the changes the server reports to the cached key list pages in
+// place, instead of waiting for staleTime or refetching every loaded page. The list is
+// only refetched when an event can't be applied (a resync, a full sync, or keys created
+// elsewhere). EventSource reconnects by itself and resumes from the last event ID.
+export function useProjectEvents(projectId?: string) {
+  const queryClient = useQueryClient();
+
+  useEffect(() => {
+    if (!projectId || typeof EventSource === 'undefined') return;
+
+    const source = new EventSource(projectApi.getEventsUrl(projectId));
+    const parse = (event: Event) => JSON.parse((event as MessageEvent).data);
+
+    // Server-side aggregates are small enough to simply refetch
+    const invalidateAggregates = () => {
+      queryClient.invalidateQueries({ queryKey: ['categories', projectId] });
+      queryClient.invalidateQueries({ queryKey: ['projectStats', projectId] });
+      queryClient.invalidateQueries({ queryKey: ['localizations', projectId] });
+    };
+    const invalidateKeys = () => {
+      queryClient.invalidateQueries({ queryKey: ['translationKeys', projectId] });
+      invalidateAggregates();
+    };
+    const invalidateProject = () => {
+      queryClient.invalidateQueries({ queryKey: ['projects'] });
+      queryClient.invalidateQueries({ queryKey: ['project', projectId] });
+      invalidateKeys();
+    };
+
+    source.addEventListener('key_created', (event) => {
+      const data = parse(event);
+      const newKey: TranslationKey = {
+        id: data.keyId,
+        projectId: data.projectId,
+        key: data.key,
+        category: data.category,
+        description: '',
+        translations: eventTranslations(data.translations),
+      };
+      // Keys are unique per project, so this also replaces an optimistic copy from this client
+      let cached = false;
+      updateCachedKeys(queryClient, (key) => {
+        if (key.key !== newKey.key) return key;
+        cached = true;
+        return { ...newKey, description: key.description };
+      }, projectId);
+      if (!cached) addCachedKey(queryClient, newKey);
+      invalidateAggregates();
+    });
+
+    source.addEventListener('key_updated', (event) => {
+      const data = parse(event);
+      updateCachedKeys(queryClient, key => key.id === data.keyId
+        ? { ...key, translations: { ...key.translations, ...eventTranslations(data.translations) } }
+        : key,
+      projectId);
+      queryClient.invalidateQueries({ queryKey: translationKeys.detail(data.keyId) });
+      invalidateAggregates();
+    });
+
+    source.addEventListener('key_deleted', (event) => {
+      const data = parse(event);
+      updateCachedKeys(queryClient, key => key.id === data.keyId ? null : key, projectId);
+      queryClient.removeQueries({ queryKey: translationKeys.detail(data.keyId) });
+      invalidateAggregates();
+    });
+
+    // One locale's changes since the last event, as from a delta sync
+    source.addEventListener('sync', (event) => {
+      const data = parse(event);
+      if (data.full) {
+        invalidateKeys();
+        return;
+      }
+
+      const upserted: Record<string, string> = data.upserted || {};
+      const deleted = new Set<string>(data.deleted || []);
+      const uncached = new Set(Object.keys(upserted));
+      updateCachedKeys(queryClient, (key) => {
+        if (key.key in upserted) {
+          uncached.delete(key.key);
+          return { ...key, translations: { ...key.translations, ...eventTranslations({ [data.locale]: upserted[key.key] }) } };
+        }
+        if (deleted.has(key.key)) {
+          const translations = { ...key.translations };
+          delete translations[data.locale];
+          // A deleted key is listed by every locale's sync; once none has a value it is gone
+          return Object.keys(translations).length > 0 ? { ...key, translations } : null;
+        }
+        return key;
+      }, projectId);
+
+      // Keys created elsewhere arrive by name only, so the list is read again for their IDs
+      if (uncached.size > 0) {
+        invalidateKeys();
+      } else {
+        invalidateAggregates();
+      }
+    });
+
+    source.addEventListener('resync', invalidateKeys);
+    ['language_added', 'language_removed'].forEach((type) => source.addEventListener(type, invalidateProject));
+    source.addEventListener('project_deleted', () => {
+      invalidateProject();
+      source.close();
+    });
+
+    return () => source.close();
+  }, [projectId, queryClient]);
+}
+
 export function useCreateProject() {
   const queryClient = useQueryClient();
   
@@ -492,7 +659,7 @@ export const useRemoveProjectLanguage = () => {
       // Snapshot previous values
       const previousProjects = queryClient.getQueryData<any[]>(['projects']);
       const previousProject = queryClient.getQueryData<any>(['project', projectId]);
-      const allTranslationQueries = queryClient.getQueriesData<any[]>({
+      const allTranslationQueries = queryClient.getQueriesData<TranslationKeyPages>({
         queryKey: ['translationKeys'],
       });
 
@@ -519,18 +686,13 @@ export const useRemoveProjectLanguage = () => {
       }
 
       // Optimistically remove translations for the removed language from all translation keys
-      allTranslationQueries.forEach(([queryKey, data]) => {
-        if (data) {
-          const updatedKeys = data.map((key: any) => {
-            if (key.projectId === projectId && key.translations[languageCode]) {
-              const updatedTranslations = { ...key.translations };
-              delete updatedTranslations[languageCode];
-              return { ...key, translations: updatedTranslations };
-            }
-            return key;
-          });
-          queryClient.setQueryData(queryKey, updatedKeys);
+      updateCachedKeys(queryClient, (key) => {
+        if (key.projectId === projectId && key.translations[languageCode]) {
+          const updatedTranslations = { ...key.translations };
+          delete updatedTranslations[languageCode];
+          return { ...key, translations: updatedTranslations };
         }
+        return key;
       });
 
       return { previousProjects, previousProject, allTranslationQueries };
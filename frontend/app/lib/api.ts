@@ -4,12 +4,17 @@ import type {
   UpdateTranslationRequest,
   Project,
   CreateProjectRequest,
-  UpdateProjectRequest
+  UpdateProjectRequest,
+  TranslationKeyPage,
+  TranslationKeyQuery
 } from '../types/translation';
 
 // API Configuration
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
 
+// Translation keys loaded per request; further pages are fetched as the list is scrolled through
+const TRANSLATION_KEY_PAGE_SIZE = 100;
+
 // HTTP client with error handling
 class ApiClient {
   private baseUrl: string;
@@ -53,6 +58,18 @@ class ApiClient {
     return this.request<T>(endpoint, { method: 'GET' });
   }
 
+  // Get one page of a paginated list, with the cursor of the next page from the X-Next-Cursor header
+  async getPage<T>(endpoint: string): Promise<{ items: T[]; nextCursor: string | null }> {
+    const response = await fetch(`${this.baseUrl}${endpoint}`, { headers: { 'Content-Type': 'application/json' } });
+
+    if (!response.ok) {
+      const errorData = await response.json().catch(() => ({}));
+      throw new Error(errorData.detail || `HTTP ${response.status}: ${response.statusText}`);
+    }
+
+    return { items: await response.json(), nextCursor: response.headers.get('X-Next-Cursor') };
+  }
+
   async post<T>(endpoint: string, data?: any): Promise<T> {
     return this.request<T>(endpoint, {
       method: 'POST',
@@ -76,12 +93,21 @@ const apiClient = new ApiClient(API_BASE_URL);
 
 // Translation API functions
 export const translationApi = {
-  // Get all translation keys (optionally filtered by project)
-  getTranslationKeys: async (projectId?: string): Promise<TranslationKey[]> => {
-    const endpoint = projectId 
-      ? `/translation-keys?project_id=${encodeURIComponent(projectId)}`
-      : '/translation-keys';
-    return apiClient.get<TranslationKey[]>(endpoint);
+  // Get one page of translation keys (optionally filtered by project), searched and filtered on the server
+  getTranslationKeys: async (
+    projectId?: string,
+    query: TranslationKeyQuery = {},
+    cursor?: string | null
+  ): Promise<TranslationKeyPage> => {
+    const params = new URLSearchParams({ limit: String(TRANSLATION_KEY_PAGE_SIZE) });
+    if (projectId) params.set('project_id', projectId);
+    if (query.search) params.set('search', query.search);
+    query.categories?.forEach(category => params.append('categories', category));
+    query.languages?.forEach(language => params.append('languages', language));
+    if (cursor) params.set('cursor', cursor);
+
+    const { items, nextCursor } = await apiClient.getPage<TranslationKey>(`/translation-keys?${params}`);
+    return { keys: items, nextCursor };
   },
 
   // Get translation key by ID
@@ -121,10 +147,10 @@ export const translationApi = {
   // Get unique categories for a project
   getCategories: async (projectId?: string): Promise<string[]> => {
     if (!projectId) {
-      // If no project specified, get categories from all translation keys
-      const keys = await translationApi.getTranslationKeys();
-      const categories = [...new Set(keys.map(key => key.category))];
-      return categories.sort();
+      // If no project specified, combine the categories of every project
+      const projects = await projectApi.getProjects();
+      const projectCategories = await Promise.all(projects.map(project => translationApi.getCategories(project.id)));
+      return [...new Set(projectCategories.flat())].sort();
     }
     
     const response = await apiClient.get<{ categories: string[] }>(`/projects/${encodeURIComponent(projectId)}/categories`);
@@ -182,6 +208,11 @@ export const projectApi = {
     return apiClient.delete(`/projects/${encodeURIComponent(projectId)}/languages/${encodeURIComponent(languageCode)}`);
   },
 
+  // URL of the project's live change event stream (server-sent events)
+  getEventsUrl: (projectId: string): string => {
+    return `${API_BASE_URL}/projects/${encodeURIComponent(projectId)}/events`;
+  },
+
   // Get project analytics
   getProjectAnalytics: async (projectId: string): Promise<{
     project_id: string;
@@ -26,6 +26,19 @@ export interface TranslationKey {
   };
 }
 
+// Server-side filters of a translation key list
+export interface TranslationKeyQuery {
+  search?: string;
+  categories?: string[];
+  languages?: string[];
+}
+
+// One page of a translation key list, with the cursor of the next page if there is one
+export interface TranslationKeyPage {
+  keys: TranslationKey[];
+  nextCursor: string | null;
+}
+
 export interface Language {
   code: string;
   name: string;